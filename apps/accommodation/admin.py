@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview
+from .models import Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview, AccommodationRatingSummary
 
 
 @admin.register(Accommodation)
@@ -45,3 +45,10 @@ class FeedbackReviewAdmin(admin.ModelAdmin):
     list_display = ('accommodation_id', 'user', 'rating', 'date')
     search_fields = ('accommodation_id__name', 'user__username')
     list_filter = ('rating', 'date')
+
+
+@admin.register(AccommodationRatingSummary)
+class AccommodationRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ('accommodation', 'review_count', 'average_rating')
+    search_fields = ('accommodation__name',)
+    ordering = ('-average_rating',)
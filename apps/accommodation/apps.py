@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class AccommodationManagementConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accommodation"
+
+    def ready(self):
+        # Guest services and feedback are listed per accommodation
+        from apps.accommodation.models import FeedbackReview, GuestService
+        from tourism_ecosystem.response_cache import register_parent_versions
+
+        register_parent_versions(GuestService, 'accommodation_id')
+        register_parent_versions(FeedbackReview, 'accommodation_id')
+
+        # Register signal handlers
+        from apps.accommodation import signals  # noqa: F401
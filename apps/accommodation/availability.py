@@ -0,0 +1,165 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import APIException
+
+from apps.accommodation.models import Accommodation, RoomBooking, RoomNight, RoomType
+from tourism_ecosystem.response_cache import bump_versions, get_version_label
+
+# Accommodation.total_rooms is the only capacity the catalogue records, so the rooms of
+# an accommodation are shared by all its room types. The ledger keeps one row per
+# (accommodation, room type, night), which answers "how many rooms are free between two
+# dates" by reading one row per room type and night instead of scanning the bookings.
+
+
+class RoomsUnavailable(APIException):
+    status_code = 409
+    default_detail = 'No room of this type is free for these dates.'
+    default_code = 'rooms_unavailable'
+
+
+def get_nights(check_in_date, check_out_date):
+    return [check_in_date + timedelta(days=i) for i in range((check_out_date - check_in_date).days)]
+
+
+def get_booked_rooms(accommodation_id, check_in_date, check_out_date):
+    """
+    Highest number of rooms of the accommodation booked on a single night of the range.
+    """
+    totals = (RoomNight.objects
+              .filter(accommodation_id=accommodation_id, night__gte=check_in_date, night__lt=check_out_date)
+              .values('night').annotate(total=Sum('booked')).values_list('total', flat=True))
+    return max(totals, default=0)
+
+
+def get_free_rooms(accommodation, check_in_date, check_out_date):
+    return max(accommodation.total_rooms - get_booked_rooms(accommodation.id, check_in_date, check_out_date), 0)
+
+
+def add_to_ledger(accommodation_id, room_type_id, check_in_date, check_out_date, rooms):
+    """
+    Add ``rooms`` (negative to release them) to every night of the range.
+    """
+    if rooms > 0:
+        RoomNight.objects.bulk_create([
+            RoomNight(accommodation_id=accommodation_id, room_type_id=room_type_id, night=night)
+            for night in get_nights(check_in_date, check_out_date)
+        ], ignore_conflicts=True)
+    # Releases never create rows (the accommodation may be being deleted) nor go below zero
+    # (for bookings made before the ledger was rebuilt)
+    RoomNight.objects.filter(
+        accommodation_id=accommodation_id, room_type_id=room_type_id,
+        night__gte=check_in_date, night__lt=check_out_date, booked__gte=max(-rooms, 0),
+    ).update(booked=F('booked') + rooms)
+    # update() sends no signal, the availability responses are versioned by hand
+    bump_versions([get_version_label(RoomNight)])
+
+
+def move_reservation(booking):
+    """
+    Hold a room for a booking being saved, releasing the nights it held before when it
+    is updated. Raises RoomsUnavailable when a night of the stay is full.
+
+    Must run in a transaction: the accommodation row stays locked until it ends, so
+    concurrent bookings of an accommodation are checked and counted one after another.
+    """
+    accommodation = Accommodation.objects.select_for_update().get(pk=booking.accommodation_id_id)
+    if booking.pk is not None:
+        previous = RoomBooking.objects.filter(pk=booking.pk).values(
+            'accommodation_id', 'room_type_id', 'check_in_date', 'check_out_date').first()
+        if previous:
+            add_to_ledger(previous['accommodation_id'], previous['room_type_id'],
+                          previous['check_in_date'], previous['check_out_date'], -1)
+
+    if (not booking.room_type_id.availability
+            or get_free_rooms(accommodation, booking.check_in_date, booking.check_out_date) < 1):
+        raise RoomsUnavailable()
+    add_to_ledger(accommodation.id, booking.room_type_id_id, booking.check_in_date, booking.check_out_date, 1)
+
+
+def release_reservation(booking):
+    add_to_ledger(booking.accommodation_id_id, booking.room_type_id_id, booking.check_in_date,
+                  booking.check_out_date, -1)
+
+
+def get_availability(accommodation, check_in_date, check_out_date, room_type_id=None):
+    free_rooms = get_free_rooms(accommodation, check_in_date, check_out_date)
+    room_types = accommodation.types.all()
+    if room_type_id is not None:
+        room_types = room_types.filter(id=room_type_id)
+    return {
+        'accommodation_id': accommodation.id,
+        'check_in_date': check_in_date,
+        'check_out_date': check_out_date,
+        'total_rooms': accommodation.total_rooms,
+        'free_rooms': free_rooms,
+        'room_types': [
+            {
+                'room_type_id': room_type.id,
+                'room_type': room_type.room_type,
+                'price_per_night': room_type.price_per_night,
+                'free_rooms': free_rooms if room_type.availability else 0,
+            }
+            for room_type in room_types
+        ],
+    }
+
+
+def search_accommodations(check_in_date, check_out_date, guests=1, location=None, min_price=None,
+                          max_price=None, min_star_rating=None, limit=50):
+    """
+    Accommodations with a free room for the stay, cheapest first, in a single query: the
+    cheapest matching room type and the busiest night of the stay are correlated
+    subqueries instead of a query per accommodation. Every accommodation returned has
+    ``room_type`` (its cheapest matching room type) and ``free_rooms`` set.
+    """
+    room_types = RoomType.objects.filter(accommodation=OuterRef('pk'), availability=True,
+                                         max_occupancy__gte=guests)
+    if min_price is not None:
+        room_types = room_types.filter(price_per_night__gte=min_price)
+    if max_price is not None:
+        room_types = room_types.filter(price_per_night__lte=max_price)
+    cheapest = room_types.order_by('price_per_night', 'id')
+    busiest_night = (RoomNight.objects
+                     .filter(accommodation=OuterRef('pk'), night__gte=check_in_date, night__lt=check_out_date)
+                     .values('night').annotate(total=Sum('booked')).order_by('-total').values('total')[:1])
+
+    accommodations = Accommodation.objects.annotate(
+        cheapest_room_type_id=Subquery(cheapest.values('id')[:1]),
+        cheapest_price=Subquery(cheapest.values('price_per_night')[:1]),
+        booked_rooms=Coalesce(Subquery(busiest_night), 0),
+    ).filter(cheapest_room_type_id__isnull=False, booked_rooms__lt=F('total_rooms'))
+    if location:
+        accommodations = accommodations.filter(location__icontains=location)
+    if min_star_rating is not None:
+        accommodations = accommodations.filter(star_rating__gte=min_star_rating)
+    accommodations = list(accommodations.prefetch_related('types')
+                          .order_by('cheapest_price', '-star_rating', 'id')[:limit])
+
+    room_types = RoomType.objects.in_bulk([accommodation.cheapest_room_type_id for accommodation in accommodations])
+    for accommodation in accommodations:
+        accommodation.room_type = room_types[accommodation.cheapest_room_type_id]
+        accommodation.free_rooms = accommodation.total_rooms - accommodation.booked_rooms
+    return accommodations
+
+
+@transaction.atomic
+def rebuild_room_nights():
+    """
+    Recompute the ledger from the stored bookings. Returns the number of ledger rows.
+    """
+    RoomNight.objects.all().delete()
+    counts = Counter()
+    bookings = RoomBooking.objects.values_list('accommodation_id', 'room_type_id', 'check_in_date', 'check_out_date')
+    for accommodation_id, room_type_id, check_in_date, check_out_date in bookings.iterator():
+        for night in get_nights(check_in_date, check_out_date):
+            counts[accommodation_id, room_type_id, night] += 1
+    RoomNight.objects.bulk_create([
+        RoomNight(accommodation_id=accommodation_id, room_type_id=room_type_id, night=night, booked=booked)
+        for (accommodation_id, room_type_id, night), booked in counts.items()
+    ], batch_size=1000)
+    bump_versions([get_version_label(RoomNight)])
+    return len(counts)
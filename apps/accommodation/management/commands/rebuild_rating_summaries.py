@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.accommodation.ratings import rebuild_rating_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating summaries of the accommodations from the stored reviews."
+
+    def handle(self, *args, **options):
+        summaries = rebuild_rating_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rating summaries rebuilt ({summaries} accommodations)."))
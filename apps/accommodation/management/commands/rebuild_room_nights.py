@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.accommodation.availability import rebuild_room_nights
+
+
+class Command(BaseCommand):
+    help = "Recompute the room availability ledger from the stored room bookings."
+
+    def handle(self, *args, **options):
+        rows = rebuild_room_nights()
+        self.stdout.write(self.style.SUCCESS(f"Room availability ledger rebuilt ({rows} nights)."))
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
 
 
 class Accommodation(models.Model):
@@ -15,10 +16,42 @@ class Accommodation(models.Model):
     contact_info = models.CharField(max_length=255)
     img_url = models.URLField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Accommodations of a location, e.g. the top rated ones
+            models.Index(fields=['location'], name='accommodation_location_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class AccommodationRatingSummary(models.Model):
+    """
+    Ratings of the reviews of an accommodation, kept up to date as reviews are written
+    (see apps/accommodation/ratings.py)
+    """
+    accommodation = models.OneToOneField('Accommodation', on_delete=models.CASCADE, primary_key=True,
+                                         related_name='rating_summary')
+    review_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    average_rating = models.FloatField(default=0)  # 0 until the first review
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Accommodations sorted by rating
+            models.Index(fields=['-average_rating', '-review_count'], name='rating_summary_average_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.accommodation_id}: {self.average_rating:.2f} ({self.review_count} reviews)"
+
+
 class RoomType(models.Model):
     room_type = models.CharField(max_length=255)
     price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
@@ -48,7 +81,35 @@ class RoomBooking(models.Model):
 
         # Calculate the total price
         self.total_price = self.room_type_id.price_per_night * (self.check_out_date - self.check_in_date).days
-        super(RoomBooking, self).save(*args, **kwargs)
+
+        # Hold the rooms in the availability ledger in the same transaction as the booking
+        from apps.accommodation.availability import move_reservation
+        with transaction.atomic():
+            move_reservation(self)
+            super(RoomBooking, self).save(*args, **kwargs)
+
+
+class RoomNight(models.Model):
+    """
+    Number of rooms of a room type booked in an accommodation for one night
+    (see apps/accommodation/availability.py)
+    """
+    accommodation = models.ForeignKey('Accommodation', on_delete=models.CASCADE)
+    room_type = models.ForeignKey('RoomType', on_delete=models.CASCADE)
+    night = models.DateField()  # Date of the check-in day of the night
+    booked = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['accommodation', 'room_type', 'night'], name='room_night_unique'),
+        ]
+        indexes = [
+            # Free rooms of an accommodation over a date range
+            models.Index(fields=['accommodation', 'night'], name='room_night_accommodation_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.accommodation_id} / {self.room_type_id} on {self.night}: {self.booked}"
 
 
 class GuestService(models.Model):
@@ -64,6 +125,13 @@ class GuestService(models.Model):
 class FeedbackReview(models.Model):
     accommodation_id = models.ForeignKey('Accommodation', on_delete=models.CASCADE)
     user = models.ForeignKey('customUser.User', on_delete=models.CASCADE)
-    rating = models.PositiveIntegerField()
+    rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     review = models.TextField()
     date = models.DateField()
+
+    def save(self, *args, **kwargs):
+        # Update the rating summary of the accommodation in the same transaction as the review
+        from apps.accommodation.ratings import move_rating
+        with transaction.atomic():
+            move_rating(self)
+            super(FeedbackReview, self).save(*args, **kwargs)
@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.models import Count, F, FloatField
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+from apps.accommodation.models import Accommodation, AccommodationRatingSummary, FeedbackReview
+from tourism_ecosystem.response_cache import bump_versions, get_version_label
+
+# Each accommodation has a summary row holding the count, total, mean and histogram of
+# its review ratings. Review writes add to it in place, so rating figures and "top
+# rated" listings read one row per accommodation instead of aggregating the reviews.
+
+RATINGS = range(1, 6)
+
+
+def get_histogram_field(rating):
+    return f'rating_{rating}' if rating in RATINGS else None
+
+
+def get_histogram(summary):
+    return {str(rating): getattr(summary, get_histogram_field(rating)) for rating in RATINGS}
+
+
+def add_rating(accommodation_id, rating, reviews):
+    """
+    Add ``reviews`` reviews rated ``rating`` (negative to remove them) to the summary.
+    """
+    if reviews > 0:
+        AccommodationRatingSummary.objects.bulk_create([AccommodationRatingSummary(accommodation_id=accommodation_id)],
+                                                       ignore_conflicts=True)
+    updates = {
+        'review_count': F('review_count') + reviews,
+        'rating_total': F('rating_total') + rating * reviews,
+    }
+    histogram_field = get_histogram_field(rating)
+    if histogram_field:
+        updates[histogram_field] = F(histogram_field) + reviews
+    # Removals never create rows (the accommodation may be being deleted) nor go below zero
+    # (for reviews written before the summaries were rebuilt)
+    summaries = AccommodationRatingSummary.objects.filter(accommodation_id=accommodation_id)
+    if summaries.filter(review_count__gte=max(-reviews, 0)).update(**updates):
+        # A statement of its own reading only stored columns: MySQL evaluates the SET
+        # assignments of an UPDATE left to right, with the values already assigned
+        summaries.update(average_rating=Coalesce(
+            Cast(F('rating_total'), FloatField()) / NullIf(F('review_count'), 0), 0.0, output_field=FloatField(),
+        ))
+    # update() sends no signal, the responses built from the summaries are versioned by hand
+    bump_versions([get_version_label(AccommodationRatingSummary)])
+
+
+def move_rating(review):
+    """
+    Count a review being saved, removing the rating it had before when it is updated.
+    Must run in the transaction saving the review.
+    """
+    if review.pk is not None:
+        previous = FeedbackReview.objects.filter(pk=review.pk).values('accommodation_id', 'rating').first()
+        if previous:
+            add_rating(previous['accommodation_id'], previous['rating'], -1)
+    add_rating(review.accommodation_id_id, review.rating, 1)
+
+
+def remove_rating(review):
+    add_rating(review.accommodation_id_id, review.rating, -1)
+
+
+@transaction.atomic
+def rebuild_rating_summaries():
+    """
+    Recompute the summaries of all accommodations from the stored reviews. Returns the
+    number of summaries.
+    """
+    summaries = {pk: AccommodationRatingSummary(accommodation_id=pk)
+                 for pk in Accommodation.objects.values_list('pk', flat=True)}
+    ratings = (FeedbackReview.objects.order_by().values('accommodation_id', 'rating')
+               .annotate(reviews=Count('id')).values_list('accommodation_id', 'rating', 'reviews'))
+    for accommodation_id, rating, reviews in ratings:
+        summary = summaries[accommodation_id]
+        summary.review_count += reviews
+        summary.rating_total += rating * reviews
+        histogram_field = get_histogram_field(rating)
+        if histogram_field:
+            setattr(summary, histogram_field, getattr(summary, histogram_field) + reviews)
+    for summary in summaries.values():
+        summary.average_rating = summary.rating_total / summary.review_count if summary.review_count else 0
+    AccommodationRatingSummary.objects.all().delete()
+    AccommodationRatingSummary.objects.bulk_create(summaries.values(), batch_size=1000)
+    bump_versions([get_version_label(AccommodationRatingSummary)])
+    return len(summaries)
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from .models import (Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview)
+from .models import (Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview, AccommodationRatingSummary)
+from .ratings import get_histogram
 
 
 class AccommodationSerializer(serializers.ModelSerializer):
@@ -26,6 +27,21 @@ class RoomBookingSerializer(serializers.ModelSerializer):
         def get_total_price(self, obj):
             return obj.calculate_total_price()
 
+    def validate(self, attrs):
+        """
+        The stay must last at least a night, in a room type the accommodation offers.
+        """
+        def get_value(name):
+            return attrs.get(name, getattr(self.instance, name, None))
+
+        check_in_date, check_out_date = get_value('check_in_date'), get_value('check_out_date')
+        if check_in_date and check_out_date and check_out_date <= check_in_date:
+            raise serializers.ValidationError({'check_out_date': "The check-out date must be after the check-in date."})
+        accommodation, room_type = get_value('accommodation_id'), get_value('room_type_id')
+        if accommodation and room_type and not accommodation.types.filter(id=room_type.id).exists():
+            raise serializers.ValidationError({'room_type_id': "This room type is not offered by the accommodation."})
+        return attrs
+
 
 class GuestServiceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,6 +57,21 @@ class FeedbackReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', ]
 
 
+class AccommodationRatingSummarySerializer(serializers.ModelSerializer):
+    average_rating = serializers.SerializerMethodField()
+    histogram = serializers.SerializerMethodField()  # {rating: number of reviews}
+
+    class Meta:
+        model = AccommodationRatingSummary
+        fields = ['review_count', 'average_rating', 'histogram']
+
+    def get_average_rating(self, obj) -> float | None:
+        return obj.average_rating if obj.review_count else None
+
+    def get_histogram(self, obj) -> dict[str, int]:
+        return get_histogram(obj)
+
+
 class AccommodationCalculatePriceSerializer(serializers.Serializer):
     accommodation_id = serializers.IntegerField(required=True)  # 新增 accommodation_id
     room_id = serializers.IntegerField(required=True)
@@ -66,3 +97,40 @@ class AccommodationCalculatePriceSerializer(serializers.Serializer):
         if value <= 0:
             raise serializers.ValidationError("The number of days must be a positive integer.")
         return value
+
+
+class RoomAvailabilitySerializer(serializers.Serializer):
+    accommodation_id = serializers.IntegerField()
+    room_type_id = serializers.IntegerField(required=False)
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+
+    def validate(self, attrs):
+        nights = (attrs['check_out_date'] - attrs['check_in_date']).days
+        if nights <= 0:
+            raise serializers.ValidationError({'check_out_date': "The check-out date must be after the check-in date."})
+        if nights > 365:
+            raise serializers.ValidationError({'check_out_date': "A stay cannot last more than 365 nights."})
+        return attrs
+
+
+class AccommodationSearchSerializer(serializers.Serializer):
+    check_in_date = serializers.DateField()
+    check_out_date = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1, default=1)
+    location = serializers.CharField(required=False)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)  # Per night
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)  # Per night
+    min_star_rating = serializers.IntegerField(min_value=0, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=50)
+
+    def validate(self, attrs):
+        nights = (attrs['check_out_date'] - attrs['check_in_date']).days
+        if nights <= 0:
+            raise serializers.ValidationError({'check_out_date': "The check-out date must be after the check-in date."})
+        if nights > 365:
+            raise serializers.ValidationError({'check_out_date': "A stay cannot last more than 365 nights."})
+        if attrs.get('min_price') is not None and attrs.get('max_price') is not None \
+                and attrs['min_price'] > attrs['max_price']:
+            raise serializers.ValidationError({'max_price': "The maximum price must not be below the minimum price."})
+        return attrs
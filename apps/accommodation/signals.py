@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accommodation.availability import release_reservation
+from apps.accommodation.models import Accommodation, AccommodationRatingSummary, FeedbackReview, RoomBooking
+from apps.accommodation.ratings import remove_rating
+
+
+@receiver(post_delete, sender=RoomBooking)
+def release_deleted_booking(sender, instance, **kwargs):
+    """
+    Give the rooms of a deleted booking back, including bookings deleted in cascade.
+    """
+    release_reservation(instance)
+
+
+@receiver(post_save, sender=Accommodation)
+def create_rating_summary(sender, instance, created, raw=False, **kwargs):
+    """
+    Start new accommodations with an empty rating summary, so they sort among the others.
+    """
+    if created and not raw:
+        AccommodationRatingSummary.objects.get_or_create(accommodation=instance)
+
+
+@receiver(post_delete, sender=FeedbackReview)
+def remove_deleted_rating(sender, instance, **kwargs):
+    """
+    Take the rating of a deleted review out of the summary, including reviews deleted in cascade.
+    """
+    remove_rating(instance)
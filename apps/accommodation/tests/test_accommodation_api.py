@@ -1,10 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.accommodation.models import Accommodation, RoomType
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
 
@@ -24,8 +24,9 @@ def detail_url(accommodation_id):
     )
 
 
-class PublicAccommodationAPITests(TestCase):
+class PublicAccommodationAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.room = RoomType.objects.create(
             room_type='Test type',
@@ -63,10 +64,10 @@ class PublicAccommodationAPITests(TestCase):
         res = self.client.get(ACCOMMODATION_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
-        self.assertEqual(res.data[0]['name'], 'Test Accommodation')
-        self.assertEqual(res.data[1]['name'], 'Test Accommodation 2')
+        self.assertEqual(res.data['results'][0]['name'], 'Test Accommodation')
+        self.assertEqual(res.data['results'][1]['name'], 'Test Accommodation 2')
 
     def test_retrieve_accommodation_detail(self):
         accommodation = create_accommodation(
@@ -95,8 +96,9 @@ class PublicAccommodationAPITests(TestCase):
         self.assertEqual(res.data['contact_info'], accommodation.contact_info)
 
 
-class PrivateAccommodationAPITests(TestCase):
+class PrivateAccommodationAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user(
             email='test@example.com',
@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, FeedbackReview, GuestService, RoomType
+from tourism_ecosystem.response_cache import get_response_cache
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+GUEST_SERVICE_URL = reverse('accommodation:guest-service-list')
+
+
+def create_accommodation(name, types=()):
+    accommodation = Accommodation.objects.create(
+        name=name,
+        location='Kampala',
+        star_rating=4,
+        total_rooms=10,
+        amenities='Wifi',
+        check_in_time='09:00:00',
+        check_out_time='17:00:00',
+        contact_info='0700000000'
+    )
+    accommodation.types.set(types)
+    GuestService.objects.create(accommodation_id=accommodation, service_name='Laundry', price=Decimal('5.00'),
+                                availability_hours='8-17')
+    return accommodation
+
+
+class AccommodationExpandAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.room = RoomType.objects.create(room_type='Double', price_per_night=Decimal('100.00'),
+                                            max_occupancy=2, availability=True)
+        self.suite = RoomType.objects.create(room_type='Suite', price_per_night=Decimal('300.00'),
+                                             max_occupancy=4, availability=True)
+        self.accommodation = create_accommodation('Hotel', types=[self.room, self.suite])
+
+    def count_catalogue_queries(self, url, params):
+        get_response_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len([query for query in queries if 'FROM "accommodation_' in query['sql']])
+
+    def test_types_are_listed_without_expansion(self):
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(res.data['results'][0]['types'], [self.room.id, self.suite.id])
+        self.assertNotIn('guest_services', res.data['results'][0])
+
+    def test_expanded_representation(self):
+        user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        FeedbackReview.objects.create(accommodation_id=self.accommodation, user=user, rating=4, review='Good',
+                                      date=date(2025, 3, 1))
+        FeedbackReview.objects.create(accommodation_id=self.accommodation, user=user, rating=5, review='Great',
+                                      date=date(2025, 3, 2))
+
+        res = self.client.get(ACCOMMODATION_URL, {'expand': 'types,guest_services,rating_summary'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        accommodation = res.data['results'][0]
+        self.assertEqual([room['room_type'] for room in accommodation['types']], ['Double', 'Suite'])
+        self.assertEqual([service['service_name'] for service in accommodation['guest_services']], ['Laundry'])
+        self.assertEqual(accommodation['rating_summary'], {
+            'review_count': 2, 'average_rating': 4.5, 'histogram': {'1': 0, '2': 0, '3': 0, '4': 1, '5': 1},
+        })
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        params = {'expand': 'types,guest_services,rating_summary'}
+        few = self.count_catalogue_queries(ACCOMMODATION_URL, params)
+        plain_few = self.count_catalogue_queries(ACCOMMODATION_URL, {})
+        for i in range(5):
+            create_accommodation(f"Guest House {i}", types=[self.room])
+
+        self.assertEqual(self.count_catalogue_queries(ACCOMMODATION_URL, params), few)
+        self.assertEqual(self.count_catalogue_queries(ACCOMMODATION_URL, {}), plain_few)
+        # COUNT(*) of the page, the guest services and their accommodations
+        self.assertEqual(self.count_catalogue_queries(GUEST_SERVICE_URL, {'expand': 'accommodation'}), 3)
+
+    def test_expanded_responses_follow_writes_to_expanded_models(self):
+        self.client.get(ACCOMMODATION_URL, {'expand': 'guest_services'})
+        with self.captureOnCommitCallbacks(execute=True):
+            GuestService.objects.create(accommodation_id=self.accommodation, service_name='Spa',
+                                        price=Decimal('50.00'), availability_hours='10-20')
+
+        res = self.client.get(ACCOMMODATION_URL, {'expand': 'guest_services'})
+
+        self.assertEqual(len(res.data['results'][0]['guest_services']), 2)
+
+    def test_unknown_expansion(self):
+        res = self.client.get(ACCOMMODATION_URL, {'expand': 'types,owner'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_ignore_expansions(self):
+        admin = get_user_model().objects.create_user(email='admin@example.com', password='password123',
+                                                     is_staff=True)
+        self.client.force_authenticate(admin)
+
+        res = self.client.patch(f"{reverse('accommodation:accommodation-detail', args=[self.accommodation.id])}"
+                                f"?expand=types", {'types': [self.room.id]})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['types'], [self.room.id])
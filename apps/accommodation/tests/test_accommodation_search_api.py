@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, RoomBooking, RoomType
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+SEARCH_URL = reverse('accommodation:accommodation-search')
+
+
+def create_accommodation(name, location='Kampala', star_rating=3, total_rooms=5, types=()):
+    accommodation = Accommodation.objects.create(
+        name=name,
+        location=location,
+        star_rating=star_rating,
+        total_rooms=total_rooms,
+        amenities='Wifi',
+        check_in_time='09:00:00',
+        check_out_time='17:00:00',
+        contact_info='0700000000'
+    )
+    accommodation.types.set(types)
+    return accommodation
+
+
+def create_room_type(price, max_occupancy=2, availability=True):
+    return RoomType.objects.create(room_type=f"Room {price}", price_per_night=Decimal(price),
+                                   max_occupancy=max_occupancy, availability=availability)
+
+
+class AccommodationSearchAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.single = create_room_type('50.00', max_occupancy=1)
+        self.double = create_room_type('100.00', max_occupancy=2)
+        self.family = create_room_type('180.00', max_occupancy=4)
+        self.closed = create_room_type('20.00', max_occupancy=4, availability=False)
+        self.hotel = create_accommodation('Hotel', star_rating=4, total_rooms=1,
+                                          types=[self.double, self.family, self.closed])
+        self.hostel = create_accommodation('Hostel', star_rating=2, types=[self.single, self.double])
+        self.lodge = create_accommodation('Lodge', location='Entebbe', star_rating=5, types=[self.family])
+
+    def search(self, **params):
+        params = {'check_in_date': '2025-03-01', 'check_out_date': '2025-03-04', **params}
+        res = self.client.get(SEARCH_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_cheapest_room_type_and_stay_price(self):
+        results = self.search()
+
+        self.assertEqual([result['accommodation']['name'] for result in results], ['Hostel', 'Hotel', 'Lodge'])
+        self.assertEqual(results[0]['room_type']['id'], self.single.id)
+        self.assertEqual(results[0]['nights'], 3)
+        self.assertEqual(results[0]['total_price'], Decimal('150.00'))
+        self.assertEqual(results[1]['room_type']['id'], self.double.id)
+        self.assertEqual(results[1]['free_rooms'], 1)
+
+    def test_filters(self):
+        results = self.search(guests=3)
+        self.assertEqual([result['room_type']['id'] for result in results], [self.family.id, self.family.id])
+
+        results = self.search(location='kampala', min_price='60', max_price='150')
+        # Same price: the better rated accommodation first
+        self.assertEqual([result['accommodation']['name'] for result in results], ['Hotel', 'Hostel'])
+        self.assertEqual({result['room_type']['id'] for result in results}, {self.double.id})
+
+        results = self.search(min_star_rating=4, limit=1)
+        self.assertEqual([result['accommodation']['name'] for result in results], ['Hotel'])
+
+    def test_fully_booked_accommodations_are_left_out(self):
+        user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        RoomBooking.objects.create(room_type_id=self.double, accommodation_id=self.hotel, user_id=user,
+                                   check_in_date='2025-03-03', check_out_date='2025-03-05')
+
+        self.assertNotIn('Hotel', [result['accommodation']['name'] for result in self.search()])
+        self.assertIn('Hotel', [result['accommodation']['name'] for result in
+                                self.search(check_in_date='2025-03-05', check_out_date='2025-03-06')])
+
+    def test_query_count_does_not_grow_with_results(self):
+        for i in range(10):
+            create_accommodation(f"Guest House {i}", types=[self.single, self.double])
+
+        with CaptureQueriesContext(connection) as queries:
+            results = self.search()
+
+        self.assertEqual(len(results), 13)
+        self.assertLessEqual(len([query for query in queries if 'FROM "accommodation_' in query['sql']]), 3)
+
+    def test_invalid_search(self):
+        res = self.client.get(SEARCH_URL, {'check_in_date': '2025-03-04', 'check_out_date': '2025-03-01'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(SEARCH_URL, {'check_in_date': '2025-03-01', 'check_out_date': '2025-03-04',
+                                           'min_price': '200', 'max_price': '100'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
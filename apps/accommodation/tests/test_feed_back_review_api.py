@@ -66,7 +66,7 @@ class PublicFeedBackReviewAPITests(TestCase):
         res = self.client.get(FEED_BACK_REVIEW_API_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_feed_back_review_detail(self):
         feed_back_review = create_feed_back_review(
@@ -63,7 +63,7 @@ class PublicGuestServiceAPITests(TestCase):
         res = self.client.get(GUEST_SERVICE_API_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_guest_service_detail(self):
         guest_service = create_guest_service(
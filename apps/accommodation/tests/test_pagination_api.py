@@ -0,0 +1,103 @@
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, FeedbackReview, GuestService
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+GUEST_SERVICE_URL = reverse('accommodation:guest-service-list')
+
+
+def guest_services_url(accommodation_id):
+    return reverse('accommodation:guest-service-get-guest-service-by-accommodation', args=[accommodation_id])
+
+
+def feedback_url(accommodation_id):
+    return reverse('accommodation:feedback-review-get-feedback-by-accommodation', args=[accommodation_id])
+
+
+class PaginationAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        self.accommodation = Accommodation.objects.create(
+            name='Hotel',
+            location='Kampala',
+            star_rating=4,
+            total_rooms=10,
+            amenities='Wifi',
+            check_in_time='09:00:00',
+            check_out_time='17:00:00',
+            contact_info='0700000000'
+        )
+        self.services = [
+            GuestService.objects.create(accommodation_id=self.accommodation, service_name=f"Service {i}",
+                                        price=Decimal('5.00'), availability_hours='8-17')
+            for i in range(5)
+        ]
+        self.reviews = [
+            FeedbackReview.objects.create(accommodation_id=self.accommodation, user=self.user, rating=i % 5 + 1,
+                                          review=f"Review {i}", date='2025-03-01')
+            for i in range(7)
+        ]
+
+    @override_settings(PAGINATION_SETTINGS={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3})
+    def test_lists_are_paginated_by_default(self):
+        for url in [GUEST_SERVICE_URL, guest_services_url(self.accommodation.id), feedback_url(self.accommodation.id)]:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(res.data['results']), 2)
+            self.assertIsNotNone(res.data['next'])
+
+            res = self.client.get(url, {'page_size': 1000})
+            self.assertEqual(len(res.data['results']), 3)
+
+    def test_page_numbers(self):
+        res = self.client.get(GUEST_SERVICE_URL, {'page_size': 2, 'page': 2})
+        self.assertEqual(res.data['count'], 5)
+        self.assertEqual([service['id'] for service in res.data['results']],
+                         [service.id for service in self.services[2:4]])
+
+        res = self.client.get(guest_services_url(self.accommodation.id), {'page': 1})
+        self.assertEqual(len(res.data['results']), 5)
+        self.assertIsNone(res.data['next'])
+
+    @override_settings(PAGINATION_SETTINGS={'PAGE_SIZE': 2, 'MAX_PAGE_SIZE': 3})
+    def test_page_size_limits(self):
+        res = self.client.get(guest_services_url(self.accommodation.id), {'page': 1})
+        self.assertEqual(len(res.data['results']), 2)
+
+        res = self.client.get(guest_services_url(self.accommodation.id), {'page_size': 1000})
+        self.assertEqual(len(res.data['results']), 3)
+
+    def test_cursor_pages(self):
+        ids = []
+        res = self.client.get(feedback_url(self.accommodation.id), {'cursor': '', 'page_size': 3})
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', res.data)
+            ids += [review['id'] for review in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, [review.id for review in reversed(self.reviews)])
+
+    @override_settings(PAGINATION_SETTINGS={'STREAM_CHUNK_SIZE': 3})
+    def test_ndjson_stream(self):
+        res = self.client.get(feedback_url(self.accommodation.id), {'stream': 'ndjson'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(res.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['review'] for line in lines], [f"Review {i}" for i in range(7)])
+
+        res = self.client.get(feedback_url(self.accommodation.id), {'stream': 'csv'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
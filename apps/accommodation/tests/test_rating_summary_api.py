@@ -0,0 +1,137 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, AccommodationRatingSummary, FeedbackReview
+from apps.accommodation.ratings import add_rating
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+FEEDBACK_REVIEW_URL = reverse('accommodation:feedback-review-list')
+
+
+def create_accommodation(name, location='Kampala'):
+    return Accommodation.objects.create(
+        name=name,
+        location=location,
+        star_rating=3,
+        total_rooms=10,
+        amenities='Wifi',
+        check_in_time='09:00:00',
+        check_out_time='17:00:00',
+        contact_info='0700000000'
+    )
+
+
+def review_detail_url(feedback_review_id):
+    return reverse('accommodation:feedback-review-detail', args=[feedback_review_id])
+
+
+class RatingSummaryAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        self.client.force_authenticate(self.user)
+        self.hotel = create_accommodation('Hotel')
+        self.lodge = create_accommodation('Lodge')
+        self.camp = create_accommodation('Camp', location='Entebbe')
+
+    def review(self, accommodation, rating):
+        res = self.client.post(FEEDBACK_REVIEW_URL, {'accommodation_id': accommodation.id, 'user': self.user.id,
+                                                     'rating': rating, 'review': 'Review', 'date': '2025-03-01'})
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data['id']
+
+    def get_summary(self, accommodation):
+        return AccommodationRatingSummary.objects.get(accommodation=accommodation)
+
+    def test_summary_follows_review_writes(self):
+        self.assertEqual(self.get_summary(self.hotel).review_count, 0)
+        review_id = self.review(self.hotel, 5)
+        self.review(self.hotel, 2)
+
+        summary = self.get_summary(self.hotel)
+        self.assertEqual((summary.review_count, summary.average_rating), (2, 3.5))
+        self.assertEqual((summary.rating_2, summary.rating_5), (1, 1))
+
+        res = self.client.patch(review_detail_url(review_id), {'rating': 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        summary = self.get_summary(self.hotel)
+        self.assertEqual((summary.review_count, summary.average_rating), (2, 2.5))
+        self.assertEqual((summary.rating_3, summary.rating_5), (1, 0))
+
+        res = self.client.patch(review_detail_url(review_id), {'accommodation_id': self.lodge.id})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_summary(self.hotel).average_rating, 2)
+        self.assertEqual(self.get_summary(self.lodge).average_rating, 3)
+
+        res = self.client.delete(review_detail_url(review_id))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        summary = self.get_summary(self.lodge)
+        self.assertEqual((summary.review_count, summary.average_rating, summary.rating_3), (0, 0, 0))
+
+    def test_average_is_set_from_stored_columns(self):
+        add_rating(self.hotel.id, 4, 1)
+        with CaptureQueriesContext(connection) as queries:
+            add_rating(self.hotel.id, 1, 1)
+
+        updates = [query['sql'] for query in queries
+                   if query['sql'].startswith('UPDATE "accommodation_accommodationratingsummary"')]
+        # MySQL would compute the average from the already incremented count in a single UPDATE
+        self.assertEqual(len(updates), 2)
+        self.assertNotIn('"average_rating" =', updates[0])
+        self.assertNotIn('"review_count" =', updates[1])
+        self.assertEqual(self.get_summary(self.hotel).average_rating, 2.5)
+
+    def test_reviews_deleted_in_cascade(self):
+        self.review(self.hotel, 4)
+        other = get_user_model().objects.create_user(email='other@example.com', password='password123')
+        FeedbackReview.objects.create(accommodation_id=self.hotel, user=other, rating=2, review='Review',
+                                      date='2025-03-01')
+
+        other.delete()
+
+        self.assertEqual(self.get_summary(self.hotel).average_rating, 4)
+
+    def test_ratings_are_out_of_five(self):
+        res = self.client.post(FEEDBACK_REVIEW_URL, {'accommodation_id': self.hotel.id, 'user': self.user.id,
+                                                     'rating': 6, 'review': 'Review', 'date': '2025-03-01'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_top_rated_in_a_location(self):
+        self.review(self.lodge, 4)
+        self.review(self.camp, 5)
+        params = {'location': 'Kampala', 'ordering': '-average_rating', 'expand': 'rating_summary'}
+
+        res = self.client.get(ACCOMMODATION_URL, params)
+        self.assertEqual([accommodation['name'] for accommodation in res.data['results']], ['Lodge', 'Hotel'])
+        self.assertIsNone(res.data['results'][1]['rating_summary']['average_rating'])
+
+        # The cached listing follows new ratings
+        with self.captureOnCommitCallbacks(execute=True):
+            self.review(self.hotel, 5)
+        res = self.client.get(ACCOMMODATION_URL, params)
+        self.assertEqual([accommodation['name'] for accommodation in res.data['results']], ['Hotel', 'Lodge'])
+
+        res = self.client.get(ACCOMMODATION_URL, {'ordering': 'review_count,name'})
+        self.assertEqual([accommodation['name'] for accommodation in res.data['results']], ['Camp', 'Hotel', 'Lodge'])
+
+    def test_rebuild_rating_summaries_command(self):
+        self.review(self.hotel, 4)
+        self.review(self.hotel, 1)
+        AccommodationRatingSummary.objects.all().delete()
+
+        call_command('rebuild_rating_summaries', stdout=StringIO())
+
+        summary = self.get_summary(self.hotel)
+        self.assertEqual((summary.review_count, summary.average_rating, summary.rating_1, summary.rating_4),
+                         (2, 2.5, 1, 1))
+        self.assertEqual(self.get_summary(self.camp).review_count, 0)
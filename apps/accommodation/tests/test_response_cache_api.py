@@ -0,0 +1,158 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, RoomType
+from apps.customUser.models import EventLog, ExportJob, ModelVersion
+from tourism_ecosystem.response_cache import get_version_label, get_versions
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_accommodation(**params):
+    defaults = {
+        'name': 'Test Accommodation',
+        'location': 'Test Location',
+        'star_rating': 4,
+        'total_rooms': 100,
+        'amenities': 'Test amenities',
+        'check_in_time': '09:00:00',
+        'check_out_time': '17:00:00',
+        'contact_info': 'Test contact info',
+    }
+    defaults.update(params)
+    return Accommodation.objects.create(**defaults)
+
+
+def detail_url(accommodation_id):
+    return reverse('accommodation:accommodation-detail', args=[accommodation_id])
+
+
+class ResponseCacheAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.accommodation = create_accommodation()
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(ACCOMMODATION_URL)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+        self.assertFalse([query for query in queries if 'FROM "accommodation_' in query['sql']])
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get(ACCOMMODATION_URL)
+        res = self.client.get(ACCOMMODATION_URL, {'page': 1})
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_visibility_classes_do_not_share_responses(self):
+        self.client.get(detail_url(self.accommodation.id))
+        admin = create_user(email='admin@example.com', password='testpass123', is_staff=True)
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(detail_url(self.accommodation.id))
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+
+    def test_admin_write_invalidates_cached_responses(self):
+        admin = create_user(email='admin@example.com', password='testpass123', is_staff=True)
+        self.client.get(detail_url(self.accommodation.id))
+        self.client.get(ACCOMMODATION_URL)
+        self.client.force_authenticate(admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(detail_url(self.accommodation.id), {'name': 'Renamed'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+        detail = self.client.get(detail_url(self.accommodation.id))
+        listing = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(detail['X-Cache'], 'MISS')
+        self.assertEqual(detail.data['name'], 'Renamed')
+        self.assertEqual(listing.data['results'][0]['name'], 'Renamed')
+
+    def test_orm_writes_invalidate_cached_responses(self):
+        self.client.get(ACCOMMODATION_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_accommodation(name='Second')
+
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(res['X-Cache'], 'MISS')
+        self.assertEqual(len(res.data['results']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Accommodation.objects.get(name='Second').delete()
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_versions_are_bumped_on_commit(self):
+        labels = [get_version_label(Accommodation)]
+        before = get_versions(labels)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_accommodation(name='Second')
+            self.assertEqual(get_versions(labels), before)
+        self.assertNotEqual(get_versions(labels), before)
+
+        with self.captureOnCommitCallbacks() as callbacks, self.assertRaises(RuntimeError), transaction.atomic():
+            create_accommodation(name='Third')
+            raise RuntimeError
+        self.assertEqual(callbacks, [])
+
+    def test_untracked_models_are_not_versioned(self):
+        user = create_user(email='test@example.com', password='testpass123')
+        ModelVersion.objects.all().delete()
+
+        SessionStore().create()
+        EventLog.objects.create(case_id='user_1', activity='Accommodation List', start_time='2025-03-01T09:00Z')
+        ExportJob.objects.create(format='csv', created_by=user).delete()
+
+        self.assertFalse(ModelVersion.objects.exists())
+
+    def test_related_writes_invalidate_cached_responses(self):
+        room = RoomType.objects.create(room_type='Suite', price_per_night=100, max_occupancy=2, availability=True)
+        self.client.get(detail_url(self.accommodation.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.accommodation.types.add(room)
+        res = self.client.get(detail_url(self.accommodation.id))
+        self.assertEqual(res.data['types'], [room.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            room.delete()
+        res = self.client.get(detail_url(self.accommodation.id))
+        self.assertEqual(res.data['types'], [])
+
+    def test_errors_are_not_cached(self):
+        self.client.get(detail_url(self.accommodation.id + 1))
+        res = self.client.get(detail_url(self.accommodation.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('X-Cache', res)
+
+    @override_settings(RESPONSE_CACHE_SETTINGS={'ENABLED': False})
+    def test_disabled_cache(self):
+        self.client.get(ACCOMMODATION_URL)
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Cache', res)
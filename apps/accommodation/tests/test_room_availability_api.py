@@ -0,0 +1,156 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.accommodation.models import Accommodation, RoomBooking, RoomNight, RoomType
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+AVAILABILITY_URL = reverse('accommodation:accommodation-availability')
+ROOM_BOOKING_URL = reverse('accommodation:room-booking-list')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def booking_detail_url(room_booking_id):
+    return reverse('accommodation:room-booking-detail', args=[room_booking_id])
+
+
+class RoomAvailabilityAPITests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.user = create_user(email='test@example.com', password='password123')
+        self.room = RoomType.objects.create(room_type='Double', price_per_night=Decimal('100.00'),
+                                            max_occupancy=2, availability=True)
+        self.accommodation = Accommodation.objects.create(
+            name='Test Accommodation',
+            location='Test Location',
+            star_rating=4,
+            total_rooms=2,
+            amenities='Test amenities',
+            check_in_time='09:00:00',
+            check_out_time='17:00:00',
+            contact_info='Test contact info'
+        )
+        self.accommodation.types.set([self.room])
+
+    def book(self, check_in_date, check_out_date, room_type=None):
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(ROOM_BOOKING_URL, {
+                'room_type_id': (room_type or self.room).id,
+                'accommodation_id': self.accommodation.id,
+                'user_id': self.user.id,
+                'check_in_date': check_in_date,
+                'check_out_date': check_out_date,
+            })
+
+    def get_free_rooms(self, check_in_date, check_out_date):
+        res = self.client.get(AVAILABILITY_URL, {'accommodation_id': self.accommodation.id,
+                                                 'check_in_date': check_in_date, 'check_out_date': check_out_date})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data['free_rooms']
+
+    def test_availability(self):
+        res = self.client.get(AVAILABILITY_URL, {'accommodation_id': self.accommodation.id,
+                                                 'check_in_date': '2025-03-01', 'check_out_date': '2025-03-04'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['total_rooms'], 2)
+        self.assertEqual(res.data['free_rooms'], 2)
+        self.assertEqual(res.data['room_types'], [{
+            'room_type_id': self.room.id, 'room_type': 'Double', 'price_per_night': Decimal('100.00'),
+            'free_rooms': 2,
+        }])
+
+    def test_bookings_hold_only_their_nights(self):
+        self.assertEqual(self.book('2025-03-01', '2025-03-04').status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.get_free_rooms('2025-03-03', '2025-03-05'), 1)
+        self.assertEqual(self.get_free_rooms('2025-03-04', '2025-03-06'), 2)
+        self.assertEqual(self.get_free_rooms('2025-02-27', '2025-03-01'), 2)
+        self.assertEqual(RoomNight.objects.get(night='2025-03-02').booked, 1)
+
+    def test_full_accommodation_rejects_bookings(self):
+        self.book('2025-03-01', '2025-03-03')
+        self.book('2025-03-02', '2025-03-05')
+
+        res = self.book('2025-03-02', '2025-03-03')
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(RoomBooking.objects.count(), 2)
+        self.assertEqual(self.get_free_rooms('2025-03-02', '2025-03-03'), 0)
+        self.assertEqual(self.book('2025-03-03', '2025-03-04').status_code, status.HTTP_201_CREATED)
+
+    def test_unavailable_room_type_rejects_bookings(self):
+        self.room.availability = False
+        self.room.save()
+
+        res = self.book('2025-03-01', '2025-03-03')
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_moving_and_deleting_bookings_release_nights(self):
+        booking_id = self.book('2025-03-01', '2025-03-03').data['id']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.patch(booking_detail_url(booking_id), {'check_in_date': '2025-04-01',
+                                                                     'check_out_date': '2025-04-02'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_free_rooms('2025-03-01', '2025-03-03'), 2)
+        self.assertEqual(self.get_free_rooms('2025-04-01', '2025-04-02'), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.delete(booking_detail_url(booking_id))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.get_free_rooms('2025-04-01', '2025-04-02'), 2)
+
+    def test_invalid_bookings(self):
+        other_room = RoomType.objects.create(room_type='Suite', price_per_night=Decimal('300.00'),
+                                             max_occupancy=4, availability=True)
+
+        res = self.book('2025-03-03', '2025-03-03')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.book('2025-03-01', '2025-03-03', room_type=other_room)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_availability_queries(self):
+        res = self.client.get(AVAILABILITY_URL, {'accommodation_id': self.accommodation.id,
+                                                 'check_in_date': '2025-03-03', 'check_out_date': '2025-03-01'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(AVAILABILITY_URL, {'accommodation_id': self.accommodation.id + 1,
+                                                 'check_in_date': '2025-03-01', 'check_out_date': '2025-03-03'})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bookings_change_the_availability_etag(self):
+        params = {'accommodation_id': self.accommodation.id, 'check_in_date': '2025-03-01',
+                  'check_out_date': '2025-03-03'}
+        self.client.force_authenticate(self.user)
+        etag = self.client.get(AVAILABILITY_URL, params)['ETag']
+        self.book('2025-03-01', '2025-03-02')
+
+        res = self.client.get(AVAILABILITY_URL, params, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['free_rooms'], 1)
+
+    def test_rebuild_room_nights_command(self):
+        self.book('2025-03-01', '2025-03-03')
+        self.book('2025-03-02', '2025-03-04')
+        RoomNight.objects.all().delete()
+
+        call_command('rebuild_room_nights', stdout=StringIO())
+
+        self.assertEqual(dict(RoomNight.objects.values_list('night', 'booked')), {
+            date(2025, 3, 1): 1, date(2025, 3, 2): 2, date(2025, 3, 3): 1,
+        })
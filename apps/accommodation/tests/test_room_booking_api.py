@@ -90,14 +90,14 @@ class PublicRoomBookingAPITests(TestCase):
         res = self.client.get(ROOM_BOOKING_URL)
 
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
-        self.assertEqual(res.data[0]['total_price'], '400.00')
+        self.assertEqual(res.data['results'][0]['total_price'], '400.00')
 
         self.user.is_staff = True
         res = self.client.get(ROOM_BOOKING_URL)
         self.assertEqual(res.status_code, 200)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_room_booking_detail(self):
         user2 = create_user(
@@ -1,12 +1,12 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.accommodation.models import RoomType
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 ROOM_TYPE_URL = reverse('accommodation:room-type-list')
 
@@ -26,8 +26,9 @@ def detail_url(room_type_id):
     )
 
 
-class PublicRoomTypeAPITests(TestCase):
+class PublicRoomTypeAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
 
     def test_retrieve_room_types(self):
@@ -48,10 +49,10 @@ class PublicRoomTypeAPITests(TestCase):
         res = self.client.get(ROOM_TYPE_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
-        self.assertEqual(res.data[0]['room_type'], 'Test Room Type')
-        self.assertEqual(res.data[1]['room_type'], 'Test Room Type 2')
+        self.assertEqual(res.data['results'][0]['room_type'], 'Test Room Type')
+        self.assertEqual(res.data['results'][1]['room_type'], 'Test Room Type 2')
 
     def test_retrieve_room_type_detail(self):
         room_type = create_room_type(
@@ -70,8 +71,9 @@ class PublicRoomTypeAPITests(TestCase):
         self.assertEqual(res.data['availability'], room_type.availability)
 
 
-class PrivateRoomTypeAPITests(TestCase):
+class PrivateRoomTypeAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user(
             email='test@example.com',
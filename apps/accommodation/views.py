@@ -1,26 +1,110 @@
+from django.db.models import F
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
-from apps.accommodation.models import Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview
+from apps.accommodation.availability import get_availability, search_accommodations
+from apps.accommodation.models import Accommodation, RoomType, RoomBooking, GuestService, FeedbackReview, RoomNight, \
+    AccommodationRatingSummary
 from apps.accommodation.serializers import AccommodationSerializer, RoomTypeSerializer, \
-    RoomBookingSerializer, AccommodationCalculatePriceSerializer, GuestServiceSerializer, FeedbackReviewSerializer
+    RoomBookingSerializer, AccommodationCalculatePriceSerializer, GuestServiceSerializer, FeedbackReviewSerializer, \
+    RoomAvailabilitySerializer, AccommodationSearchSerializer, AccommodationRatingSummarySerializer
+from tourism_ecosystem.expansions import Expansion
+from tourism_ecosystem.pagination import ListCursorPagination
 from tourism_ecosystem.permissions import IsAdminOrReadOnly, IsOwnerOrAdmin
+from tourism_ecosystem.response_cache import CachedReadMixin
 from tourism_ecosystem.views import LoggingViewSet
 
 
 @extend_schema(tags=['AM - Accommodation'])
-class AccommodationViewSet(LoggingViewSet):
-    queryset = Accommodation.objects.all()
+class AccommodationViewSet(CachedReadMixin, LoggingViewSet):
+    queryset = Accommodation.objects.prefetch_related('types').alias(
+        average_rating=F('rating_summary__average_rating'),
+        review_count=F('rating_summary__review_count'),
+    )
     serializer_class = AccommodationSerializer
     permission_classes = [IsAdminOrReadOnly]
     activity_name = "Accommodation"  # 确保这里设置了正确的activity_name
+    cache_actions = ('list', 'retrieve', 'availability', 'search')
+    expansions = {
+        'types': Expansion(RoomTypeSerializer, source='types'),
+        'guest_services': Expansion(GuestServiceSerializer, source='guestservice_set'),
+        'rating_summary': Expansion(AccommodationRatingSummarySerializer, source='rating_summary'),
+    }
+    # ?ordering=-average_rating&location=X lists the top rated accommodations of a location
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['name', 'star_rating', 'average_rating', 'review_count']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        location = self.request.query_params.get('location')
+        if self.action == 'list' and location:
+            queryset = queryset.filter(location=location)
+        return queryset
+
+    def get_version_models(self):
+        if self.action in ('availability', 'search'):
+            return [Accommodation, RoomType, RoomNight]
+        models = super().get_version_models()
+        if self.request.query_params.get('ordering'):
+            # The order follows the ratings
+            models.append(AccommodationRatingSummary)
+        return models
+
+    @extend_schema(parameters=[RoomAvailabilitySerializer])
+    @action(detail=False, methods=['get'], url_path='availability', permission_classes=[AllowAny])
+    def availability(self, request, *args, **kwargs):
+        """
+        Number of rooms free on every night between check_in_date and check_out_date.
+        """
+        serializer = RoomAvailabilitySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        try:
+            accommodation = Accommodation.objects.get(id=params['accommodation_id'])
+        except Accommodation.DoesNotExist:
+            return Response({"detail": f"Accommodation with id {params['accommodation_id']} does not exist."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(get_availability(accommodation, params['check_in_date'], params['check_out_date'],
+                                         params.get('room_type_id')))
+
+    @extend_schema(parameters=[AccommodationSearchSerializer])
+    @action(detail=False, methods=['get'], url_path='search', permission_classes=[AllowAny])
+    def search(self, request, *args, **kwargs):
+        """
+        Accommodations with a free room for the stay, with their cheapest matching room type
+        and the total price of the stay, cheapest first.
+        """
+        serializer = AccommodationSearchSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        nights = (params['check_out_date'] - params['check_in_date']).days
+        accommodations = search_accommodations(
+            params['check_in_date'], params['check_out_date'],
+            guests=params['guests'],
+            location=params.get('location'),
+            min_price=params.get('min_price'),
+            max_price=params.get('max_price'),
+            min_star_rating=params.get('min_star_rating'),
+            limit=params['limit'],
+        )
+        return Response([
+            {
+                'accommodation': AccommodationSerializer(accommodation).data,
+                'room_type': RoomTypeSerializer(accommodation.room_type).data,
+                'free_rooms': accommodation.free_rooms,
+                'nights': nights,
+                'total_price': accommodation.room_type.price_per_night * nights,
+            }
+            for accommodation in accommodations
+        ])
 
 
 @extend_schema(tags=['AM - Room Type'])
-class RoomTypeViewSet(LoggingViewSet):
+class RoomTypeViewSet(CachedReadMixin, LoggingViewSet):
     queryset = RoomType.objects.all()
     serializer_class = RoomTypeSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -33,6 +117,7 @@ class RoomBookingViewSet(LoggingViewSet):
     serializer_class = RoomBookingSerializer
     permission_classes = [IsAuthenticated]
     activity_name = "Room Booking"
+    pagination_class = ListCursorPagination
 
     def perform_create(self, serializer):
         serializer.save(user_id=self.request.user)
@@ -95,6 +180,11 @@ class GuestServiceViewSet(LoggingViewSet):
     serializer_class = GuestServiceSerializer
     permission_classes = [IsAdminOrReadOnly]
     activity_name = "Guest Service"
+    expansions = {
+        'accommodation': Expansion(AccommodationSerializer, source='accommodation_id',
+                                   prefetch_related=['accommodation_id__types']),
+    }
+    version_parents = {'get_guest_service_by_accommodation': ('accommodation_id', 'accommodation_id')}
 
     @action(detail=False, methods=['get'],
             url_path='guestService/(?P<accommodation_id>[^/.]+)',
@@ -108,14 +198,13 @@ class GuestServiceViewSet(LoggingViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
 
         guest_services = self.get_guest_services_by_accommodation(accommodation_id)
-        serializer = self.get_serializer(guest_services, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_list_response(guest_services)
 
     def get_guest_services_by_accommodation(self, accommodation_id):
         """
         Helper method to get guest services by accommodation_id
         """
-        return self.queryset.filter(accommodation_id=accommodation_id)
+        return self.filter_queryset(self.get_queryset()).filter(accommodation_id=accommodation_id)
 
 
 @extend_schema(tags=['AM - Feedback Review'])
@@ -124,6 +213,8 @@ class FeedbackReviewViewSet(LoggingViewSet):
     serializer_class = FeedbackReviewSerializer
     permission_classes = [IsOwnerOrAdmin]
     activity_name = "Feedback Review"
+    pagination_class = ListCursorPagination
+    version_parents = {'get_feedback_by_accommodation': ('accommodation_id', 'accommodation_id')}
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -140,11 +231,10 @@ class FeedbackReviewViewSet(LoggingViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
 
         feedbacks = self.get_feedbacks_by_accommodation(accommodation_id)
-        serializer = self.get_serializer(feedbacks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_list_response(feedbacks)
 
     def get_feedbacks_by_accommodation(self, accommodation_id):
         """
         Helper method to get feedbacks by accommodation_id
         """
-        return self.queryset.filter(accommodation_id=accommodation_id)
+        return self.filter_queryset(self.get_queryset()).filter(accommodation_id=accommodation_id)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.customUser"
+
+    def ready(self):
+        # Register signal handlers
+        from apps.customUser import signals
+        signals.connect_version_receivers()
@@ -0,0 +1,96 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from apps.customUser.exporters import get_export_queryset, iter_csv, iter_gzip, iter_xes
+from apps.customUser.models import ExportJob
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+logger = logging.getLogger(__name__)
+
+EXPORT_GENERATORS = {
+    ExportJob.FORMAT_CSV: iter_csv,
+    ExportJob.FORMAT_XES: iter_xes,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=get_event_log_setting('EXPORT_JOB_WORKERS'),
+                                               thread_name_prefix='event-log-export')
+    return _executor
+
+
+def enqueue_export_job(job):
+    """
+    Start the export once the job row is committed. With EXPORT_JOB_WORKERS = 0 the
+    export runs in the calling thread.
+    """
+    def start():
+        if get_event_log_setting('EXPORT_JOB_WORKERS'):
+            get_executor().submit(run_export_job, job.pk, in_worker=True)
+        else:
+            run_export_job(job.pk)
+
+    transaction.on_commit(start)
+
+
+def get_export_path(job, gzip):
+    extension = f".{job.format}.gz" if gzip else f".{job.format}"
+    return os.path.join(get_event_log_setting('EXPORT_DIR'), f"{job.pk}{extension}")
+
+
+def run_export_job(job_id, in_worker=False):
+    """
+    Write the export file of a job. The file is written under a temporary name and
+    renamed once complete, so a download never sees a partial file.
+    """
+    from apps.customUser.serializers import EventLogExportFilterSerializer
+
+    if in_worker:
+        close_old_connections()
+    try:
+        job = ExportJob.objects.get(pk=job_id)
+        job.status = ExportJob.STATUS_RUNNING
+        job.save(update_fields=['status'])
+
+        filter_serializer = EventLogExportFilterSerializer(data=job.filters)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        content = EXPORT_GENERATORS[job.format](get_export_queryset(filters))
+        if filters['gzip']:
+            content = iter_gzip(content)
+
+        path = get_export_path(job, filters['gzip'])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial_path = f"{path}.part"
+        with open(partial_path, 'wb') as f:
+            for chunk in content:
+                f.write(chunk)
+        os.replace(partial_path, path)
+
+        job.status = ExportJob.STATUS_COMPLETED
+        job.file_path = path
+        job.file_size = os.path.getsize(path)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'file_path', 'file_size', 'finished_at'])
+        logger.info("Export job %s completed (%d bytes)", job_id, job.file_size)
+    except Exception as e:
+        logger.error("Export job %s failed: %s", job_id, e)
+        ExportJob.objects.filter(pk=job_id).update(
+            status=ExportJob.STATUS_FAILED, error=str(e), finished_at=timezone.now()
+        )
+    finally:
+        if in_worker:
+            connection.close()
@@ -0,0 +1,168 @@
+import csv
+import zlib
+from xml.sax.saxutils import quoteattr
+
+from django.db.models import Max
+
+from apps.customUser.partitions import get_event_log_queryset
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+CSV_COLUMNS = ['Case_id', 'Activity', 'Start Date', 'End Date', 'User_id', 'User', 'User_name']
+CSV_FIELDS = ('case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user', 'user_name')
+XES_FIELDS = ('case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user_name', 'status_code')
+
+XES_HEADER = (
+    '<?xml version="1.0" encoding="utf-8" ?>\n'
+    '<log xes.version="1849-2016" xes.features="nested-attributes" xmlns="http://www.xes-standard.org/">\n'
+    '\t<extension name="Concept" prefix="concept" uri="http://www.xes-standard.org/concept.xesext" />\n'
+    '\t<extension name="Lifecycle" prefix="lifecycle" uri="http://www.xes-standard.org/lifecycle.xesext" />\n'
+    '\t<extension name="Organizational" prefix="org" uri="http://www.xes-standard.org/org.xesext" />\n'
+    '\t<extension name="Time" prefix="time" uri="http://www.xes-standard.org/time.xesext" />\n'
+)
+XES_FOOTER = '</log>\n'
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value, used to get single CSV lines from csv.writer.
+    """
+
+    def write(self, value):
+        return value
+
+
+def filter_event_logs(queryset, filters):
+    """
+    Apply validated filters (see EventLogFilterSerializer) to an EventLog queryset.
+    """
+    if filters.get('start_time'):
+        queryset = queryset.filter(start_time__gte=filters['start_time'])
+    if filters.get('end_time'):
+        queryset = queryset.filter(end_time__lte=filters['end_time'])
+    if filters.get('case_id'):
+        queryset = queryset.filter(case_id=filters['case_id'])
+    if filters.get('activity'):
+        queryset = queryset.filter(activity=filters['activity'])
+    if filters.get('since_id') is not None:
+        queryset = queryset.filter(id__gt=filters['since_id'], end_time__isnull=False)
+    if filters.get('since_end_time'):
+        queryset = queryset.filter(end_time__gt=filters['since_end_time'])
+    return queryset
+
+
+def is_incremental(filters):
+    return filters.get('since_id') is not None or filters.get('since_end_time') is not None
+
+
+def bound_to_cursor(queryset, filters):
+    """
+    Limit the queryset to the events stored right now and return it together with
+    the cursor for the next incremental pull (since_id / since_end_time).
+
+    Both cursors are best effort: since_end_time may miss events written late by the
+    buffered writer, and with concurrent writers ids can become visible out of order
+    when their transactions commit (e.g. auto-increment on MySQL), so an event committed
+    after the pull with a lower id than the cursor is skipped by since_id too.
+    """
+    latest = queryset.aggregate(last_id=Max('id'), last_end_time=Max('end_time'))
+    if latest['last_id'] is None:
+        cursor = {'since_id': filters.get('since_id'), 'since_end_time': filters.get('since_end_time')}
+        return queryset.none(), cursor
+    cursor = {'since_id': latest['last_id'], 'since_end_time': latest['last_end_time'] or filters.get('since_end_time')}
+    return queryset.filter(id__lte=latest['last_id']), cursor
+
+
+def get_export_queryset(filters):
+    return filter_event_logs(get_event_log_queryset(), filters)
+
+
+def format_csv_date(value):
+    """
+    Format a datetime as "day.month.year hour:minute", e.g. 5.3.24 09:07.
+    """
+    if value is None:
+        return ''
+    return f"{value.day}.{value.month}.{value:%y %H:%M}"
+
+
+def iter_csv(queryset, chunk_size=None):
+    """
+    Yield the CSV export of the queryset chunk by chunk, without loading it into memory.
+    """
+    chunk_size = chunk_size or get_event_log_setting('EXPORT_CHUNK_SIZE')
+    writer = csv.writer(Echo(), lineterminator='\n')
+    yield writer.writerow(CSV_COLUMNS).encode()
+
+    lines = []
+    rows = queryset.order_by('id').values_list(*CSV_FIELDS).iterator(chunk_size=chunk_size)
+    for case_id, activity, start_time, end_time, user_id, user, user_name in rows:
+        lines.append(writer.writerow([
+            case_id, activity, format_csv_date(start_time), format_csv_date(end_time), user_id, user, user_name
+        ]))
+        if len(lines) >= chunk_size:
+            yield ''.join(lines).encode()
+            lines = []
+    if lines:
+        yield ''.join(lines).encode()
+
+
+def xes_attribute(tag, key, value):
+    if tag == 'date':
+        value = value.isoformat(timespec='milliseconds')
+    return f'\t\t\t<{tag} key="{key}" value={quoteattr(str(value))} />\n'
+
+
+def xes_event(activity, start_time, end_time, user_id, user_name, status_code):
+    attributes = [
+        xes_attribute('string', 'concept:name', activity),
+        xes_attribute('date', 'time:timestamp', start_time),
+    ]
+    if end_time is not None:
+        attributes.append(xes_attribute('date', 'time:endTimestamp', end_time))
+    if user_name is not None:
+        attributes.append(xes_attribute('string', 'org:resource', user_name))
+    if status_code is not None:
+        attributes.append(xes_attribute('int', 'status', status_code))
+    if user_id is not None:
+        attributes.append(xes_attribute('int', 'user_id', user_id))
+    attributes.append(xes_attribute('string', 'lifecycle:transition', 'complete'))
+    return '\t\t<event>\n' + ''.join(attributes) + '\t\t</event>\n'
+
+
+def iter_xes(queryset, chunk_size=None):
+    """
+    Yield the XES export of the queryset, one trace per case ID, straight from a
+    (case_id, start_time)-ordered cursor. Only the current chunk is kept in memory.
+    """
+    chunk_size = chunk_size or get_event_log_setting('EXPORT_CHUNK_SIZE')
+    yield XES_HEADER.encode()
+
+    parts = []
+    current_case = None
+    rows = queryset.order_by('case_id', 'start_time', 'id').values_list(*XES_FIELDS).iterator(chunk_size=chunk_size)
+    for case_id, *event in rows:
+        if case_id != current_case:
+            if current_case is not None:
+                parts.append('\t</trace>\n')
+            parts.append(f'\t<trace>\n\t\t<string key="concept:name" value={quoteattr(case_id)} />\n')
+            current_case = case_id
+        parts.append(xes_event(*event))
+        if len(parts) >= chunk_size:
+            yield ''.join(parts).encode()
+            parts = []
+    if current_case is not None:
+        parts.append('\t</trace>\n')
+    parts.append(XES_FOOTER)
+    yield ''.join(parts).encode()
+
+
+def iter_gzip(chunks):
+    """
+    Gzip-compress a stream of byte chunks incrementally.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
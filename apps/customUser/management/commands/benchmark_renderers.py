@@ -0,0 +1,61 @@
+import datetime
+import timeit
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.response import Response
+
+from tourism_ecosystem.responses import CustomRenderer, FastCustomRenderer, orjson
+
+
+def build_payload(rows):
+    """
+    A list response shaped like the menu and event log lists: serializer output with a few
+    raw Decimal and date values mixed in.
+    """
+    now = timezone.now()
+    return [
+        {
+            'id': i,
+            'restaurant': i % 50,
+            'item_name': f"Item {i}",
+            'description': "Grilled tilapia with matoke, served with a side of greens — 招牌菜",
+            'price': f"{10000 + i}.00",
+            'discount': Decimal('0.15'),
+            'available': i % 3 != 0,
+            'start_time': now - datetime.timedelta(minutes=i),
+            'date': datetime.date(2024, 1, 1 + i % 28),
+            'opening_time': datetime.time(8, 30),
+            'end_time': None,
+        }
+        for i in range(rows)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare the rendering time of CustomRenderer and FastCustomRenderer on a list response."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help="Number of rows in the rendered list")
+        parser.add_argument('--repeat', type=int, default=50, help="Number of renders timed per renderer")
+
+    def handle(self, *args, **options):
+        data = build_payload(options['rows'])
+        context = {'response': Response(status=200)}
+        renderers = [('CustomRenderer', CustomRenderer()), ('FastCustomRenderer', FastCustomRenderer())]
+
+        outputs = {name: renderer.render(data, 'application/json', context) for name, renderer in renderers}
+        if len(set(outputs.values())) != 1:
+            raise CommandError("The renderers do not produce the same bytes.")
+
+        self.stdout.write(f"{options['rows']} rows, {len(outputs['CustomRenderer'])} bytes, "
+                          f"orjson {'available' if orjson else 'not installed'}")
+        timings = {}
+        for name, renderer in renderers:
+            seconds = timeit.timeit(lambda: renderer.render(data, 'application/json', context),
+                                    number=options['repeat'])
+            timings[name] = seconds / options['repeat'] * 1000
+            self.stdout.write(f"{name}: {timings[name]:.2f} ms per render")
+        speedup = timings['CustomRenderer'] / timings['FastCustomRenderer']
+        self.stdout.write(self.style.SUCCESS(f"FastCustomRenderer is {speedup:.1f}x faster."))
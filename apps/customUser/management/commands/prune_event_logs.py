@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.customUser.retention import prune_event_logs
+
+
+class Command(BaseCommand):
+    help = "Delete old event logs in batches, optionally archiving them to a gzipped file first."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, help="Only delete events that started more than N days ago")
+        parser.add_argument('--keep-last', type=int, help="Keep the N most recent events")
+        parser.add_argument('--batch-size', type=int, help="Number of primary keys deleted per transaction")
+        parser.add_argument('--archive', action='store_true', help="Archive the events before deleting them")
+
+    def handle(self, *args, **options):
+        deleted, archive_path = prune_event_logs(
+            older_than_days=options['older_than_days'],
+            keep_last=options['keep_last'],
+            batch_size=options['batch_size'],
+            archive=options['archive'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} event logs."))
+        if archive_path:
+            self.stdout.write(f"Archived to {archive_path}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.customUser.process_mining import rebuild_process_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute the process-mining aggregates from the stored event logs."
+
+    def handle(self, *args, **options):
+        rebuild_process_aggregates()
+        self.stdout.write(self.style.SUCCESS("Process-mining aggregates rebuilt."))
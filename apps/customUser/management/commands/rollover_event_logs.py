@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.customUser.partitions import drop_partitions, rollover_event_logs
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+
+class Command(BaseCommand):
+    help = "Move the event logs of past periods to their partition tables and drop old partitions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--drop-older-than-days', type=int,
+                            help="Drop the partitions whose whole period is older than N days")
+        parser.add_argument('--archive', action='store_true', help="Archive the partitions before dropping them")
+        parser.add_argument('--batch-size', type=int, help="Number of primary keys moved per transaction")
+
+    def handle(self, *args, **options):
+        if not get_event_log_setting('PARTITIONING'):
+            raise CommandError("EVENT_LOG_SETTINGS['PARTITIONING'] is not enabled.")
+
+        moved = rollover_event_logs(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} event logs to their partitions."))
+
+        if options['drop_older_than_days'] is not None:
+            for table in drop_partitions(options['drop_older_than_days'], archive=options['archive']):
+                self.stdout.write(f"Dropped {table}")
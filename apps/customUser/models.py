@@ -3,6 +3,8 @@ from django.contrib.auth.models import (
     BaseUserManager,  # BaseUserManager is a manager class for custom user models, controlling the user creation process
     PermissionsMixin  # PermissionsMixin is a base class provided by Django for adding user permissions functionality
 )
+import uuid
+
 from django.db import models
 
 from tourism_ecosystem import settings
@@ -55,6 +57,115 @@ class EventLog(models.Model):
                              on_delete=models.SET_NULL)  # Foreign key referencing custom user model
     user_name = models.CharField(max_length=255, null=True, blank=True)  # User's name or username
     status_code = models.IntegerField(null=True, blank=True)  # Status code (for response)
+    incomplete = models.BooleanField(default=False)  # Request never finished (crashed or in flight at shutdown)
+
+    class Meta:
+        indexes = [
+            # Time-ordered scans and keyset pagination on (start_time, id)
+            models.Index(fields=['start_time', 'id'], name='eventlog_start_time_id_idx'),
+            # Case-ordered scans (XES export, per-case queries)
+            models.Index(fields=['case_id', 'start_time', 'id'], name='eventlog_case_start_idx'),
+            models.Index(fields=['activity', 'start_time'], name='eventlog_activity_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"Case ID: {self.case_id}, Activity: {self.activity}, Start Time: {self.start_time}, End Time: {self.end_time}, User: {self.user}, User Name: {self.user_name}, Status: {self.status_code}, Incomplete: {self.incomplete}"
+
+
+class ExportJob(models.Model):
+    """
+    Event log export written to a file by a background worker
+    """
+    FORMAT_CSV = 'csv'
+    FORMAT_XES = 'xes'
+    FORMAT_CHOICES = [(FORMAT_CSV, 'CSV'), (FORMAT_XES, 'XES')]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    filters = models.JSONField(default=dict, blank=True)  # Export filters, see EventLogExportFilterSerializer
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file_path = models.CharField(max_length=500, blank=True)  # Absolute path of the exported file
+    file_size = models.BigIntegerField(null=True, blank=True)  # Size in bytes once completed
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.format.upper()} export {self.id} ({self.status})"
+
+
+class ActivityStatistic(models.Model):
+    """
+    Running frequency and duration statistics of an activity, updated as event logs are written
+    """
+    activity = models.CharField(max_length=255, unique=True)
+    count = models.BigIntegerField(default=0)  # Number of completed events
+    total_duration_ms = models.BigIntegerField(default=0)  # Sum of end_time - start_time
+    duration_histogram = models.JSONField(default=list)  # Event counts per DURATION_BUCKETS_MS bucket
+
+    def __str__(self):
+        return f"{self.activity}: {self.count}"
+
+
+class DirectlyFollows(models.Model):
+    """
+    Number of times the target activity directly followed the source activity in a case
+    """
+    source = models.CharField(max_length=255)
+    target = models.CharField(max_length=255)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'target'], name='directly_follows_unique_pair'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} -> {self.target}: {self.count}"
+
+
+class CaseState(models.Model):
+    """
+    Last activity seen in a case, used to count directly-follows pairs incrementally
+    """
+    case_id = models.CharField(max_length=255, unique=True)
+    last_activity = models.CharField(max_length=255, null=True, blank=True)
+    last_start_time = models.DateTimeField(null=True, blank=True, db_index=True)  # Expired after CASE_IDLE_TIMEOUT
+
+    def __str__(self):
+        return f"{self.case_id}: {self.last_activity}"
+
+
+class ProcessCounter(models.Model):
+    """
+    Running total of the process-mining aggregates that is not kept per activity
+    """
+    name = models.CharField(max_length=255, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class ModelVersion(models.Model):
+    """
+    Version token of a model, replaced whenever one of its rows is written.
+    Part of the cache keys of cached read responses (see tourism_ecosystem/response_cache.py)
+    """
+    label = models.CharField(max_length=255, unique=True)  # app_label.model_name
+    version = models.CharField(max_length=32)
 
     def __str__(self):
-        return f"Case ID: {self.case_id}, Activity: {self.activity}, Start Time: {self.start_time}, End Time: {self.end_time}, User: {self.user}, User Name: {self.user_name}, Status: {self.status_code}"
+        return f"{self.label}: {self.version}"
@@ -0,0 +1,175 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.paginator import EmptyPage, InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.customUser.partitions import PartitionedQuerySet
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+COUNT_MODES = ('exact', 'estimate', 'none')
+
+
+def get_mysql_plan_rows(plan):
+    """
+    Row estimate of a MySQL EXPLAIN, given as a list of row dicts: the rows examined in
+    each joined table times the fraction kept by the conditions.
+    """
+    estimate = 1.0
+    for table in plan:
+        estimate *= (table.get('rows') or 0) * float(table.get('filtered') or 100) / 100
+    return int(round(estimate))
+
+
+def estimate_count(queryset):
+    """
+    Row estimate of the query planner on PostgreSQL and MySQL, summed over the tables of
+    a PartitionedQuerySet. SQLite has no row estimate and falls back to an exact count.
+    """
+    if isinstance(queryset, PartitionedQuerySet):
+        return sum(estimate_count(table_queryset) for table_queryset in queryset.querysets)
+    connection = connections[queryset.db]
+    if connection.vendor not in ('postgresql', 'mysql'):
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0] for column in cursor.description]
+            return get_mysql_plan_rows([dict(zip(columns, row)) for row in cursor.fetchall()])
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
+
+
+class UncountedPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class UncountedPaginator(Paginator):
+    """
+    Page-number paginator that never runs COUNT(*). It fetches one extra row to
+    know whether a next page exists.
+    """
+    count = None
+    num_pages = 0  # Unknown; keeps DRF's "last" page and page controls from counting
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise InvalidPage('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return UncountedPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class EventLogPagination(PageNumberPagination):
+    """
+    Event log pagination.
+
+    Page numbers by default, with ?count=exact|estimate|none choosing how the total
+    is computed. Passing ?cursor= (empty for the first page) switches to keyset
+    pagination on (start_time, id), newest first: every page costs the same, no
+    matter how deep, and no count is run.
+    """
+    page_size = 10  # 每页默认 10 条记录
+    page_size_query_param = 'page_size'  # 允许前端通过查询参数自定义每页条数
+    max_page_size = 100  # 限制每页最多 100 条记录
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    paginators = {
+        'exact': Paginator,
+        'estimate': EstimatedCountPaginator,
+        'none': UncountedPaginator,
+    }
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.cursor_query_param in request.query_params
+        if self.keyset:
+            return self.paginate_keyset(queryset, request)
+
+        count_mode = request.query_params.get(self.count_query_param, get_event_log_setting('LIST_COUNT'))
+        if count_mode not in COUNT_MODES:
+            raise ValidationError({self.count_query_param: f"Expected one of {', '.join(COUNT_MODES)}."})
+        self.django_paginator_class = self.paginators[count_mode]
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_keyset(self, queryset, request):
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by('-start_time', '-id')
+        position = self.decode_cursor(request.query_params[self.cursor_query_param])
+        if position:
+            start_time, pk = position
+            queryset = queryset.filter(start_time__lte=start_time).filter(
+                Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=pk)
+            )
+        rows = list(queryset[:page_size + 1])
+        self.next_position = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = (rows[-1].start_time, rows[-1].id)
+        return rows
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            start_time, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+            start_time = parse_datetime(start_time)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor.')
+        if start_time is None:
+            raise NotFound('Invalid cursor.')
+        return start_time, pk
+
+    def encode_cursor(self, position):
+        start_time, pk = position
+        return base64.urlsafe_b64encode(f"{start_time.isoformat()}|{pk}".encode()).decode()
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
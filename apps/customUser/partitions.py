@@ -0,0 +1,298 @@
+import gzip
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.customUser.models import EventLog
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+logger = logging.getLogger(__name__)
+
+PERIOD_FORMATS = {
+    'month': '%Y%m',
+    'day': '%Y%m%d',
+}
+PERIOD_PATTERNS = {
+    'month': r'\d{6}',
+    'day': r'\d{8}',
+}
+
+_partition_models = {}
+
+
+def get_period_start(value, period):
+    value = value.astimezone(dt_timezone.utc)
+    if period == 'month':
+        return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+    return datetime(value.year, value.month, value.day, tzinfo=dt_timezone.utc)
+
+
+def get_period_end(start, period):
+    if period == 'month':
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def get_partition_table(start, period):
+    return f"{EventLog._meta.db_table}_{start.strftime(PERIOD_FORMATS[period])}"
+
+
+def get_partition_model(start, period):
+    """
+    Model of the table holding the event logs of the period starting at start. It
+    has the fields of EventLog, so querysets of both can be combined.
+    """
+    table = get_partition_table(start, period)
+    if table not in _partition_models:
+        suffix = start.strftime(PERIOD_FORMATS[period])
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), {
+                'app_label': EventLog._meta.app_label,
+                'db_table': table,
+                'managed': False,
+                'indexes': [models.Index(fields=['start_time', 'id'], name=f"eventlog_{suffix}_start_idx")],
+            }),
+            'period_start': start,
+            'period_end': get_period_end(start, period),
+        }
+        for field in EventLog._meta.local_fields:
+            clone = field.clone()
+            if field.is_relation:
+                # Archived events keep the id of a deleted user
+                clone.remote_field.related_name = '+'
+                clone.db_constraint = False
+            attrs[field.name] = clone
+        _partition_models[table] = type(f"EventLog{suffix}", (models.Model,), attrs)
+    return _partition_models[table]
+
+
+def get_partition_models():
+    """
+    Models of the existing partition tables, oldest first.
+    """
+    period = get_event_log_setting('PARTITIONING')
+    pattern = re.compile(rf"^{re.escape(EventLog._meta.db_table)}_({PERIOD_PATTERNS[period]})$")
+    partitions = []
+    for table in sorted(connection.introspection.table_names()):
+        match = pattern.match(table)
+        if match:
+            start = datetime.strptime(match.group(1), PERIOD_FORMATS[period]).replace(tzinfo=dt_timezone.utc)
+            partitions.append(get_partition_model(start, period))
+    return partitions
+
+
+def ensure_partition(start, period):
+    model = get_partition_model(start, period)
+    if model._meta.db_table not in connection.introspection.table_names():
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(model)
+    return model
+
+
+class PartitionedQuerySet:
+    """
+    Read-only view over EventLog and its partition tables, implementing the part of
+    the QuerySet API used by the event log list and exports. Filters are applied to
+    every table before the UNION ALL, and tables whose period cannot match a
+    start_time / end_time filter are skipped.
+    """
+
+    def __init__(self, querysets, ordering=(), fields=None):
+        self.querysets = querysets
+        self.ordering = ordering
+        self.fields = fields  # Set by values_list()
+
+    def _clone(self, querysets=None, ordering=None, fields=None):
+        return PartitionedQuerySet(self.querysets if querysets is None else querysets,
+                                   self.ordering if ordering is None else ordering,
+                                   self.fields if fields is None else fields)
+
+    @staticmethod
+    def _may_match(queryset, lookups):
+        """
+        Whether the table of the queryset can hold rows matching the time lookups.
+        EventLog itself is never skipped, it may hold rows not rolled over yet.
+        """
+        model = queryset.model
+        if model is EventLog:
+            return True
+        if 'start_time__gte' in lookups and model.period_end <= lookups['start_time__gte']:
+            return False
+        for lookup in ('start_time__lte', 'start_time__lt', 'end_time__lte'):
+            # end_time >= start_time, so an end_time bound is also a start_time bound
+            if lookup in lookups and model.period_start > lookups[lookup]:
+                return False
+        return True
+
+    def filter(self, *args, **kwargs):
+        return self._clone([queryset.filter(*args, **kwargs) for queryset in self.querysets
+                            if self._may_match(queryset, kwargs)])
+
+    def none(self):
+        return self._clone([self.querysets[0].none()])
+
+    def order_by(self, *fields):
+        return self._clone(ordering=fields)
+
+    def values_list(self, *fields):
+        return self._clone(fields=fields)
+
+    def aggregate(self, **aggregates):
+        results = [queryset.aggregate(**aggregates) for queryset in self.querysets]
+        combined = {}
+        for name, aggregate in aggregates.items():
+            if not isinstance(aggregate, (Max, Min)):
+                raise NotImplementedError("Only Max and Min can be combined across partitions.")
+            values = [result[name] for result in results if result[name] is not None]
+            combine = max if isinstance(aggregate, Max) else min
+            combined[name] = combine(values) if values else None
+        return combined
+
+    @property
+    def ordered(self):
+        return bool(self.ordering)
+
+    @property
+    def db(self):
+        return self.querysets[0].db
+
+    def combined(self):
+        """
+        UNION ALL of the tables. The ORDER BY of a union can only use selected columns,
+        so ordering fields missing from values_list() are selected after the others.
+        """
+        querysets = [queryset.order_by() for queryset in self.querysets]
+        if self.fields is not None:
+            extra = [name.lstrip('-') for name in self.ordering if name.lstrip('-') not in self.fields]
+            querysets = [queryset.values_list(*self.fields, *extra) for queryset in querysets]
+        queryset = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+        return queryset.order_by(*self.ordering) if self.ordering else queryset
+
+    def _rows(self, rows):
+        if self.fields is None:
+            return rows
+        return (row[:len(self.fields)] for row in rows)
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def exists(self):
+        return any(queryset.exists() for queryset in self.querysets)
+
+    def iterator(self, chunk_size=None):
+        return self._rows(self.combined().iterator(chunk_size=chunk_size))
+
+    def __iter__(self):
+        return self._rows(iter(self.combined()))
+
+    def __getitem__(self, key):
+        if self.fields is not None:
+            return list(self._rows(self.combined()[key]))
+        return self.combined()[key]
+
+
+def get_event_log_queryset():
+    """
+    EventLog queryset for reads. With PARTITIONING enabled, it also covers the
+    partition tables the older events were rolled over to.
+    """
+    queryset = EventLog.objects.all()
+    if not get_event_log_setting('PARTITIONING'):
+        return queryset
+    partitions = get_partition_models()
+    if not partitions:
+        return queryset
+    # EventLog first, so the combined rows are EventLog instances
+    return PartitionedQuerySet([queryset] + [model.objects.all() for model in reversed(partitions)])
+
+
+def copy_rows(model, queryset):
+    """
+    INSERT ... SELECT the rows of an EventLog queryset into a partition table.
+    """
+    fields = EventLog._meta.local_fields
+    columns = [field.column for field in fields]
+    sql, params = queryset.values_list(*[field.attname for field in fields]).query.sql_with_params()
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(quote(column) for column in columns)}) {sql}",
+            params,
+        )
+
+
+def rollover_event_logs(now=None, batch_size=None):
+    """
+    Move the events of the periods before the current one from EventLog to their
+    partition tables, in primary key batches each in its own short transaction.
+    Returns the number of moved events.
+    """
+    period = get_event_log_setting('PARTITIONING')
+    if not period:
+        return 0
+    batch_size = batch_size or get_event_log_setting('PRUNE_BATCH_SIZE')
+    current_start = get_period_start(now or timezone.now(), period)
+
+    moved = 0
+    while True:
+        first = EventLog.objects.filter(start_time__lt=current_start).aggregate(Min('start_time'))
+        if first['start_time__min'] is None:
+            break
+        start = get_period_start(first['start_time__min'], period)
+        model = ensure_partition(start, period)
+        queryset = EventLog.objects.filter(start_time__gte=start, start_time__lt=model.period_end)
+        bounds = queryset.aggregate(first_id=Min('id'), last_id=Max('id'))
+        for first_id in range(bounds['first_id'], bounds['last_id'] + 1, batch_size):
+            batch = queryset.filter(id__gte=first_id, id__lt=first_id + batch_size)
+            with transaction.atomic():
+                copy_rows(model, batch)
+                count, _ = batch.delete()
+            moved += count
+        logger.info("Rolled over event logs to %s", model._meta.db_table)
+    return moved
+
+
+def archive_partition(model):
+    from apps.customUser.retention import archive_rows
+
+    path = os.path.join(get_event_log_setting('ARCHIVE_DIR'), f"{model._meta.db_table}.jsonl.gz")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(f"{path}.part", 'wt', encoding='utf-8') as archive:
+        archive_rows(archive, model.objects.all())
+    os.replace(f"{path}.part", path)
+    return path
+
+
+def drop_partitions(older_than_days, archive=False, now=None):
+    """
+    Drop the partitions whose whole period is older than older_than_days, optionally
+    archiving them first. Returns the names of the dropped tables.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=older_than_days)
+    dropped = []
+    for model in get_partition_models():
+        if model.period_end > cutoff:
+            continue
+        if archive:
+            archive_partition(model)
+        dropped.append(model._meta.db_table)
+        drop_partition(model)
+    return dropped
+
+
+def drop_partition(model):
+    """
+    Drop a partition table, deleting its events in O(1).
+    """
+    with connection.schema_editor() as schema_editor:
+        schema_editor.delete_model(model)
+    _partition_models.pop(model._meta.db_table, None)
+    del apps.all_models[model._meta.app_label][model._meta.model_name]
+    apps.clear_cache()
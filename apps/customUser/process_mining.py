@@ -0,0 +1,197 @@
+import bisect
+import logging
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.customUser.models import ActivityStatistic, CaseState, DirectlyFollows, ProcessCounter
+from apps.customUser.partitions import get_event_log_queryset
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (inclusive) of the duration histogram buckets, the last bucket is unbounded
+DURATION_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000]
+PERCENTILES = (50, 90, 95, 99)
+AGGREGATE_FIELDS = ('case_id', 'activity', 'start_time', 'end_time', 'incomplete')
+# Attempts at updating the aggregates for a batch of written events (deadlocks, lock timeouts)
+UPDATE_ATTEMPTS = 3
+CASES_COUNTER = 'cases'
+
+
+def get_duration_ms(event):
+    return max(int((event['end_time'] - event['start_time']).total_seconds() * 1000), 0)
+
+
+def get_bucket(duration_ms):
+    return bisect.bisect_left(DURATION_BUCKETS_MS, duration_ms)
+
+
+def update_activity_statistics(events):
+    counts = Counter()
+    durations = Counter()
+    histograms = defaultdict(Counter)
+    for event in events:
+        duration_ms = get_duration_ms(event)
+        counts[event['activity']] += 1
+        durations[event['activity']] += duration_ms
+        histograms[event['activity']][get_bucket(duration_ms)] += 1
+
+    ActivityStatistic.objects.bulk_create(
+        [ActivityStatistic(activity=activity, duration_histogram=[0] * (len(DURATION_BUCKETS_MS) + 1))
+         for activity in sorted(counts)],
+        ignore_conflicts=True,
+    )
+    # Rows are locked in a fixed order so concurrent writers cannot deadlock
+    statistics = list(ActivityStatistic.objects.select_for_update().filter(activity__in=counts).order_by('activity'))
+    for statistic in statistics:
+        statistic.count += counts[statistic.activity]
+        statistic.total_duration_ms += durations[statistic.activity]
+        histogram = statistic.duration_histogram or [0] * (len(DURATION_BUCKETS_MS) + 1)
+        for bucket, count in histograms[statistic.activity].items():
+            histogram[bucket] += count
+        statistic.duration_histogram = histogram
+    ActivityStatistic.objects.bulk_update(statistics, ['count', 'total_duration_ms', 'duration_histogram'])
+
+
+def update_directly_follows(events):
+    """
+    Count the directly-follows pairs of the events, continuing each case from the
+    last activity recorded for it. Events of a case written in different batches
+    are chained in the order they are written; an event arriving more than
+    CASE_IDLE_TIMEOUT seconds after the previous one of its case starts a new case.
+    """
+    idle_timeout = timedelta(seconds=get_event_log_setting('CASE_IDLE_TIMEOUT'))
+    events = sorted(events, key=lambda event: (event['case_id'], event['start_time']))
+    case_ids = sorted({event['case_id'] for event in events})
+    CaseState.objects.bulk_create([CaseState(case_id=case_id) for case_id in case_ids], ignore_conflicts=True)
+    cases = {case.case_id: case
+             for case in CaseState.objects.select_for_update().filter(case_id__in=case_ids).order_by('case_id')}
+
+    pairs = Counter()
+    started = 0
+    for event in events:
+        case = cases[event['case_id']]
+        if case.last_activity is None or event['start_time'] - case.last_start_time > idle_timeout:
+            started += 1
+        else:
+            pairs[(case.last_activity, event['activity'])] += 1
+        case.last_activity = event['activity']
+        case.last_start_time = event['start_time']
+    CaseState.objects.bulk_update(cases.values(), ['last_activity', 'last_start_time'])
+    if started:
+        ProcessCounter.objects.bulk_create([ProcessCounter(name=CASES_COUNTER)], ignore_conflicts=True)
+        ProcessCounter.objects.filter(name=CASES_COUNTER).update(value=F('value') + started)
+
+    DirectlyFollows.objects.bulk_create(
+        [DirectlyFollows(source=source, target=target) for source, target in pairs], ignore_conflicts=True
+    )
+    for (source, target), count in sorted(pairs.items()):
+        DirectlyFollows.objects.filter(source=source, target=target).update(count=F('count') + count)
+
+
+def add_to_process_aggregates(events):
+    """
+    Add a batch of events to the process-mining aggregates. Incomplete events are left out.
+    """
+    events = [event for event in events if event.get('end_time') and not event.get('incomplete')]
+    if not events:
+        return
+    with transaction.atomic():
+        update_activity_statistics(events)
+        update_directly_follows(events)
+
+
+def update_process_aggregates(events):
+    """
+    Add a batch of written events to the aggregates, retrying on database errors. The
+    events are already committed: when every attempt fails the aggregates miss them
+    until the rebuild_process_aggregates command is run.
+    """
+    for attempt in range(1, UPDATE_ATTEMPTS + 1):
+        try:
+            add_to_process_aggregates(events)
+            return
+        except DatabaseError as e:
+            if attempt == UPDATE_ATTEMPTS:
+                logger.error("Could not add %d event logs to the process-mining aggregates, "
+                             "run rebuild_process_aggregates: %s", len(events), e)
+                return
+            time.sleep(0.05 * attempt)
+
+
+def expire_case_states(now=None):
+    """
+    Delete the states of the cases idle for more than CASE_IDLE_TIMEOUT seconds, their
+    next event starts a new case anyway. Returns the number of expired cases.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=get_event_log_setting('CASE_IDLE_TIMEOUT'))
+    expired, _ = CaseState.objects.filter(last_start_time__lt=cutoff).delete()
+    return expired
+
+
+def rebuild_process_aggregates(chunk_size=2000):
+    """
+    Recompute the aggregates from the stored event logs, partitions included.
+    """
+    with transaction.atomic():
+        ActivityStatistic.objects.all().delete()
+        DirectlyFollows.objects.all().delete()
+        CaseState.objects.all().delete()
+        ProcessCounter.objects.all().delete()
+        batch = []
+        rows = get_event_log_queryset().order_by('case_id', 'start_time', 'id').values_list(
+            *AGGREGATE_FIELDS
+        ).iterator(chunk_size=chunk_size)
+        for row in rows:
+            batch.append(dict(zip(AGGREGATE_FIELDS, row)))
+            if len(batch) >= chunk_size:
+                add_to_process_aggregates(batch)
+                batch = []
+        add_to_process_aggregates(batch)
+        expire_case_states()
+
+
+def get_percentile_ms(histogram, percentile):
+    """
+    Estimate a duration percentile from the histogram, interpolating linearly inside
+    the bucket holding it.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = total * percentile / 100
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            lower = DURATION_BUCKETS_MS[bucket - 1] if bucket else 0
+            if bucket >= len(DURATION_BUCKETS_MS):
+                return lower  # Unbounded bucket
+            return round(lower + (DURATION_BUCKETS_MS[bucket] - lower) * (rank - seen) / count, 1)
+        seen += count
+    return None
+
+
+def get_process_summary():
+    activities = []
+    for statistic in ActivityStatistic.objects.order_by('-count', 'activity'):
+        activity = {
+            'activity': statistic.activity,
+            'count': statistic.count,
+            'mean_duration_ms': round(statistic.total_duration_ms / statistic.count, 1) if statistic.count else None,
+        }
+        for percentile in PERCENTILES:
+            activity[f'p{percentile}_duration_ms'] = get_percentile_ms(statistic.duration_histogram, percentile)
+        activities.append(activity)
+    return {
+        'cases': ProcessCounter.objects.filter(name=CASES_COUNTER).values_list('value', flat=True).first() or 0,
+        'activities': activities,
+        'directly_follows': list(
+            DirectlyFollows.objects.order_by('-count', 'source', 'target').values('source', 'target', 'count')
+        ),
+    }
@@ -0,0 +1,132 @@
+import gzip
+import json
+import logging
+import os
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.customUser.models import EventLog
+from apps.customUser.partitions import drop_partition, get_event_log_queryset, get_partition_models
+from apps.customUser.process_mining import expire_case_states
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = ('id', 'case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user_name', 'status_code',
+                  'incomplete')
+
+
+def get_prune_lookups(older_than_days=None, keep_last=None, now=None):
+    """
+    Lookups selecting the event logs pruned by the retention policy, or None when no
+    row is. Both limits apply together: a row is pruned when it started more than
+    older_than_days ago and is not among the keep_last most recent rows. Without
+    limits every row is selected.
+    """
+    lookups = {}
+    if older_than_days is not None:
+        lookups['start_time__lt'] = (now or timezone.now()) - timedelta(days=older_than_days)
+    if keep_last:
+        # Rows are kept by insertion order, the id of the oldest kept row bounds the prune.
+        # Partitions keep the ids of the rows rolled over to them.
+        kept = get_event_log_queryset().order_by('-id').values_list('id')[keep_last - 1:keep_last]
+        if not kept:
+            return None
+        lookups['id__lt'] = kept[0][0]
+    return lookups
+
+
+def get_prune_queryset(older_than_days=None, keep_last=None, now=None):
+    """
+    Event logs selected by the retention policy, in EventLog and its partitions.
+    """
+    lookups = get_prune_lookups(older_than_days, keep_last, now)
+    queryset = get_event_log_queryset()
+    return queryset.none() if lookups is None else queryset.filter(**lookups)
+
+
+def is_fully_pruned(model, lookups):
+    """
+    Whether every row of a partition is selected by the prune lookups.
+    """
+    if 'start_time__lt' in lookups and model.period_end > lookups['start_time__lt']:
+        return False
+    if 'id__lt' in lookups:
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id']
+        return last_id is None or last_id < lookups['id__lt']
+    return True
+
+
+def get_archive_path():
+    filename = f"event_log_{timezone.now():%Y%m%d%H%M%S}.jsonl.gz"
+    return os.path.join(get_event_log_setting('ARCHIVE_DIR'), filename)
+
+
+def archive_rows(archive, queryset):
+    for row in queryset.order_by('id').values(*ARCHIVE_FIELDS).iterator():
+        archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+
+
+def delete_in_batches(queryset, batch_size, archive_file=None):
+    """
+    Delete the rows of the queryset in primary key ranges of batch_size rows, each range
+    in its own short transaction, so the table is never locked for long.
+    """
+    bounds = queryset.aggregate(first_id=Min('id'), last_id=Max('id'))
+    if bounds['first_id'] is None:
+        return 0
+    deleted = 0
+    for first_id in range(bounds['first_id'], bounds['last_id'] + 1, batch_size):
+        batch = queryset.filter(id__gte=first_id, id__lt=first_id + batch_size)
+        with transaction.atomic():
+            if archive_file:
+                archive_rows(archive_file, batch)
+            count, _ = batch.delete()
+        deleted += count
+    return deleted
+
+
+def prune_event_logs(older_than_days=None, keep_last=None, batch_size=None, archive=False, now=None):
+    """
+    Delete the event logs selected by the retention policy in batches (see
+    delete_in_batches). With PARTITIONING enabled, the partitions holding only pruned
+    rows are dropped whole and the others pruned like EventLog. With archive, the rows
+    are first appended to a gzipped JSON lines file. The states of idle cases are
+    expired on the way (see expire_case_states). Returns the number of deleted rows
+    and the archive path.
+    """
+    batch_size = batch_size or get_event_log_setting('PRUNE_BATCH_SIZE')
+    expire_case_states(now)
+    lookups = get_prune_lookups(older_than_days, keep_last, now)
+    if lookups is None or not get_event_log_queryset().filter(**lookups).exists():
+        return 0, None
+
+    archive_path = archive_file = None
+    if archive:
+        archive_path = get_archive_path()
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        archive_file = gzip.open(f"{archive_path}.part", 'wt', encoding='utf-8')
+
+    deleted = 0
+    try:
+        partitions = get_partition_models() if get_event_log_setting('PARTITIONING') else []
+        for model in partitions:
+            if not is_fully_pruned(model, lookups):
+                deleted += delete_in_batches(model.objects.filter(**lookups), batch_size, archive_file)
+                continue
+            if archive_file:
+                archive_rows(archive_file, model.objects.all())
+            deleted += model.objects.count()
+            drop_partition(model)
+        deleted += delete_in_batches(EventLog.objects.filter(**lookups), batch_size, archive_file)
+    finally:
+        if archive_file:
+            archive_file.close()
+            os.replace(f"{archive_path}.part", archive_path)
+
+    logger.info("Pruned %d event logs", deleted)
+    return deleted, archive_path
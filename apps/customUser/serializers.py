@@ -2,7 +2,7 @@ from django.contrib.auth import (get_user_model, authenticate)
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
-from apps.customUser.models import EventLog
+from apps.customUser.models import EventLog, ExportJob
 
 
 # User serializer
@@ -67,4 +67,39 @@ class AuthTokenSerializer(serializers.Serializer):
 class EventLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = EventLog
-        fields = ['case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user', 'user_name']
+        fields = ['case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user', 'user_name', 'incomplete']
+
+
+class EventLogFilterSerializer(serializers.Serializer):
+    start_time = serializers.DateTimeField(required=False)  # Events starting at or after this time
+    end_time = serializers.DateTimeField(required=False)  # Events ending at or before this time
+    case_id = serializers.CharField(required=False)
+    activity = serializers.CharField(required=False)
+    # Incremental pulls: only events completed after the cursor returned by the previous pull
+    since_id = serializers.IntegerField(required=False, min_value=0)
+    since_end_time = serializers.DateTimeField(required=False)
+
+
+class EventLogExportFilterSerializer(EventLogFilterSerializer):
+    gzip = serializers.BooleanField(required=False, default=False)  # Compress the exported file
+
+
+class EventLogPruneSerializer(serializers.Serializer):
+    older_than_days = serializers.IntegerField(required=False, min_value=0)  # Only events older than N days
+    keep_last = serializers.IntegerField(required=False, min_value=0)  # Keep the N most recent events
+    batch_size = serializers.IntegerField(required=False, min_value=1, max_value=100000)
+    archive = serializers.BooleanField(required=False, default=False)  # Archive to a gzipped file first
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    filters = EventLogExportFilterSerializer(required=False)
+
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'format', 'filters', 'status', 'file_size', 'error', 'created_at', 'finished_at']
+        read_only_fields = ['id', 'status', 'file_size', 'error', 'created_at', 'finished_at']
+
+    def create(self, validated_data):
+        # Store the filters in their JSON representation
+        validated_data['filters'] = EventLogExportFilterSerializer(validated_data.pop('filters', {})).data
+        return super().create(validated_data)
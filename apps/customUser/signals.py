@@ -0,0 +1,67 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from tourism_ecosystem.authentication import token_cache
+from tourism_ecosystem.response_cache import (
+    UNTRACKED_MODELS, bump_versions, get_parent_version_labels, get_previous_parent_version_labels, get_version_label
+)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Drop a deleted token from the token cache.
+    """
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    """
+    Drop the cached tokens of a user whenever the user changes (e.g. is deactivated),
+    so permissions are never checked against a stale user.
+    """
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        token_cache.invalidate(key)
+
+
+def remember_previous_parent_versions(sender, instance, **kwargs):
+    instance._previous_version_labels = get_previous_parent_version_labels(instance)
+
+
+def bump_written_model_versions(sender, instance, **kwargs):
+    """
+    Invalidate the cached responses and ETags built from a model (and from the
+    parent of the row, see register_parent_versions) whenever one of its rows changes.
+    """
+    bump_versions([get_version_label(sender)] + get_parent_version_labels(instance)
+                  + getattr(instance, '_previous_version_labels', []))
+
+
+@receiver(m2m_changed)
+def bump_related_model_versions(sender, instance, action, model, **kwargs):
+    """
+    Adding or removing many-to-many links changes the responses of both sides.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        labels = [get_version_label(type(instance)), get_version_label(model)]
+        bump_versions([label for label in labels if label not in UNTRACKED_MODELS])
+
+
+def connect_version_receivers():
+    """
+    Connect the version receivers to the tracked models only: a model with delete
+    receivers loses Django's fast delete, which bulk deletes such as the event log
+    pruning rely on.
+    """
+    for model in apps.get_models():
+        if get_version_label(model) in UNTRACKED_MODELS:
+            continue
+        pre_save.connect(remember_previous_parent_versions, sender=model)
+        post_save.connect(bump_written_model_versions, sender=model)
+        post_delete.connect(bump_written_model_versions, sender=model)
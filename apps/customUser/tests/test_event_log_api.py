@@ -0,0 +1,310 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog
+from tourism_ecosystem import event_log_writer, middlewares
+from tourism_ecosystem.event_log_writer import BufferedEventLogWriter, SyncEventLogWriter
+from tourism_ecosystem.logging_policy import get_case_position
+from tourism_ecosystem.middlewares import RequestLoggingMiddleware
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+
+
+def make_event(**params):
+    start_time = timezone.now()
+    defaults = {
+        'case_id': 'session_test',
+        'activity': 'Accommodation List',
+        'start_time': start_time,
+        'end_time': start_time + timedelta(milliseconds=5),
+        'user_id': None,
+        'user_name': 'Anonymous',
+        'status_code': 200,
+    }
+    defaults.update(params)
+    return defaults
+
+
+class RequestLoggingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_request_writes_one_finished_event(self):
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(EventLog.objects.count(), 1)
+        event = EventLog.objects.get()
+        self.assertEqual(event.status_code, 200)
+        self.assertIsNotNone(event.end_time)
+        self.assertGreaterEqual(event.end_time, event.start_time)
+        self.assertFalse(event.incomplete)
+
+    def test_viewset_action_is_logged_as_activity(self):
+        self.client.get(ACCOMMODATION_URL)
+        self.client.get(reverse('accommodation:accommodation-detail', args=[1]))
+
+        self.assertEqual(
+            list(EventLog.objects.order_by('id').values_list('activity', flat=True)),
+            ['Accommodation List', 'Accommodation Retrieve']
+        )
+
+    def test_url_is_resolved_once_per_request(self):
+        with mock.patch('tourism_ecosystem.middlewares.resolve', wraps=middlewares.resolve) as resolve, \
+                mock.patch.dict(middlewares._activity_cache, clear=True):
+            self.client.get(ACCOMMODATION_URL)
+            self.client.get(ACCOMMODATION_URL)
+
+            self.assertEqual(resolve.call_count, 2)
+            self.assertEqual(len(middlewares._activity_cache), 1)
+
+    def test_event_is_written_after_response_is_closed(self):
+        request = RequestFactory().get(ACCOMMODATION_URL)
+        request.session = SessionStore()
+        middleware = RequestLoggingMiddleware(lambda req: HttpResponse('ok'))
+
+        response = middleware(request)
+        self.assertEqual(EventLog.objects.count(), 0)
+
+        response.close()
+        self.assertEqual(EventLog.objects.count(), 1)
+
+    def test_streaming_event_is_finished_when_response_is_closed(self):
+        request = RequestFactory().get(ACCOMMODATION_URL)
+        request.session = SessionStore()
+        middleware = RequestLoggingMiddleware(lambda req: StreamingHttpResponse(iter([b'a', b'b'])))
+
+        response = middleware(request)
+        self.assertEqual(b''.join(response.streaming_content), b'ab')
+        self.assertEqual(EventLog.objects.count(), 0)
+
+        response.close()
+        event = EventLog.objects.get()
+        self.assertIsNotNone(event.end_time)
+        self.assertIsNone(middlewares.closing_event_var.get())
+
+
+class EventLogPolicyTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_excluded_path_is_not_logged(self):
+        res = self.client.get('/api/docs/')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(EventLog.objects.count(), 0)
+
+    def test_unsampled_activity_is_not_logged(self):
+        with self.settings(EVENT_LOG_SETTINGS={'WRITER': 'sync', 'SAMPLE_RATES': {'Accommodation List': 0}}):
+            self.client.get(ACCOMMODATION_URL)
+            self.client.get(reverse('accommodation:room-type-list'))
+
+        self.assertEqual(list(EventLog.objects.values_list('activity', flat=True)), ['Room Type List'])
+
+    def test_sampling_keeps_whole_cases(self):
+        case_ids = [f'client{i:04d}' for i in range(20)]
+        sampled = {case_id for case_id in case_ids if get_case_position(f'anon_{case_id}') < 0.5}
+        with self.settings(EVENT_LOG_SETTINGS={'WRITER': 'sync', 'SAMPLE_RATES': {'*': 0.5}}):
+            for _ in range(3):
+                for case_id in case_ids:
+                    self.client.get(ACCOMMODATION_URL, HTTP_X_CASE_ID=case_id)
+
+        self.assertTrue(0 < len(sampled) < len(case_ids))
+        self.assertEqual(EventLog.objects.count(), 3 * len(sampled))
+        self.assertEqual(set(EventLog.objects.values_list('case_id', flat=True)),
+                         {f'anon_{case_id}' for case_id in sampled})
+
+    def test_errors_are_always_logged(self):
+        with self.settings(EVENT_LOG_SETTINGS={'WRITER': 'sync', 'SAMPLE_RATES': {'*': 0}}):
+            self.client.get(ACCOMMODATION_URL)
+            res = self.client.get(reverse('accommodation:accommodation-detail', args=[1]))
+
+        self.assertEqual(res.status_code, 404)
+        event = EventLog.objects.get()
+        self.assertEqual(event.activity, 'Accommodation Retrieve')
+        self.assertEqual(event.status_code, 404)
+
+    def test_views_without_log_event_are_not_logged(self):
+        staff = get_user_model().objects.create_user(email='admin@example.com', password='password123')
+        staff.is_staff = True
+        self.client.force_authenticate(staff)
+
+        res = self.client.get(reverse('event-log-list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(EventLog.objects.count(), 0)
+
+
+class CaseIdTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_anonymous_case_id_does_not_touch_sessions(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse([query for query in queries if 'django_session' in query['sql']])
+        self.assertIn('case_id', res.cookies)
+
+    def test_case_id_cookie_keeps_the_case(self):
+        self.client.get(ACCOMMODATION_URL)
+        res = self.client.get(ACCOMMODATION_URL)
+
+        self.assertNotIn('case_id', res.cookies)
+        case_ids = set(EventLog.objects.values_list('case_id', flat=True))
+        self.assertEqual(len(case_ids), 1)
+        self.assertTrue(case_ids.pop().startswith('anon_'))
+
+    def test_case_id_header_is_used(self):
+        self.client.get(ACCOMMODATION_URL, HTTP_X_CASE_ID='mobile-1234abcd')
+
+        self.assertEqual(EventLog.objects.get().case_id, 'anon_mobile-1234abcd')
+
+    def test_authenticated_case_id_uses_user(self):
+        user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        token = Token.objects.create(user=user)
+
+        self.client.get(ACCOMMODATION_URL, HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        self.assertEqual(EventLog.objects.get().case_id, f'user_{user.id}')
+
+
+class SyncEventLogWriterTests(TestCase):
+    def test_in_flight_events_are_recorded_as_incomplete(self):
+        writer = SyncEventLogWriter()
+        finished = make_event(case_id='session_finished')
+        in_flight = make_event(case_id='session_in_flight', end_time=None, status_code=None)
+        writer.begin(finished)
+        writer.begin(in_flight)
+        writer.submit(finished)
+
+        writer.stop()
+
+        event = EventLog.objects.get(case_id='session_in_flight')
+        self.assertTrue(event.incomplete)
+        self.assertIsNotNone(event.end_time)
+        self.assertFalse(EventLog.objects.get(case_id='session_finished').incomplete)
+
+
+@mock.patch.object(BufferedEventLogWriter, '_ensure_started')
+class BufferedEventLogWriterTests(TestCase):
+    def test_flush_writes_in_batches(self, _):
+        writer = BufferedEventLogWriter(batch_size=2, spill_file=None)
+        for i in range(5):
+            writer.submit(make_event(case_id=f'session_{i}'))
+
+        with mock.patch.object(event_log_writer, 'write_events',
+                               wraps=event_log_writer.write_events) as write:
+            writer.flush()
+
+        self.assertEqual(write.call_count, 3)
+        self.assertEqual(EventLog.objects.count(), 5)
+
+    def test_full_buffer_drops_events(self, _):
+        writer = BufferedEventLogWriter(max_buffer_size=1, block_timeout=0,
+                                        overflow_policy='drop', spill_file=None)
+
+        self.assertTrue(writer.submit(make_event()))
+        self.assertFalse(writer.submit(make_event()))
+        self.assertEqual(writer.dropped, 1)
+
+        writer.flush()
+        self.assertEqual(EventLog.objects.count(), 1)
+
+    def test_full_buffer_spills_and_replays_events(self, _):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        writer = BufferedEventLogWriter(max_buffer_size=1, block_timeout=0, overflow_policy='spill',
+                                        spill_file=os.path.join(directory, 'spill.jsonl'))
+
+        writer.submit(make_event(case_id='session_buffered'))
+        writer.submit(make_event(case_id='session_spilled'))
+        self.assertEqual(writer.spilled, 1)
+
+        writer.flush()
+
+        self.assertEqual(
+            set(EventLog.objects.values_list('case_id', flat=True)),
+            {'session_buffered', 'session_spilled'}
+        )
+
+    def test_events_failing_alone_are_quarantined(self, _):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        spill_file = os.path.join(directory, 'spill.jsonl')
+        writer = BufferedEventLogWriter(batch_size=3, spill_file=spill_file)
+
+        for case_id in ('session_1', None, 'session_2'):
+            writer.submit(make_event(case_id=case_id))
+        with self.assertLogs(event_log_writer.logger, 'ERROR'):
+            writer.flush()
+
+        self.assertEqual(set(EventLog.objects.values_list('case_id', flat=True)), {'session_1', 'session_2'})
+        self.assertEqual((writer.quarantined, writer.spilled), (1, 0))
+        with open(f"{spill_file}.quarantine", encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_database_outage_keeps_events_spilled(self, _):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        spill_file = os.path.join(directory, 'spill.jsonl')
+        writer = BufferedEventLogWriter(batch_size=3, spill_file=spill_file)
+        for i in range(3):
+            writer.submit(make_event(case_id=f'session_{i}'))
+
+        with mock.patch.object(event_log_writer, 'write_events', side_effect=DatabaseError('down')), \
+                self.assertLogs(event_log_writer.logger, 'ERROR'):
+            writer.flush()
+            writer.flush()
+
+        # The second flush replayed the spill file, and spilled the events again
+        self.assertEqual((writer.spilled, writer.quarantined), (6, 0))
+        self.assertFalse(EventLog.objects.exists())
+        with open(spill_file, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        writer.flush()
+        self.assertEqual(EventLog.objects.count(), 3)
+        self.assertFalse(os.path.exists(spill_file))
+
+    def test_spill_replay_uses_a_file_per_process(self, _):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        spill_file = os.path.join(directory, 'spill.jsonl')
+        writer = BufferedEventLogWriter(spill_file=spill_file)
+        writer._overflow(make_event(case_id='session_spilled'))
+        # Being replayed by a live process
+        live_replay = f"{spill_file}.{os.getppid()}.replay"
+        open(live_replay, 'w').close()
+        # Left by a process that died while replaying it
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        with open(f"{spill_file}.{process.pid}.replay", 'w', encoding='utf-8') as f:
+            f.write(json.dumps(make_event(case_id='session_orphaned'), default=str) + '\n')
+
+        writer.flush()
+        writer.flush()
+
+        self.assertEqual(set(EventLog.objects.values_list('case_id', flat=True)),
+                         {'session_spilled', 'session_orphaned'})
+        self.assertFalse(os.path.exists(spill_file))
+        self.assertEqual(sorted(os.listdir(directory)),
+                         sorted([os.path.basename(live_replay), 'spill.jsonl.lock']))
@@ -0,0 +1,178 @@
+import gzip
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog
+
+DOWNLOAD_CSV_URL = reverse('download-csv')
+DOWNLOAD_XES_URL = reverse('download-xes')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_event_log(**params):
+    defaults = {
+        'case_id': 'user_1',
+        'activity': 'Room Booking Create',
+        'start_time': datetime(2024, 3, 5, 9, 7, tzinfo=timezone.utc),
+        'end_time': datetime(2024, 3, 5, 9, 8, tzinfo=timezone.utc),
+        'user_name': 'test@example.com',
+        'status_code': 201,
+    }
+    defaults.update(params)
+    return EventLog.objects.create(**defaults)
+
+
+def streamed_text(res):
+    return b''.join(res.streaming_content).decode()
+
+
+class EventLogExportAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+    def test_export_requires_admin(self):
+        self.user.is_staff = False
+
+        res = self.client.get(DOWNLOAD_CSV_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_without_events(self):
+        res = self.client.get(DOWNLOAD_CSV_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_csv(self):
+        create_event_log(user=self.user)
+        create_event_log(case_id='anon_1', activity='Menu List', end_time=None, user_name='Anonymous')
+
+        res = self.client.get(DOWNLOAD_CSV_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res['Content-Disposition'], 'attachment; filename="event_log.csv"')
+        self.assertEqual(streamed_text(res).splitlines(), [
+            'Case_id,Activity,Start Date,End Date,User_id,User,User_name',
+            f'user_1,Room Booking Create,5.3.24 09:07,5.3.24 09:08,{self.user.id},{self.user.id},test@example.com',
+            'anon_1,Menu List,5.3.24 09:07,,,,Anonymous',
+        ])
+
+    def test_export_csv_filters(self):
+        create_event_log(case_id='user_1', start_time=datetime(2024, 3, 1, tzinfo=timezone.utc))
+        create_event_log(case_id='user_2')
+        create_event_log(case_id='user_2', activity='Menu List')
+
+        res = self.client.get(DOWNLOAD_CSV_URL, {
+            'start_time': '2024-03-02T00:00:00Z',
+            'case_id': 'user_2',
+            'activity': 'Room Booking Create',
+        })
+
+        lines = streamed_text(res).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('user_2,Room Booking Create,'))
+
+    def test_export_csv_invalid_filter(self):
+        res = self.client.get(DOWNLOAD_CSV_URL, {'start_time': 'yesterday'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_csv_gzip(self):
+        create_event_log()
+
+        res = self.client.get(DOWNLOAD_CSV_URL, {'gzip': 'true'})
+
+        self.assertEqual(res['Content-Type'], 'application/gzip')
+        content = gzip.decompress(b''.join(res.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 2)
+
+    def test_export_xes_is_importable(self):
+        from pm4py.objects.log.importer.xes import importer as xes_importer
+
+        create_event_log(case_id='user_2', activity='Menu List', user=self.user)
+        create_event_log(case_id='user_1', activity='Room Booking Pay',
+                         start_time=datetime(2024, 3, 5, 10, 0, tzinfo=timezone.utc), end_time=None)
+        create_event_log(case_id='user_1', activity='Room Booking Create & Confirm')
+
+        res = self.client.get(DOWNLOAD_XES_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Disposition'], 'attachment; filename="event_log.xes"')
+        fd, path = tempfile.mkstemp(suffix='.xes')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b''.join(res.streaming_content))
+
+        log = xes_importer.apply(path, parameters={'show_progress_bar': False})
+
+        traces = {trace.attributes['concept:name']: [event['concept:name'] for event in trace] for trace in log}
+        self.assertEqual(traces, {
+            'user_1': ['Room Booking Create & Confirm', 'Room Booking Pay'],
+            'user_2': ['Menu List'],
+        })
+        first_event = log[0][0]
+        self.assertEqual(first_event['time:timestamp'], datetime(2024, 3, 5, 9, 7, tzinfo=timezone.utc))
+        self.assertEqual(first_event['status'], 201)
+
+    def test_export_xes_gzip(self):
+        create_event_log()
+
+        res = self.client.get(DOWNLOAD_XES_URL, {'gzip': 'true', 'case_id': 'user_1'})
+
+        self.assertEqual(res['Content-Disposition'], 'attachment; filename="event_log.xes.gz"')
+        content = gzip.decompress(b''.join(res.streaming_content)).decode()
+        self.assertIn('<string key="concept:name" value="Room Booking Create" />', content)
+
+    def test_export_csv_since_id(self):
+        first = create_event_log(case_id='user_1')
+        create_event_log(case_id='user_2', end_time=None)
+        last = create_event_log(case_id='user_3')
+
+        res = self.client.get(DOWNLOAD_CSV_URL, {'since_id': first.id})
+
+        lines = streamed_text(res).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('user_3,'))
+        self.assertEqual(res['X-Next-Since-Id'], str(last.id))
+
+    def test_export_since_id_without_new_events(self):
+        event = create_event_log()
+
+        res = self.client.get(DOWNLOAD_XES_URL, {'since_id': event.id})
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(res['X-Next-Since-Id'], str(event.id))
+
+    def test_export_csv_since_end_time(self):
+        create_event_log(case_id='user_1')
+        create_event_log(case_id='user_2', end_time=datetime(2024, 3, 5, 9, 30, tzinfo=timezone.utc))
+
+        res = self.client.get(DOWNLOAD_CSV_URL, {'since_end_time': '2024-03-05T09:08:00Z'})
+
+        lines = streamed_text(res).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('user_2,'))
+        self.assertEqual(res['X-Next-Since-End-Time'], '2024-03-05T09:30:00+00:00')
+
+    def test_event_log_list_since_id(self):
+        first = create_event_log(case_id='user_1')
+        last = create_event_log(case_id='user_2')
+
+        res = self.client.get(reverse('event-log-list'), {'since_id': first.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([event['case_id'] for event in res.data['results']], ['user_2'])
+        self.assertEqual(res.data['next_since_id'], last.id)
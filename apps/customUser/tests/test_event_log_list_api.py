@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog
+from apps.customUser.pagination import get_mysql_plan_rows
+
+EVENT_LOG_LIST_URL = reverse('event-log-list')
+START_TIME = datetime(2024, 3, 5, 9, 0, tzinfo=timezone.utc)
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_event_logs(count, **params):
+    return [EventLog.objects.create(**{
+        'case_id': f'user_{i}',
+        'activity': 'Menu List',
+        'start_time': START_TIME + timedelta(minutes=i // 2),  # Pairs share a start time
+        'end_time': START_TIME + timedelta(minutes=i // 2, seconds=1),
+        **params,
+    }) for i in range(count)]
+
+
+class EventLogListAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+    def test_page_number_pagination(self):
+        create_event_logs(3)
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual([event['case_id'] for event in res.data['results']], ['user_2', 'user_1'])
+        self.assertIsNotNone(res.data['next'])
+
+    def test_keyset_pagination(self):
+        create_event_logs(5)
+
+        case_ids = []
+        url, params = EVENT_LOG_LIST_URL, {'cursor': '', 'page_size': 2}
+        with self.assertNumQueries(1):  # The page alone: no COUNT, no incremental cursor
+            res = self.client.get(url, params)
+        self.assertNotIn('next_since_id', res.data)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', res.data)
+            case_ids += [event['case_id'] for event in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(case_ids, ['user_4', 'user_3', 'user_2', 'user_1', 'user_0'])
+
+    def test_invalid_cursor(self):
+        res = self.client.get(EVENT_LOG_LIST_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_uncounted_pagination(self):
+        create_event_logs(3)
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'page_size': 2, 'count': 'none'})
+        self.assertIsNone(res.data['count'])
+        self.assertIsNotNone(res.data['next'])
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'page_size': 2, 'count': 'none', 'page': 2})
+        self.assertEqual([event['case_id'] for event in res.data['results']], ['user_0'])
+        self.assertIsNone(res.data['next'])
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'page_size': 2, 'count': 'none', 'page': 3})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_estimated_count(self):
+        create_event_logs(3)
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'count': 'estimate'})
+
+        self.assertEqual(res.data['count'], 3)  # SQLite falls back to an exact count
+
+    def test_mysql_plan_rows(self):
+        self.assertEqual(get_mysql_plan_rows([{'table': 'eventlog', 'rows': 12000, 'filtered': 10.0}]), 1200)
+        self.assertEqual(get_mysql_plan_rows([{'table': 'eventlog', 'rows': 12000, 'filtered': 50.0},
+                                              {'table': 'user', 'rows': 1, 'filtered': 100.0}]), 6000)
+
+    def test_invalid_count_mode(self):
+        res = self.client.get(EVENT_LOG_LIST_URL, {'count': 'roughly'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,169 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog
+from apps.customUser.partitions import (
+    PartitionedQuerySet, drop_partition, drop_partitions, get_event_log_queryset, get_partition_models,
+    rollover_event_logs
+)
+from apps.customUser.retention import prune_event_logs
+
+EVENT_LOG_LIST_URL = reverse('event-log-list')
+CLEAR_EVENT_LOGS_URL = reverse('clear-event-logs')
+DOWNLOAD_CSV_URL = reverse('download-csv')
+NOW = datetime(2024, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_event_log(start_time, **params):
+    defaults = {
+        'case_id': 'user_1',
+        'activity': 'Menu List',
+        'start_time': start_time,
+        'end_time': start_time,
+    }
+    defaults.update(params)
+    return EventLog.objects.create(**defaults)
+
+
+class EventLogPartitionTests(TransactionTestCase):
+    """
+    Partition tables are created with the schema editor, which SQLite cannot use
+    inside the transaction of a TestCase.
+    """
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        event_log_settings = dict(settings.EVENT_LOG_SETTINGS, PARTITIONING='month', ARCHIVE_DIR=self.archive_dir)
+        settings_override = self.settings(EVENT_LOG_SETTINGS=event_log_settings)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(self.drop_all_partitions)
+
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+        self.january = create_event_log(datetime(2024, 1, 20, tzinfo=timezone.utc), case_id='january')
+        self.february = create_event_log(datetime(2024, 2, 10, tzinfo=timezone.utc), case_id='february')
+        self.march = create_event_log(datetime(2024, 3, 1, tzinfo=timezone.utc), case_id='march')
+
+    def drop_all_partitions(self):
+        for model in get_partition_models():
+            drop_partition(model)
+
+    def test_rollover(self):
+        moved = rollover_event_logs(now=NOW, batch_size=1)
+
+        self.assertEqual(moved, 2)
+        self.assertEqual(list(EventLog.objects.values_list('case_id', flat=True)), ['march'])
+        partitions = get_partition_models()
+        self.assertEqual([model._meta.db_table for model in partitions],
+                         ['customUser_eventlog_202401', 'customUser_eventlog_202402'])
+        self.assertEqual(list(partitions[0].objects.values_list('id', flat=True)), [self.january.id])
+
+    def test_list_fans_out_to_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        res = self.client.get(EVENT_LOG_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 3)
+        self.assertEqual([event['case_id'] for event in res.data['results']], ['march', 'february', 'january'])
+
+        res = self.client.get(EVENT_LOG_LIST_URL, {'cursor': '', 'page_size': 2})
+        res = self.client.get(res.data['next'])
+        self.assertEqual([event['case_id'] for event in res.data['results']], ['january'])
+
+    def test_estimated_count_sums_the_partitions(self):
+        rollover_event_logs(now=NOW)
+        # SQLite has no row estimate, MySQL estimates 5 rows in every table
+        mysql = mock.MagicMock(vendor='mysql')
+        cursor = mysql.cursor.return_value.__enter__.return_value
+        cursor.description = [('rows',), ('filtered',)]
+        cursor.fetchall.return_value = [(5, 100.0)]
+
+        with mock.patch('apps.customUser.pagination.connections', {'default': mysql}):
+            res = self.client.get(EVENT_LOG_LIST_URL, {'count': 'estimate'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 15)
+        self.assertEqual(cursor.execute.call_count, 3)
+
+    def test_time_filter_skips_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        queryset = get_event_log_queryset().filter(start_time__gte=datetime(2024, 2, 1, tzinfo=timezone.utc))
+
+        self.assertIsInstance(queryset, PartitionedQuerySet)
+        self.assertEqual([qs.model._meta.db_table for qs in queryset.querysets],
+                         ['customUser_eventlog', 'customUser_eventlog_202402'])
+
+    def test_export_fans_out_to_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        res = self.client.get(DOWNLOAD_CSV_URL, {'end_time': '2024-02-28T00:00:00Z'})
+
+        lines = b''.join(res.streaming_content).decode().splitlines()
+        self.assertEqual([line.split(',')[0] for line in lines[1:]], ['january', 'february'])
+
+    def test_drop_partitions_with_archive(self):
+        rollover_event_logs(now=NOW)
+
+        dropped = drop_partitions(30, archive=True, now=NOW)
+
+        self.assertEqual(dropped, ['customUser_eventlog_202401'])
+        self.assertEqual(len(get_partition_models()), 1)
+        with gzip.open(os.path.join(self.archive_dir, 'customUser_eventlog_202401.jsonl.gz'), 'rt') as f:
+            self.assertEqual(json.loads(f.readline())['case_id'], 'january')
+
+    def get_case_ids(self):
+        queryset = get_event_log_queryset().filter(case_id__in=['january', 'february', 'march'])
+        return sorted(case_id for case_id, in queryset.values_list('case_id'))
+
+    def test_clear_drops_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        res = self.client.delete(CLEAR_EVENT_LOGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['message'], "Successfully deleted 3 event logs.")
+        self.assertEqual(get_partition_models(), [])
+        self.assertEqual(self.get_case_ids(), [])
+
+    def test_prune_across_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        deleted, archive_path = prune_event_logs(older_than_days=34, archive=True, now=NOW)
+
+        # January is dropped whole, February pruned inside its partition
+        self.assertEqual(deleted, 2)
+        self.assertEqual([model._meta.db_table for model in get_partition_models()], ['customUser_eventlog_202402'])
+        self.assertEqual(self.get_case_ids(), ['march'])
+        with gzip.open(archive_path, 'rt') as f:
+            self.assertEqual(sorted(json.loads(line)['case_id'] for line in f), ['february', 'january'])
+
+    def test_prune_keep_last_across_partitions(self):
+        rollover_event_logs(now=NOW)
+
+        res = self.client.delete(CLEAR_EVENT_LOGS_URL, QUERY_STRING='keep_last=2')
+
+        self.assertEqual(res.data['message'], "Successfully deleted 1 event logs.")
+        self.assertEqual(self.get_case_ids(), ['february', 'march'])
@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog
+
+CLEAR_EVENT_LOGS_URL = reverse('clear-event-logs')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_event_log(days_ago=0, **params):
+    start_time = timezone.now() - timedelta(days=days_ago)
+    defaults = {
+        'case_id': 'user_1',
+        'activity': 'Menu List',
+        'start_time': start_time,
+        'end_time': start_time + timedelta(seconds=1),
+    }
+    defaults.update(params)
+    return EventLog.objects.create(**defaults)
+
+
+class EventLogRetentionAPITests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        event_log_settings = dict(settings.EVENT_LOG_SETTINGS, ARCHIVE_DIR=self.archive_dir)
+        settings_override = self.settings(EVENT_LOG_SETTINGS=event_log_settings)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+    def test_clear_all_event_logs(self):
+        for _ in range(5):
+            create_event_log()
+
+        res = self.client.delete(f'{CLEAR_EVENT_LOGS_URL}?batch_size=2')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['message'], 'Successfully deleted 5 event logs.')
+        self.assertFalse(EventLog.objects.exists())
+
+    def test_prune_older_than_days(self):
+        create_event_log(days_ago=40, case_id='old')
+        create_event_log(days_ago=1, case_id='recent')
+
+        self.client.delete(f'{CLEAR_EVENT_LOGS_URL}?older_than_days=30')
+
+        self.assertEqual(list(EventLog.objects.values_list('case_id', flat=True)), ['recent'])
+
+    def test_prune_keep_last(self):
+        events = [create_event_log(case_id=f'user_{i}') for i in range(5)]
+
+        res = self.client.delete(f'{CLEAR_EVENT_LOGS_URL}?keep_last=2&batch_size=2')
+
+        self.assertEqual(res.data['message'], 'Successfully deleted 3 event logs.')
+        self.assertEqual(list(EventLog.objects.order_by('id').values_list('id', flat=True)),
+                         [events[3].id, events[4].id])
+
+    def test_prune_with_archive(self):
+        event = create_event_log(days_ago=40)
+
+        res = self.client.delete(f'{CLEAR_EVENT_LOGS_URL}?archive=true')
+
+        with gzip.open(os.path.join(self.archive_dir, res.data['archive']), 'rt') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], event.id)
+        self.assertEqual(rows[0]['case_id'], 'user_1')
+
+    def test_prune_requires_admin(self):
+        self.user.is_staff = False
+
+        res = self.client.delete(CLEAR_EVENT_LOGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_prune_command(self):
+        create_event_log(days_ago=40)
+        create_event_log(days_ago=1)
+        out = StringIO()
+
+        call_command('prune_event_logs', '--older-than-days', '30', stdout=out)
+
+        self.assertIn('Deleted 1 event logs.', out.getvalue())
+        self.assertEqual(EventLog.objects.count(), 1)
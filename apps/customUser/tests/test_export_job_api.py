@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import EventLog, ExportJob
+
+EXPORT_JOB_URL = reverse('export-job-list')
+
+
+def detail_url(job_id):
+    return reverse('export-job-detail', args=[job_id])
+
+
+def download_url(job_id):
+    return reverse('export-job-download', args=[job_id])
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def create_event_log(**params):
+    defaults = {
+        'case_id': 'user_1',
+        'activity': 'Room Booking Create',
+        'start_time': datetime(2024, 3, 5, 9, 7, tzinfo=timezone.utc),
+        'end_time': datetime(2024, 3, 5, 9, 8, tzinfo=timezone.utc),
+        'user_name': 'test@example.com',
+        'status_code': 201,
+    }
+    defaults.update(params)
+    return EventLog.objects.create(**defaults)
+
+
+class ExportJobAPITests(TestCase):
+    def setUp(self):
+        export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, export_dir)
+        event_log_settings = dict(settings.EVENT_LOG_SETTINGS, EXPORT_DIR=export_dir)
+        settings_override = self.settings(EVENT_LOG_SETTINGS=event_log_settings)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+        create_event_log()
+        create_event_log(case_id='user_2', activity='Menu List')
+
+    def create_job(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(EXPORT_JOB_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        return res.data['id']
+
+    def test_create_export_job(self):
+        job_id = self.create_job({'format': 'csv', 'filters': {'case_id': 'user_2'}})
+
+        res = self.client.get(detail_url(job_id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], ExportJob.STATUS_COMPLETED)
+        self.assertEqual(res.data['filters']['case_id'], 'user_2')
+
+        res = self.client.get(download_url(job_id))
+        content = b''.join(res.streaming_content).decode()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Accept-Ranges'], 'bytes')
+        self.assertEqual(content.splitlines()[1:], ['user_2,Menu List,5.3.24 09:07,5.3.24 09:08,,,test@example.com'])
+
+    def test_download_range(self):
+        job_id = self.create_job({'format': 'xes'})
+        full = b''.join(self.client.get(download_url(job_id)).streaming_content)
+
+        res = self.client.get(download_url(job_id), HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(res.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(res['Content-Range'], f'bytes 10-19/{len(full)}')
+        self.assertEqual(b''.join(res.streaming_content), full[10:20])
+
+        res = self.client.get(download_url(job_id), HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(res.streaming_content), full[-5:])
+
+        res = self.client.get(download_url(job_id), HTTP_RANGE=f'bytes={len(full)}-')
+        self.assertEqual(res.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    def test_download_unfinished_job(self):
+        job = ExportJob.objects.create(format='csv')
+
+        res = self.client.get(download_url(job.id))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+
+    def test_invalid_format(self):
+        res = self.client.post(EXPORT_JOB_URL, {'format': 'pdf'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_jobs_require_admin(self):
+        self.user.is_staff = False
+
+        res = self.client.post(EXPORT_JOB_URL, {'format': 'csv'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,88 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from tourism_ecosystem.metrics import RequestMetrics, render_metrics, request_metrics
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+METRICS_URL = reverse('metrics')
+
+
+class MetricsAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        request_metrics.reset()
+        self.addCleanup(request_metrics.reset)
+
+    def test_requests_are_recorded(self):
+        self.client.get(ACCOMMODATION_URL)
+        self.client.get(ACCOMMODATION_URL)
+
+        self.client.force_login(get_user_model().objects.create_user(
+            email='admin@example.com', password='password123', is_staff=True))
+        self.client.get(METRICS_URL)
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res['Content-Type'].startswith('text/plain; version=0.0.4'))
+        content = res.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', content)
+        self.assertIn(
+            'http_request_duration_seconds_count{activity="Accommodation List",status="2xx"} 2', content
+        )
+        self.assertIn('http_request_db_queries_count{activity="Accommodation List",status="2xx"} 2', content)
+        # Scrapes are not recorded
+        self.assertEqual(content.count('http_request_duration_seconds_count'), 1)
+
+    def test_metrics_auth_token(self):
+        with self.settings(METRICS_SETTINGS={'AUTH_TOKEN': 'secret'}):
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+            self.assertEqual(self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer sécret').status_code, 401)
+            res = self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(res.status_code, 200)
+
+    def test_metrics_require_staff_by_default(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 401)
+        self.client.force_login(get_user_model().objects.create_user(email='test@example.com', password='password123'))
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+
+        with self.settings(METRICS_SETTINGS={'PUBLIC': True}):
+            self.client.logout()
+            self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
+
+    def test_metrics_accept_staff_api_tokens(self):
+        staff = Token.objects.create(user=get_user_model().objects.create_user(
+            email='admin@example.com', password='password123', is_staff=True))
+        user = Token.objects.create(user=get_user_model().objects.create_user(
+            email='test@example.com', password='password123'))
+
+        self.assertEqual(self.client.get(METRICS_URL, HTTP_AUTHORIZATION=f'Token {staff.key}').status_code, 200)
+        self.assertEqual(self.client.get(METRICS_URL, HTTP_AUTHORIZATION=f'Token {user.key}').status_code, 403)
+        self.assertEqual(self.client.get(METRICS_URL, HTTP_AUTHORIZATION='Token unknown').status_code, 401)
+
+    def test_shards_are_merged(self):
+        metrics = RequestMetrics()
+
+        def observe():
+            for _ in range(100):
+                metrics.observe('Menu List', 200, 0.02, 3, 0.004)
+
+        threads = [threading.Thread(target=observe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.observe('Menu List', 503, 1.5, 0, 0.0)
+
+        content = render_metrics(metrics)
+
+        self.assertIn('http_request_duration_seconds_bucket{activity="Menu List",status="2xx",le="0.025"} 400', content)
+        self.assertIn('http_request_duration_seconds_count{activity="Menu List",status="5xx"} 1', content)
+        self.assertIn('http_request_db_queries_bucket{activity="Menu List",status="2xx",le="2"} 0', content)
+        self.assertIn('http_request_db_queries_bucket{activity="Menu List",status="2xx",le="5"} 400', content)
+        # The shards of the finished threads were folded together
+        self.assertEqual(len(metrics._shards), 1)
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.customUser.models import ActivityStatistic, CaseState, EventLog
+from apps.customUser.process_mining import expire_case_states, get_percentile_ms
+from tourism_ecosystem.event_log_writer import write_events
+
+PROCESS_SUMMARY_URL = reverse('process-summary')
+START_TIME = datetime(2024, 3, 5, 9, 0, tzinfo=timezone.utc)
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def make_event(case_id, activity, minute, duration_ms=100, **params):
+    start_time = START_TIME + timedelta(minutes=minute)
+    event = {
+        'case_id': case_id,
+        'activity': activity,
+        'start_time': start_time,
+        'end_time': start_time + timedelta(milliseconds=duration_ms),
+        'user_name': 'Anonymous',
+        'status_code': 200,
+    }
+    event.update(params)
+    return event
+
+
+class ProcessSummaryAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+    def test_aggregates_are_updated_on_write(self):
+        write_events([
+            make_event('user_1', 'Accommodation List', 0, duration_ms=40),
+            make_event('user_1', 'Room Booking Create', 1, duration_ms=300),
+            make_event('user_2', 'Accommodation List', 0, duration_ms=60),
+        ])
+        # The next batch continues the cases of the previous one
+        write_events([
+            make_event('user_1', 'Accommodation List', 2, duration_ms=50),
+            make_event('user_2', 'Room Booking Create', 1, duration_ms=500),
+            make_event('user_3', 'Menu List', 0, incomplete=True),
+        ])
+
+        res = self.client.get(PROCESS_SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['cases'], 2)
+        activities = {activity['activity']: activity for activity in res.data['activities']}
+        self.assertEqual(activities['Accommodation List']['count'], 3)
+        self.assertEqual(activities['Accommodation List']['mean_duration_ms'], 50.0)
+        self.assertEqual(activities['Room Booking Create']['count'], 2)
+        self.assertNotIn('Menu List', activities)
+        self.assertEqual(res.data['directly_follows'], [
+            {'source': 'Accommodation List', 'target': 'Room Booking Create', 'count': 2},
+            {'source': 'Room Booking Create', 'target': 'Accommodation List', 'count': 1},
+        ])
+
+    def test_events_are_kept_when_aggregates_fail(self):
+        with mock.patch('apps.customUser.process_mining.update_activity_statistics',
+                        side_effect=DatabaseError('deadlock')), mock.patch('time.sleep'), \
+                self.assertLogs('apps.customUser.process_mining', 'ERROR'):
+            write_events([make_event('user_1', 'Accommodation List', 0)])
+
+        self.assertEqual(EventLog.objects.count(), 1)
+        self.assertFalse(CaseState.objects.exists())
+
+        call_command('rebuild_process_aggregates', stdout=StringIO())
+        res = self.client.get(PROCESS_SUMMARY_URL)
+        self.assertEqual(res.data['cases'], 1)
+        self.assertEqual(res.data['activities'][0]['count'], 1)
+
+    @override_settings(EVENT_LOG_SETTINGS={'WRITER': 'sync', 'CASE_IDLE_TIMEOUT': 3600})
+    def test_idle_cases_are_expired(self):
+        write_events([make_event('user_1', 'Accommodation List', 0), make_event('user_2', 'Menu List', 0)])
+        write_events([make_event('user_1', 'Room Booking Create', 90), make_event('user_2', 'Menu List', 30)])
+
+        self.assertEqual(expire_case_states(now=START_TIME + timedelta(minutes=100)), 1)
+        self.assertEqual(list(CaseState.objects.values_list('case_id', flat=True)), ['user_1'])
+
+        # The expired and the timed out case are counted again, without pairs across the gap
+        write_events([make_event('user_2', 'Accommodation List', 200)])
+        res = self.client.get(PROCESS_SUMMARY_URL)
+        self.assertEqual(res.data['cases'], 4)
+        self.assertEqual(res.data['directly_follows'], [{'source': 'Menu List', 'target': 'Menu List', 'count': 1}])
+
+    def test_rebuild_command(self):
+        write_events([
+            make_event('user_1', 'Accommodation List', 0),
+            make_event('user_1', 'Room Booking Create', 1),
+        ])
+        ActivityStatistic.objects.all().delete()
+
+        call_command('rebuild_process_aggregates', stdout=StringIO())
+
+        self.assertEqual(EventLog.objects.count(), 2)
+        res = self.client.get(PROCESS_SUMMARY_URL)
+        self.assertEqual(len(res.data['activities']), 2)
+        self.assertEqual(res.data['directly_follows'][0]['count'], 1)
+
+    def test_percentile_from_histogram(self):
+        # 10 events in the (50, 100] ms bucket
+        histogram = [0] * 16
+        histogram[6] = 10
+
+        self.assertEqual(get_percentile_ms(histogram, 50), 75.0)
+        self.assertEqual(get_percentile_ms(histogram, 100), 100.0)
+        self.assertIsNone(get_percentile_ms([0] * 16, 50))
+
+    def test_process_summary_requires_admin(self):
+        self.user.is_staff = False
+
+        res = self.client.get(PROCESS_SUMMARY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
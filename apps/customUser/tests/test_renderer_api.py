@@ -0,0 +1,61 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import skipIf
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework.response import Response
+
+from tourism_ecosystem.responses import CustomRenderer, FastCustomRenderer, orjson
+
+
+def render(renderer_class, data, status_code=200, media_type='application/json'):
+    return renderer_class().render(data, media_type, {'response': Response(status=status_code)})
+
+
+@skipIf(orjson is None, "orjson is not installed")
+class FastCustomRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data, status_code=200, media_type='application/json'):
+        expected = render(CustomRenderer, data, status_code, media_type)
+        self.assertEqual(render(FastCustomRenderer, data, status_code, media_type), expected)
+        return expected
+
+    def test_envelope(self):
+        content = self.assertSameBytes([{'id': 1, 'item_name': 'Matoke', 'price': '10000.00'}])
+
+        self.assertEqual(content, b'{"code":200,"msg":"success","data":[{"id":1,"item_name":"Matoke",'
+                                  b'"price":"10000.00"}]}')
+
+    def test_dates_times_and_decimals(self):
+        self.assertSameBytes({
+            'start_time': datetime.datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive_time': datetime.datetime(2024, 5, 1, 8, 30),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(8, 30),
+            'duration': datetime.timedelta(minutes=5),
+            'price': Decimal('12.50'),
+            'tiny': Decimal('0.00001'),
+        })
+
+    def test_unicode_and_line_separators(self):
+        content = self.assertSameBytes({'description': 'Café 招牌菜     </script>'})
+
+        self.assertIn(b'\\u2028', content)
+
+    def test_already_wrapped_error_and_empty_data(self):
+        self.assertSameBytes({'code': 201, 'msg': 'Created', 'data': {'id': 1}}, status_code=201)
+        self.assertSameBytes({'code': 400, 'msg': {'name': ['required']}, 'data': None}, status_code=400)
+        self.assertSameBytes(None)
+        self.assertSameBytes(None, status_code=404)
+
+    def test_fallbacks(self):
+        self.assertSameBytes({1: 'non-string key'})
+        self.assertSameBytes({'id': 1}, media_type='application/json; indent=4')
+
+    def test_benchmark_command(self):
+        out = StringIO()
+
+        call_command('benchmark_renderers', rows=20, repeat=2, stdout=out)
+
+        self.assertIn('FastCustomRenderer is', out.getvalue())
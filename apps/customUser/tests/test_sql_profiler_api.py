@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.restaurants_cafes.models import Menu, OnlineOrder, OrderItem, Restaurant
+from tourism_ecosystem.profiling import get_query_shape, profile_store
+
+ONLINE_ORDER_URL = reverse('restaurants_cafes:online-order-list')
+SQL_PROFILE_LIST_URL = reverse('sql-profile-list')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def profile_url(profile_id):
+    return reverse('sql-profile-detail', args=[profile_id])
+
+
+class SQLProfilerAPITests(TestCase):
+    def setUp(self):
+        settings_override = self.settings(SQL_PROFILER_SETTINGS={'ENABLED': True, 'REPEAT_THRESHOLD': 3})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        profile_store.clear()
+        self.addCleanup(profile_store.clear)
+
+        self.client = APIClient()
+        self.user = create_user(email='admin@example.com', password='password123')
+        self.user.is_staff = True
+        self.client.force_authenticate(self.user)
+
+        restaurant = Restaurant.objects.create(name='KFC', location='Kampala', cuisine_type='Fast Food',
+                                               opening_hours='8:00AM - 10:00PM', contact_info='0700000000')
+        menu_item = Menu.objects.create(restaurant=restaurant, item_name='Burger', description='Burger',
+                                        price=Decimal('50.00'))
+        for _ in range(3):
+            order = OnlineOrder.objects.create(user=self.user, restaurant=restaurant, order_date='2024-03-05',
+                                               order_time='12:00:00', total_amount=Decimal('50.00'),
+                                               order_status='Pending')
+            OrderItem.objects.create(order=order, menu_item=menu_item, quantity=1)
+
+    def test_request_without_header_is_not_profiled(self):
+        res = self.client.get(ONLINE_ORDER_URL)
+
+        self.assertNotIn('X-SQL-Profile', res)
+
+    def test_repeated_queries_are_reported(self):
+        res = self.client.get(ONLINE_ORDER_URL, HTTP_X_PROFILE_SQL='1')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        summary = dict(part.split('=') for part in res['X-SQL-Profile'].split('; '))
+        self.assertGreaterEqual(int(summary['repeated']), 1)
+
+        res = self.client.get(profile_url(summary['id']))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        shapes = [repeated['shape'] for repeated in res.data['repeated_queries']]
+        self.assertTrue(any('restaurants_cafes_orderitem' in shape for shape in shapes))
+        self.assertTrue(any('tourism_ecosystem/views.py' in frame and 'get_list_response' in frame
+                            for query in res.data['queries'] for frame in query['stack']))
+
+        res = self.client.get(SQL_PROFILE_LIST_URL)
+        self.assertEqual(len(res.data), 1)
+        self.assertNotIn('queries', res.data[0])
+
+    def test_profiler_token(self):
+        with self.settings(SQL_PROFILER_SETTINGS={'ENABLED': True, 'TOKEN': 'secret'}):
+            self.assertNotIn('X-SQL-Profile', self.client.get(ONLINE_ORDER_URL, HTTP_X_PROFILE_SQL='1'))
+            self.assertNotIn('X-SQL-Profile', self.client.get(ONLINE_ORDER_URL, HTTP_X_PROFILE_SQL='sécret'))
+            self.assertIn('X-SQL-Profile', self.client.get(ONLINE_ORDER_URL, HTTP_X_PROFILE_SQL='secret'))
+
+    def test_query_shape(self):
+        self.assertEqual(
+            get_query_shape('SELECT * FROM "t" WHERE "t"."id" IN (%s, %s, %s) AND "t"."name" = \'x\' LIMIT 21'),
+            'SELECT * FROM "t" WHERE "t"."id" IN (...) AND "t"."name" = ? LIMIT ?',
+        )
@@ -0,0 +1,120 @@
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from tourism_ecosystem.structured_logging import (
+    JSONFormatter, QueueListenerHandler, RequestContextFilter, activity_var, request_id_var
+)
+
+ACCOMMODATION_URL = reverse('accommodation:accommodation-list')
+
+
+class StructuredLoggingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.stream = io.StringIO()
+        self.handler = QueueListenerHandler(stream=self.stream)
+        self.handler.addFilter(RequestContextFilter())
+        self.logger = logging.getLogger('tourism_ecosystem.tests')
+        self.logger.addHandler(self.handler)
+        self.logger.setLevel(logging.INFO)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+        self.addCleanup(self.handler.close)
+
+    def read_entries(self):
+        self.handler.stop_listener()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_request_id_header(self):
+        res = self.client.get(ACCOMMODATION_URL, HTTP_X_REQUEST_ID='request-12345678')
+        self.assertEqual(res['X-Request-ID'], 'request-12345678')
+
+        res = self.client.get(ACCOMMODATION_URL, HTTP_X_REQUEST_ID='bad id')
+        self.assertNotEqual(res['X-Request-ID'], 'bad id')
+        self.assertEqual(len(res['X-Request-ID']), 32)
+
+    def test_response_log_carries_the_request_context(self):
+        request_logger = logging.getLogger('django.request')
+        request_logger.addHandler(self.handler)
+        self.addCleanup(request_logger.removeHandler, self.handler)
+
+        user = get_user_model().objects.create_user(email='test@example.com', password='password123')
+        self.client.force_authenticate(user)
+        res = self.client.post(ACCOMMODATION_URL, {}, HTTP_X_REQUEST_ID='request-12345678')
+        self.assertEqual(res.status_code, 403)
+        self.logger.info("Between requests")
+
+        entries = self.read_entries()
+        self.assertEqual(entries[0]['logger'], 'django.request')
+        self.assertEqual(entries[0]['request_id'], 'request-12345678')
+        self.assertEqual(entries[0]['activity'], 'Accommodation Create')
+        self.assertEqual(entries[1]['message'], 'Between requests')
+        self.assertNotIn('request_id', entries[1])
+        self.assertNotIn('activity', entries[1])
+        self.assertIsNone(activity_var.get())
+
+    def test_json_lines_with_request_context(self):
+        token = request_id_var.set('request-12345678')
+        try:
+            self.logger.info("Booked %d rooms", 2)
+        finally:
+            request_id_var.reset(token)
+        self.logger.debug("Not emitted")
+
+        entries = self.read_entries()
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['message'], 'Booked 2 rooms')
+        self.assertEqual(entries[0]['level'], 'INFO')
+        self.assertEqual(entries[0]['request_id'], 'request-12345678')
+
+    def test_exception_is_rendered(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            self.logger.exception("Failed")
+
+        entries = self.read_entries()
+
+        self.assertIn('ValueError: boom', entries[0]['exception'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "Needs os.fork")
+    def test_forked_process_writes_its_records(self):
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as stream:
+            handler = QueueListenerHandler(stream=stream)
+            logger = logging.getLogger('tourism_ecosystem.tests.fork')
+            logger.addHandler(handler)
+            self.addCleanup(logger.removeHandler, handler)
+            logger.warning("Before the fork")
+
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    logger.warning("In the child")
+                    handler.stop_listener()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            logger.warning("In the parent")
+            handler.close()
+
+            stream.seek(0)
+            messages = [json.loads(line)['message'] for line in stream.read().splitlines()]
+
+        self.assertEqual(sorted(messages), ['Before the fork', 'In the child', 'In the parent'])
+
+    def test_formatter_skips_missing_context(self):
+        record = logging.LogRecord('test', logging.INFO, __file__, 1, 'Hello %s', ('world',), None)
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        self.assertEqual(entry['message'], 'Hello world')
+        self.assertNotIn('request_id', entry)
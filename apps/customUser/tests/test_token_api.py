@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from tourism_ecosystem.authentication import token_cache
+
+ME_URL = reverse('manage-user')
+
+
+def create_user(**params):
+    return get_user_model().objects.create_user(**params)
+
+
+def token_queries(queries):
+    return [query for query in queries if 'authtoken_token' in query['sql']]
+
+
+class TokenAuthenticationAPITests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email='test@example.com', password='password123', name='Test')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_token_is_resolved_once_per_request(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+        self.assertEqual(len(token_queries(queries)), 1)
+
+    def test_cached_token_skips_token_query(self):
+        self.client.get(ME_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_queries(queries), [])
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(ME_URL)
+        self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
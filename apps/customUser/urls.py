@@ -10,6 +10,10 @@ from .views import (
     GenerateAndDownloadCSV,
     ClearEventLogView,
     GenerateAndDownloadXES,
+    ProcessSummaryView,
+    ExportJobListCreateView,
+    ExportJobDetailView,
+    ExportJobDownloadView,
 )
 
 router = DefaultRouter()
@@ -24,5 +28,9 @@ urlpatterns = [
     path('download_csv/', GenerateAndDownloadCSV.as_view(), name='download-csv'),
     path('clear_event_logs/', ClearEventLogView.as_view(), name='clear-event-logs'),
     path('download_xes/', GenerateAndDownloadXES.as_view(), name='download-xes'),
+    path('process_summary/', ProcessSummaryView.as_view(), name='process-summary'),
+    path('export_jobs/', ExportJobListCreateView.as_view(), name='export-job-list'),
+    path('export_jobs/<uuid:pk>/', ExportJobDetailView.as_view(), name='export-job-detail'),
+    path('export_jobs/<uuid:pk>/download/', ExportJobDownloadView.as_view(), name='export-job-download'),
     path('', include(router.urls)),  # Include this only if you have ViewSets registered
 ]
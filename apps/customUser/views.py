@@ -1,26 +1,33 @@
 import logging
-from io import BytesIO
+import os
+import re
 
-import pandas as pd
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-# 导入 PM4PY 相关库
-from pm4py.objects.conversion.log import converter as log_converter
-from pm4py.objects.log.exporter.xes import exporter as xes_exporter
-from rest_framework import generics, authentication, permissions, status
+from rest_framework import generics, permissions, status
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from apps.customUser.export_jobs import enqueue_export_job
+from apps.customUser.exporters import (
+    bound_to_cursor, filter_event_logs, get_export_queryset, is_incremental, iter_csv, iter_gzip, iter_xes
+)
+from apps.customUser.pagination import EventLogPagination
+from apps.customUser.partitions import get_event_log_queryset
+from apps.customUser.process_mining import get_process_summary
+from apps.customUser.retention import prune_event_logs
 from apps.customUser.serializers import (
     UserSerializer,
-    AuthTokenSerializer, EventLogSerializer
+    AuthTokenSerializer, EventLogSerializer, EventLogFilterSerializer, EventLogExportFilterSerializer,
+    EventLogPruneSerializer, ExportJobSerializer
 )
-from .models import EventLog
+from tourism_ecosystem.authentication import CachedTokenAuthentication
+from .models import ExportJob
 
 
 # A generic view class for handling POST requests, allowing the creation of new objects
@@ -60,7 +67,7 @@ class CreateTokenView(ObtainAuthToken):
 @extend_schema(tags=['User'])
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
     log_event = True
     activity_name = "User Profile Management"
@@ -69,138 +76,240 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-# Create or configure the logger
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
-
-
-class EventLogPagination(PageNumberPagination):
-    page_size = 10  # 每页默认 10 条记录
-    page_size_query_param = 'page_size'  # 允许前端通过查询参数自定义每页条数
-    max_page_size = 100  # 限制每页最多 100 条记录
+logger = logging.getLogger(__name__)
 
 
-@extend_schema(tags=['Event Log'])
+@extend_schema(tags=['Event Log'], parameters=[EventLogFilterSerializer])
 class EventLogListView(generics.ListAPIView):
-    queryset = EventLog.objects.all().order_by('-start_time')
     serializer_class = EventLogSerializer
     permission_classes = [IsAdminUser]
     pagination_class = EventLogPagination
 
-
-@extend_schema(tags=['Event Log'])
-class GenerateAndDownloadCSV(APIView):
+    def get_queryset(self):
+        return get_event_log_queryset().order_by('-start_time', '-id')
+
+    def list(self, request, *args, **kwargs):
+        filter_serializer = EventLogFilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        queryset = filter_event_logs(self.get_queryset(), filters)
+        cursor = None
+        if is_incremental(filters):
+            # Only incremental pulls pay for the aggregate over the filtered events, it
+            # would make every page of a plain listing a full scan
+            queryset, cursor = bound_to_cursor(queryset, filters)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        if cursor is not None:
+            # Cursor for the next incremental pull
+            response.data['next_since_id'] = cursor['since_id']
+            response.data['next_since_end_time'] = cursor['since_end_time']
+        return response
+
+
+class EventLogExportView(APIView):
+    """
+    Base view streaming the (optionally filtered) event log as a downloadable file.
+    Subclasses set the file name, content type and the generator producing the content.
+    """
     permission_classes = [permissions.IsAdminUser]
+    filename = None
+    content_type = None
+    not_found_message = "No events found."
+
+    def get_content(self, queryset):
+        raise NotImplementedError
 
     def get(self, request, *args, **kwargs):
-        try:
-            # 第一步：从数据库中检索所有用户事件日志数据
-            events = EventLog.objects.all().values('case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user',
-                                                   'user_name')
-            df = pd.DataFrame(list(events))
+        filter_serializer = EventLogExportFilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+
+        queryset, cursor = bound_to_cursor(get_export_queryset(filters), filters)
+        if not queryset.exists():
+            if is_incremental(filters):
+                # Nothing new since the cursor
+                response = HttpResponse(status=status.HTTP_204_NO_CONTENT)
+            else:
+                logger.warning(self.not_found_message)
+                response = JsonResponse({"message": self.not_found_message}, status=404)
+            return self.set_cursor_headers(response, cursor)
+
+        content = self.get_content(queryset)
+        filename = self.filename
+        content_type = self.content_type
+        if filters['gzip']:
+            content = iter_gzip(content)
+            filename += '.gz'
+            content_type = 'application/gzip'
+
+        # 以流的方式提供文件给用户下载，不在内存中构建完整文件
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return self.set_cursor_headers(response, cursor)
+
+    def set_cursor_headers(self, response, cursor):
+        """
+        Expose the cursor for the next incremental pull.
+        """
+        if cursor['since_id'] is not None:
+            response['X-Next-Since-Id'] = str(cursor['since_id'])
+        if cursor['since_end_time'] is not None:
+            response['X-Next-Since-End-Time'] = cursor['since_end_time'].isoformat()
+        return response
+
+
+@extend_schema(tags=['Event Log'], parameters=[EventLogExportFilterSerializer])
+class GenerateAndDownloadCSV(EventLogExportView):
+    filename = 'event_log.csv'
+    content_type = 'application/csv'
+
+    def get_content(self, queryset):
+        return iter_csv(queryset)
+
+
+@extend_schema(tags=['Event Log'], parameters=[EventLogPruneSerializer])
+class ClearEventLogView(APIView):
+    """
+    API View to clear event logs from the database, all of them or those selected by
+    the retention parameters, in batches.
+    Only accessible to admin users.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def delete(self, request, *args, **kwargs):
+        serializer = EventLogPruneSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
 
-            if df.empty:
-                logging.error("No events found in the database.")
-                return JsonResponse({"message": "No events found."}, status=404)
+        deleted, archive_path = prune_event_logs(**serializer.validated_data)
 
-            # 修改列名为大写或你需要的格式
-            df.columns = ['Case_id', 'Activity', 'Start_time', 'End_time', 'User_id', 'User', 'User_name']
+        # Return response
+        data = {"message": f"Successfully deleted {deleted} event logs."}
+        if archive_path:
+            data["archive"] = os.path.basename(archive_path)
+        return Response(data, status=status.HTTP_200_OK)
 
-            # 格式化日期列，格式为 "日.月.年 时:分"
-            df['Start_time'] = pd.to_datetime(df['Start_time']).dt.strftime('%-d.%-m.%y %H:%M')
-            df['End_time'] = pd.to_datetime(df['End_time']).dt.strftime('%-d.%-m.%y %H:%M')
 
-            # 重命名列名为你需要的格式
-            df.rename(columns={
-                'Start_time': 'Start Date',
-                'End_time': 'End Date'
-            }, inplace=True)
+@extend_schema(tags=['Event Log'], parameters=[EventLogExportFilterSerializer])
+class GenerateAndDownloadXES(EventLogExportView):
+    filename = 'event_log.xes'
+    content_type = 'application/xml'
+    not_found_message = "没有找到事件日志。"
+
+    def get_content(self, queryset):
+        return iter_xes(queryset)
+
+
+@extend_schema(tags=['Event Log'])
+class ProcessSummaryView(APIView):
+    """
+    Activity frequencies, durations and the directly-follows graph of the event log,
+    maintained incrementally as events are written.
+    """
+    permission_classes = [IsAdminUser]
 
-            # 第二步：检查数据格式并准备 CSV 数据
-            csv_buffer = BytesIO()
-            df.to_csv(csv_buffer, index=False)
-            csv_buffer.seek(0)  # 重置指针到开始位置
+    def get(self, request, *args, **kwargs):
+        return Response(get_process_summary())
 
-            logging.info("Successfully created CSV file in memory.")
 
-            # 第三步：提供文件给用户下载
-            response = HttpResponse(csv_buffer.getvalue(), content_type='application/csv')
-            response['Content-Disposition'] = 'attachment; filename="event_log.csv"'
-            return response
+@extend_schema(tags=['Event Log'])
+class ExportJobListCreateView(generics.ListCreateAPIView):
+    """
+    Lists the event log export jobs, or creates one that is written in the background.
+    """
+    queryset = ExportJob.objects.all().order_by('-created_at')
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAdminUser]
 
-        except Exception as e:
-            # 输出详细的错误日志
-            logging.error(f"An error occurred during CSV generation or download: {e}")
-            return JsonResponse({"message": f"Internal Server Error: {e}"}, status=500)
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save(created_by=request.user)
+        enqueue_export_job(job)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
 
 
 @extend_schema(tags=['Event Log'])
-class ClearEventLogView(APIView):
+class ExportJobDetailView(generics.RetrieveAPIView):
     """
-    API View to clear all event logs from the database.
-    Only accessible to admin users.
+    Returns the status of an export job.
     """
-    permission_classes = [permissions.IsAdminUser]
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAdminUser]
 
-    def delete(self, request, *args, **kwargs):
-        # Clear all EventLog data
-        deleted, _ = EventLog.objects.all().delete()
 
-        # Return response
-        return Response({"message": f"Successfully deleted {deleted} event logs."}, status=status.HTTP_200_OK)
+EXPORT_CONTENT_TYPES = {
+    ExportJob.FORMAT_CSV: 'application/csv',
+    ExportJob.FORMAT_XES: 'application/xml',
+}
+
+
+def parse_byte_range(header, size):
+    """
+    Parse a single "bytes=start-end" range. Returns (start, end) or None if the range is not satisfiable.
+    """
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def iter_file(path, offset, length, block_size=64 * 1024):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while length > 0:
+            data = f.read(min(block_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
 
 
 @extend_schema(tags=['Event Log'])
-class GenerateAndDownloadXES(APIView):
-    permission_classes = [permissions.IsAdminUser]
+class ExportJobDownloadView(APIView):
+    """
+    Downloads the file of a completed export job. Supports single HTTP byte ranges,
+    so interrupted downloads can be resumed.
+    """
+    permission_classes = [IsAdminUser]
 
-    def get(self, request, *args, **kwargs):
-        try:
-            events = EventLog.objects.all().values(
-                'case_id', 'activity', 'start_time', 'end_time', 'user_id', 'user_name', 'status_code'
-            )
-            df = pd.DataFrame(list(events))
-
-            if df.empty:
-                logging.error("没有找到事件日志。")
-                return JsonResponse({"message": "没有找到事件日志。"}, status=404)
-
-            # 重命名列以符合 PM4PY 的要求
-            df.rename(columns={
-                'case_id': 'case:concept:name',
-                'activity': 'concept:name',
-                'start_time': 'time:timestamp',
-                'end_time': 'time:endTimestamp',
-                'user_name': 'org:resource',
-                'status_code': 'status'
-            }, inplace=True)
-
-            # 确保时间戳列的格式正确（ISO 8601）
-            df['time:timestamp'] = pd.to_datetime(df['time:timestamp']).dt.strftime('%Y-%m-%dT%H:%M:%S.%f%z')
-            df['time:endTimestamp'] = pd.to_datetime(df['time:endTimestamp']).dt.strftime('%Y-%m-%dT%H:%M:%S.%f%z')
-
-            # 添加生命周期信息
-            df['lifecycle:transition'] = 'complete'
-
-            # 按照 case_id 和 timestamp 排序
-            df = df.sort_values(['case:concept:name', 'time:timestamp'])
-
-            # 将 DataFrame 转换为 event log 对象
-            event_log = log_converter.apply(df)
-
-            # 创建一个内存文件对象来存储 XES 文件
-            xes_buffer = BytesIO()
-
-            # 将 event log 导出为 XES 格式
-            xes_exporter.apply(event_log, xes_buffer)
-            xes_buffer.seek(0)  # 重置指针到开始位置
-
-            logging.info("成功创建 XES 文件。")
-
-            # 提供文件给用户下载
-            response = HttpResponse(xes_buffer.getvalue(), content_type='application/xml')
-            response['Content-Disposition'] = 'attachment; filename="event_log.xes"'
-            return response
-
-        except Exception as e:
-            logging.error(f"生成或下载 XES 文件时发生错误: {e}")
-            return JsonResponse({"message": f"内部服务器错误: {e}"}, status=500)
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(ExportJob, pk=pk)
+        if job.status != ExportJob.STATUS_COMPLETED or not os.path.exists(job.file_path):
+            return Response({"message": f"Export job is {job.status}."}, status=status.HTTP_409_CONFLICT)
+
+        size = os.path.getsize(job.file_path)
+        filename = os.path.basename(job.file_path)
+        content_type = 'application/gzip' if filename.endswith('.gz') else EXPORT_CONTENT_TYPES[job.format]
+
+        start, end = 0, size - 1
+        range_header = request.META.get('HTTP_RANGE')
+        if range_header:
+            byte_range = parse_byte_range(range_header, size)
+            if byte_range is None:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+            start, end = byte_range
+
+        response = StreamingHttpResponse(iter_file(job.file_path, start, end - start + 1),
+                                         content_type=content_type)
+        if range_header:
+            response.status_code = status.HTTP_206_PARTIAL_CONTENT
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
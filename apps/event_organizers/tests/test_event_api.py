@@ -1,13 +1,13 @@
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.event_organizers.models import (Event)
 from apps.event_organizers.serializers import EventSerializer
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 EVENTS_URL = reverse('event_organizers:event-list')
 
@@ -24,9 +24,10 @@ def detail_url(event_id):
     return reverse('event_organizers:event-detail', args=[event_id])
 
 
-class PublicEventsAPITests(TestCase):
+class PublicEventsAPITests(ResponseCacheTestCase):
 
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
 
     def test_retrieve_events(self):
@@ -55,7 +56,7 @@ class PublicEventsAPITests(TestCase):
         res = self.client.get(EVENTS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_event_detail(self):
         event = create_event(
@@ -77,9 +78,10 @@ class PublicEventsAPITests(TestCase):
         self.assertEqual(res.data, expected_data)
 
 
-class PrivateEventsAPITests(TestCase):
+class PrivateEventsAPITests(ResponseCacheTestCase):
 
     def setUp(self):
+        super().setUp()
         self.user = create_user(
             email='test@example.com',
             password='password123'
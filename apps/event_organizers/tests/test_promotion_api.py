@@ -58,7 +58,7 @@ class PubicEventPromotionAPITests(TestCase):
         res = self.client.get(EVENT_PROMOTION_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
     def test_retrieve_event_promotion_detail(self):
         event_promotion = create_event_promotion(
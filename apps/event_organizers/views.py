@@ -7,7 +7,9 @@ from rest_framework.decorators import action
 from rest_framework.permissions import (IsAuthenticated)
 from rest_framework.response import Response
 
+from tourism_ecosystem.pagination import ListCursorPagination
 from tourism_ecosystem.permissions import IsAdminOrReadOnly
+from tourism_ecosystem.response_cache import CachedReadMixin
 from tourism_ecosystem.responses import CustomResponse
 from tourism_ecosystem.views import LoggingViewSet
 from .models import (Event, VenueBooking, EventPromotion)
@@ -16,7 +18,7 @@ from .serializers import (EventSerializer, VenueBookingSerializer,
 
 
 @extend_schema(tags=['EO - Event'])
-class EventViewSet(LoggingViewSet):
+class EventViewSet(CachedReadMixin, LoggingViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -29,10 +31,10 @@ class VenueBookingViewSet(LoggingViewSet):
     serializer_class = VenueBookingSerializer
     permission_classes = [IsAuthenticated]
     activity_name = "Venue Booking"
+    pagination_class = ListCursorPagination
 
     def perform_create(self, serializer):
         # Automatically set the current logged-in user as user_id
-        print(self.request.user)
         serializer.save(user_id=self.request.user)
 
     def get_queryset(self):
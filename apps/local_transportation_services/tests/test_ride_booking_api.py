@@ -89,7 +89,7 @@ class PrivateRideBookingAPITests(TestCase):
 
         res = self.client.get(RIDE_BOOKING_API_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_ride_booking_detail(self):
         ride_booking = create_ride_booking(
@@ -1,12 +1,12 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.local_transportation_services.models import TransportationProvider
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 TRANSPORTATION_PROVIDER_API_URL = reverse('local_transportation_services:transportation-provider-list')
 
@@ -23,8 +23,9 @@ def detail_url(transportation_provider_id):
     return reverse('local_transportation_services:transportation-provider-detail', args=[transportation_provider_id])
 
 
-class PublicTransportationProviderAPITests(TestCase):
+class PublicTransportationProviderAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
 
     def test_retrieve_transportation_providers(self):
@@ -47,7 +48,7 @@ class PublicTransportationProviderAPITests(TestCase):
         res = self.client.get(TRANSPORTATION_PROVIDER_API_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
+        self.assertEqual(len(res.data['results']), 2)
 
     def test_retrieve_transportation_provider_detail(self):
         transportation_provider = create_transportation_provider(
@@ -68,8 +69,9 @@ class PublicTransportationProviderAPITests(TestCase):
         self.assertEqual(res.data['contact_info'], transportation_provider.contact_info)
 
 
-class PrivateTransportationProviderAPITests(TestCase):
+class PrivateTransportationProviderAPITests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user()
         self.client.force_authenticate(self.user)
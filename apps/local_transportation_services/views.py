@@ -4,12 +4,14 @@ from drf_spectacular.utils import extend_schema
 from apps.local_transportation_services.models import TransportationProvider, RideBooking, RoutePlanning, TrafficUpdate
 from apps.local_transportation_services.serializers import TransportationServiceSerializer, RideBookingSerializer, \
     RoutePlanningSerializer, TrafficUpdateSerializer
+from tourism_ecosystem.pagination import ListCursorPagination
 from tourism_ecosystem.permissions import IsAdminOrReadOnly, IsOwnerOrAdmin
+from tourism_ecosystem.response_cache import CachedReadMixin
 from tourism_ecosystem.views import LoggingViewSet
 
 
 @extend_schema(tags=['LTS - Transportation Provider'])
-class TransportationProviderViewSet(LoggingViewSet):
+class TransportationProviderViewSet(CachedReadMixin, LoggingViewSet):
     queryset = TransportationProvider.objects.all()
     serializer_class = TransportationServiceSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -22,6 +24,7 @@ class RideBookingViewSet(LoggingViewSet):
     serializer_class = RideBookingSerializer
     permission_classes = [IsOwnerOrAdmin]
     activity_name = "Ride Booking"
+    pagination_class = ListCursorPagination
 
 
 @extend_schema(tags=['LTS - Route Planning'])
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class RestaurantsCafesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.restaurants_cafes"
+
+    def ready(self):
+        # Menus are listed per restaurant
+        from apps.restaurants_cafes.models import Menu
+        from tourism_ecosystem.response_cache import register_parent_versions
+
+        register_parent_versions(Menu, 'restaurant')
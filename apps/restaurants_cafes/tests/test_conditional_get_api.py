@@ -0,0 +1,145 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from apps.restaurants_cafes.models import Menu, Restaurant
+from tourism_ecosystem.response_cache import get_response_cache
+from tourism_ecosystem.testing import ResponseCacheTestCase
+
+
+def create_user(email='test@example.com', password='test1234'):
+    return get_user_model().objects.create_user(email=email, password=password)
+
+
+def create_restaurant(name='KFC'):
+    return Restaurant.objects.create(
+        name=name,
+        location='Kampala',
+        cuisine_type='Fast Food',
+        opening_hours='8:00AM - 10:00PM',
+        contact_info='0700000000'
+    )
+
+
+def create_menu(restaurant, item_name='Chicken'):
+    return Menu.objects.create(restaurant=restaurant, item_name=item_name, description='Fried',
+                               price=Decimal('10000'))
+
+
+def by_restaurant_url(restaurant_id):
+    return reverse('restaurants_cafes:menu-get-menu-by-restaurant', args=[restaurant_id])
+
+
+def detail_url(menu_id):
+    return reverse('restaurants_cafes:menu-detail', args=[menu_id])
+
+
+class ConditionalGetApiTests(ResponseCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.restaurant = create_restaurant()
+        self.menu = create_menu(self.restaurant)
+
+    def test_matching_etag_returns_not_modified(self):
+        res = self.client.get(by_restaurant_url(self.restaurant.id))
+        etag = res['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(by_restaurant_url(self.restaurant.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+        self.assertEqual(res['ETag'], etag)
+        self.assertFalse([query for query in queries if 'FROM "restaurants_cafes_' in query['sql']])
+
+    def test_weak_and_stale_etags(self):
+        etag = self.client.get(detail_url(self.menu.id))['ETag']
+
+        res = self.client.get(detail_url(self.menu.id), HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = self.client.get(detail_url(self.menu.id), HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_envelope_is_byte_stable(self):
+        get_response_cache().clear()
+        first = self.client.get(by_restaurant_url(self.restaurant.id))
+        get_response_cache().clear()
+        second = self.client.get(by_restaurant_url(self.restaurant.id))
+
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(first.content, second.content)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(detail_url(self.menu.id))['ETag']
+        self.menu.price = Decimal('12000')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+
+        res = self.client.get(detail_url(self.menu.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(res.data['price'], '12000.00')
+
+    def test_etag_is_versioned_per_restaurant(self):
+        other = create_restaurant(name='Java House')
+        etag = self.client.get(by_restaurant_url(self.restaurant.id))['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_menu(other, item_name='Coffee')
+        res = self.client.get(by_restaurant_url(self.restaurant.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_menu(self.restaurant, item_name='Chips')
+        res = self.client.get(by_restaurant_url(self.restaurant.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+
+    def test_moving_a_menu_changes_the_etag_of_both_restaurants(self):
+        other = create_restaurant(name='Java House')
+        etag = self.client.get(by_restaurant_url(self.restaurant.id))['ETag']
+        other_etag = self.client.get(by_restaurant_url(other.id))['ETag']
+
+        self.menu.restaurant = other
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.save()
+
+        res = self.client.get(by_restaurant_url(self.restaurant.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+        res = self.client.get(by_restaurant_url(other.id), HTTP_IF_NONE_MATCH=other_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_the_caller(self):
+        etag = self.client.get(detail_url(self.menu.id))['ETag']
+        self.client.force_authenticate(create_user())
+
+        res = self.client.get(detail_url(self.menu.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_writes_do_not_get_an_etag(self):
+        admin = get_user_model().objects.create_user(email='admin@example.com', password='test1234', is_staff=True)
+        self.client.force_authenticate(admin)
+
+        res = self.client.patch(detail_url(self.menu.id), {'item_name': 'Wings'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', res)
+
+    @override_settings(RESPONSE_CACHE_SETTINGS={'ETAGS': False})
+    def test_disabled_etags(self):
+        res = self.client.get(detail_url(self.menu.id), HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', res)
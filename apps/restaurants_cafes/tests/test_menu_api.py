@@ -1,12 +1,12 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.restaurants_cafes.models import Menu, Restaurant
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 MENU_API_URL = reverse('restaurants_cafes:menu-list')
 
@@ -23,8 +23,9 @@ def detail_url(menu_id):
     return reverse('restaurants_cafes:menu-detail', args=[menu_id])
 
 
-class PublicMenuApiTests(TestCase):
+class PublicMenuApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.restaurant = Restaurant.objects.create(
             name='KFC',
@@ -53,9 +54,9 @@ class PublicMenuApiTests(TestCase):
         res = self.client.get(MENU_API_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data[0]['item_name'], 'Chicken')
-        self.assertEqual(res.data[1]['item_name'], 'Chips')
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'][0]['item_name'], 'Chicken')
+        self.assertEqual(res.data['results'][1]['item_name'], 'Chips')
 
     def test_retrieve_menu_detail(self):
         """Test retrieving a menu detail"""
@@ -75,8 +76,9 @@ class PublicMenuApiTests(TestCase):
         self.assertEqual(res.data['price'], '10000.00')
 
 
-class PrivateMenuApiTests(TestCase):
+class PrivateMenuApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user()
         self.client.force_authenticate(self.user)
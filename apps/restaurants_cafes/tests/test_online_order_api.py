@@ -85,13 +85,13 @@ class PrivateOnlineOrderApiTests(TestCase):
 
         res = self.client.get(ONLINE_ORDER_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['restaurant'], self.restaurant.id)
-        self.assertEqual(res.data[0]['user'], self.user.id)
-        self.assertEqual(res.data[0]['order_date'], '2021-09-01')
-        self.assertEqual(res.data[0]['order_time'], '12:00:00')
-        self.assertEqual(res.data[0]['total_amount'], '100.00')
-        self.assertEqual(res.data[0]['order_status'], 'Pending')
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['restaurant'], self.restaurant.id)
+        self.assertEqual(res.data['results'][0]['user'], self.user.id)
+        self.assertEqual(res.data['results'][0]['order_date'], '2021-09-01')
+        self.assertEqual(res.data['results'][0]['order_time'], '12:00:00')
+        self.assertEqual(res.data['results'][0]['total_amount'], '100.00')
+        self.assertEqual(res.data['results'][0]['order_status'], 'Pending')
 
     def test_update_online_order(self):
         user2 = create_user(email="user2@example.com", password="test1234")
@@ -1,10 +1,10 @@
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.event_organizers.tests.test_promotion_api import create_user
 from apps.restaurants_cafes.models import Restaurant
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 RESTAURANT_API_URL = reverse('restaurants_cafes:restaurant-list')
 
@@ -17,10 +17,11 @@ def detail_url(restaurant_id):
     return reverse('restaurants_cafes:restaurant-detail', args=[restaurant_id])
 
 
-class PublicRestaurantApiTests(TestCase):
+class PublicRestaurantApiTests(ResponseCacheTestCase):
     """Test the publicly available restaurants API"""
 
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
 
     def test_retrieve_restaurants(self):
@@ -44,9 +45,9 @@ class PublicRestaurantApiTests(TestCase):
         res = self.client.get(RESTAURANT_API_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data[0]['name'], 'KFC')
-        self.assertEqual(res.data[1]['name'], 'Cafe Javas')
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'][0]['name'], 'KFC')
+        self.assertEqual(res.data['results'][1]['name'], 'Cafe Javas')
 
     def test_retrieve_restaurant_detail(self):
         """Test retrieving a restaurant detail"""
@@ -69,10 +70,11 @@ class PublicRestaurantApiTests(TestCase):
         self.assertEqual(res.data['contact_info'], restaurant.contact_info)
 
 
-class PrivateRestaurantApiTests(TestCase):
+class PrivateRestaurantApiTests(ResponseCacheTestCase):
     """Test the authorized user restaurants API"""
 
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user(
             email='test@example',
@@ -78,7 +78,7 @@ class PrivateTableReservationApiTests(TestCase):
         res = self.client.get(TABLE_RESERVATION_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
     def test_update_table_reservation(self):
         user2 = create_user(email="test2@example.com", password="test1234")
@@ -6,17 +6,20 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
-from apps.restaurants_cafes.models import Restaurant, TableReservation, Menu, OnlineOrder
+from apps.restaurants_cafes.models import Restaurant, TableReservation, Menu, OnlineOrder, OrderItem
 from apps.restaurants_cafes.serializers import (
     RestaurantSerializer, OnlineOrderSerializer, MenuSerializer,
     TableReservationSerializer, CalculateOrderSerializer
 )
+from tourism_ecosystem.expansions import Expansion
+from tourism_ecosystem.pagination import ListCursorPagination
 from tourism_ecosystem.permissions import IsAdminOrReadOnly
+from tourism_ecosystem.response_cache import CachedReadMixin
 from tourism_ecosystem.views import LoggingViewSet
 
 
 @extend_schema(tags=['RC - Restaurant'])
-class RestaurantViewSet(LoggingViewSet):
+class RestaurantViewSet(CachedReadMixin, LoggingViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -29,6 +32,7 @@ class TableReservationViewSet(LoggingViewSet):
     serializer_class = TableReservationSerializer
     permission_classes = [IsAuthenticated]
     activity_name = "Table Reservation"
+    pagination_class = ListCursorPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -38,11 +42,14 @@ class TableReservationViewSet(LoggingViewSet):
 
 
 @extend_schema(tags=['RC - Menu'])
-class MenuViewSet(LoggingViewSet):
+class MenuViewSet(CachedReadMixin, LoggingViewSet):
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
     permission_classes = [IsAdminOrReadOnly]
     activity_name = "Menu"
+    cache_actions = ('list', 'retrieve', 'get_menu_by_restaurant')
+    version_parents = {'get_menu_by_restaurant': ('restaurant', 'restaurant_id')}
+    expansions = {'restaurant': Expansion(RestaurantSerializer, source='restaurant')}
 
     @action(detail=False, methods=['get'],
             url_path='get_menu_by_restaurant/(?P<restaurant_id>[^/.]+)',
@@ -57,14 +64,13 @@ class MenuViewSet(LoggingViewSet):
 
         # Get the menu items for the specified restaurant
         menu_items = self.get_menus_by_restaurant(restaurant_id)
-        serializer = self.get_serializer(menu_items, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_list_response(menu_items)
 
     def get_menus_by_restaurant(self, restaurant_id):
         """
         Helper method to get menu items by restaurant_id
         """
-        return self.queryset.filter(restaurant_id=restaurant_id)
+        return self.filter_queryset(self.get_queryset()).filter(restaurant_id=restaurant_id)
 
 
 @extend_schema(tags=['RC - OnlineOrder'])
@@ -73,6 +79,8 @@ class OnlineOrderViewSet(LoggingViewSet):
     serializer_class = OnlineOrderSerializer
     permission_classes = [IsAuthenticated]
     activity_name = "Online Order"
+    pagination_class = ListCursorPagination
+    version_models = [OnlineOrder, OrderItem, Menu]
 
     def get_queryset(self):
         user = self.request.user
@@ -1,10 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.tourism_information_center.models import Destination
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 DESTINATION_URL_API = reverse('tourism_information_center:destination-list')
 
@@ -21,8 +21,9 @@ def detail_url(destination_id):
     return reverse('tourism_information_center:destination-detail', args=[destination_id])
 
 
-class PublicDestinationApiTests(TestCase):
+class PublicDestinationApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
 
     def test_retrieve_destinations(self):
@@ -48,9 +49,9 @@ class PublicDestinationApiTests(TestCase):
         res = self.client.get(DESTINATION_URL_API)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data[0]['name'], 'Kampala')
-        self.assertEqual(res.data[1]['name'], 'Murchison Falls National Park')
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'][0]['name'], 'Kampala')
+        self.assertEqual(res.data['results'][1]['name'], 'Murchison Falls National Park')
 
     def test_retrieve_destination_detail(self):
         """Test retrieving a destination detail"""
@@ -74,8 +75,9 @@ class PublicDestinationApiTests(TestCase):
         self.assertEqual(res.data['contact_info'], destination.contact_info)
 
 
-class PrivateDestinationApiTests(TestCase):
+class PrivateDestinationApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user()
         self.client.force_authenticate(self.user)
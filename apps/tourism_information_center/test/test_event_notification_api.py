@@ -51,9 +51,9 @@ class PublicEventNotificationApiTests(TestCase):
         res = self.client.get(EVENT_NOTIFICATION_URL_API)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data[0]['title'], 'Uganda Tourism Board')
-        self.assertEqual(res.data[1]['title'], 'Uganda Wildlife Authority')
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'][0]['title'], 'Uganda Tourism Board')
+        self.assertEqual(res.data['results'][1]['title'], 'Uganda Wildlife Authority')
 
     def test_retrieve_event_notification_detail(self):
         """Test retrieving an event notification detail"""
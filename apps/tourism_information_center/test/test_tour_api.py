@@ -1,12 +1,12 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APIClient
 
 from apps.tourism_information_center.models import Tour, Destination
+from tourism_ecosystem.testing import ResponseCacheTestCase
 
 TOUR_API = reverse('tourism_information_center:tour-list')
 
@@ -23,8 +23,9 @@ def detail_url(tour_id):
     return reverse('tourism_information_center:tour-detail', args=[tour_id])
 
 
-class PublicTourApiTests(TestCase):
+class PublicTourApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.destination = Destination.objects.create(
             name='Kampala',
@@ -62,9 +63,9 @@ class PublicTourApiTests(TestCase):
         res = self.client.get(TOUR_API)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 2)
-        self.assertEqual(res.data[0]['name'], 'Kampala City Tour')
-        self.assertEqual(res.data[1]['name'], 'Kampala Night Tour')
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertEqual(res.data['results'][0]['name'], 'Kampala City Tour')
+        self.assertEqual(res.data['results'][1]['name'], 'Kampala Night Tour')
 
     def test_retrieve_tour_detail(self):
         """Test retrieving a tour detail"""
@@ -92,8 +93,9 @@ class PublicTourApiTests(TestCase):
         self.assertEqual(res.data['guide_name'], 'John Doe')
 
 
-class PrivateTourApiTests(TestCase):
+class PrivateTourApiTests(ResponseCacheTestCase):
     def setUp(self):
+        super().setUp()
         self.client = APIClient()
         self.user = create_user()
         self.client.force_authenticate(self.user)
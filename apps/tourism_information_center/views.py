@@ -5,12 +5,14 @@ from rest_framework.permissions import IsAuthenticated
 from apps.tourism_information_center.models import Destination, Tour, EventNotification, TourBooking
 from apps.tourism_information_center.serializers import DestinationSerializer, TourSerializer, \
     EventNotificationSerializer, TourBookingSerializer
+from tourism_ecosystem.pagination import ListCursorPagination
 from tourism_ecosystem.permissions import IsAdminOrReadOnly
+from tourism_ecosystem.response_cache import CachedReadMixin
 from tourism_ecosystem.views import LoggingViewSet
 
 
 @extend_schema(tags=['TIC - Destination'])
-class DestinationViewSet(LoggingViewSet):
+class DestinationViewSet(CachedReadMixin, LoggingViewSet):
     queryset = Destination.objects.all()
     serializer_class = DestinationSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -18,7 +20,7 @@ class DestinationViewSet(LoggingViewSet):
 
 
 @extend_schema(tags=['TIC - Tour'])
-class TourViewSet(LoggingViewSet):
+class TourViewSet(CachedReadMixin, LoggingViewSet):
     queryset = Tour.objects.all()
     serializer_class = TourSerializer
     permission_classes = [IsAdminOrReadOnly]
@@ -39,6 +41,7 @@ class TourBookingViewSet(LoggingViewSet):
     serializer_class = TourBookingSerializer
     permission_classes = [IsAuthenticated]
     activity_name = "Tour Booking"
+    pagination_class = ListCursorPagination
 
     def perform_create(self, serializer):
         # Automatically set the current logged-in user as user_id
@@ -0,0 +1,146 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# Default values for the keys of settings.TOKEN_CACHE_SETTINGS
+DEFAULTS = {
+    # Maximum number of tokens kept in the in-process LRU cache
+    'MAX_SIZE': 1024,
+    # Seconds a resolved token stays valid in the cache
+    'TTL': 60,
+    # Optional CACHES alias used as a second tier shared between processes
+    'BACKEND': None,
+}
+
+
+def get_token_cache_setting(name):
+    return getattr(settings, 'TOKEN_CACHE_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+class TokenUserCache:
+    """
+    LRU + TTL cache mapping token keys to their Token (with the user loaded).
+
+    Entries are stored pickled, so every caller gets its own Token and User
+    instances. When a Django cache alias is configured it is used as a second,
+    shared tier. Entries are removed through signals when a token is deleted or
+    its user changes; other processes rely on the TTL for their local tier.
+    """
+
+    def __init__(self, max_size=1024, ttl=60, backend=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, data = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return pickle.loads(data)
+                del self._entries[key]
+
+        if self.backend:
+            data = caches[self.backend].get(self._backend_key(key))
+            if data is not None:
+                self._store_local(key, data)
+                return pickle.loads(data)
+        return None
+
+    def set(self, key, token):
+        data = pickle.dumps(token)
+        self._store_local(key, data)
+        if self.backend:
+            caches[self.backend].set(self._backend_key(key), data, self.ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend:
+            caches[self.backend].delete(self._backend_key(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key, data):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _backend_key(key):
+        return f"auth-token:{key}"
+
+
+token_cache = TokenUserCache(
+    max_size=get_token_cache_setting('MAX_SIZE'),
+    ttl=get_token_cache_setting('TTL'),
+    backend=get_token_cache_setting('BACKEND'),
+)
+
+
+def resolve_token(key):
+    """
+    Return the Token for the key with its user loaded, or None if the key is unknown.
+    """
+    token = token_cache.get(key)
+    if token is None:
+        try:
+            token = Token.objects.select_related('user').get(key=key)
+        except Token.DoesNotExist:
+            return None
+        token_cache.set(key, token)
+    return token
+
+
+def get_token_key(request):
+    """
+    Return the key of a 'Token <key>' Authorization header, or None.
+    """
+    auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+    parts = auth_header.split()
+    if len(parts) == 2 and parts[0] == 'Token':
+        return parts[1]
+    return None
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication backed by the shared token cache.
+
+    Reuses the token already resolved for the request by RequestLoggingMiddleware,
+    so a request resolves its token at most once.
+    """
+
+    def authenticate(self, request):
+        key = get_token_key(request)
+        resolved = getattr(request._request, 'auth_token', None)
+        if key is not None and resolved is not None and resolved.key == key:
+            return self.check_token(resolved)
+        return super().authenticate(request)
+
+    def authenticate_credentials(self, key):
+        token = resolve_token(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return self.check_token(token)
+
+    def check_token(self, token):
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token.user, token
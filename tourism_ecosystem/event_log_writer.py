@@ -0,0 +1,447 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import locks
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Default values for the keys of settings.EVENT_LOG_SETTINGS
+DEFAULTS = {
+    # 'buffered' hands events to a background flusher, 'sync' writes them in the calling thread
+    'WRITER': 'buffered',
+    # 'close' writes the event after the response has been sent, 'response' as soon as it is built
+    'PERSIST_ON': 'close',
+    # Maximum number of rows written by a single bulk_create
+    'BATCH_SIZE': 200,
+    # Maximum number of seconds an event waits in the buffer before it is flushed
+    'FLUSH_INTERVAL': 1.0,
+    # Maximum number of events kept in memory
+    'MAX_BUFFER_SIZE': 10000,
+    # Seconds a request waits for buffer space before the overflow policy applies
+    'BLOCK_TIMEOUT': 0.05,
+    # What to do with an event when the buffer is still full: 'drop' or 'spill'
+    'OVERFLOW_POLICY': 'spill',
+    # File receiving spilled events (JSON lines), replayed once the buffer has room again.
+    # Events failing while the rest of their batch is written go to <SPILL_FILE>.quarantine
+    'SPILL_FILE': os.path.join(settings.BASE_DIR, 'event_log_spill.jsonl'),
+    # Regular expressions; when set, only matching paths are logged
+    'INCLUDE_PATHS': [],
+    # Regular expressions of paths that are never logged (unless ALWAYS_LOG_ERRORS applies)
+    'EXCLUDE_PATHS': [],
+    # Whether views without a log_event attribute are logged
+    'LOG_UNMARKED_VIEWS': False,
+    # Fraction of cases logged per activity name (picked on a hash of the case ID), '*' applies to all
+    # other activities
+    'SAMPLE_RATES': {},
+    # Log responses with status >= 400 even when the request is excluded or not sampled
+    'ALWAYS_LOG_ERRORS': True,
+    # How anonymous callers get a case ID: 'cookie' (signed cookie or header), 'fingerprint' or 'session'
+    'CASE_ID_STRATEGY': 'cookie',
+    # Name of the signed cookie carrying the case ID of anonymous callers
+    'CASE_ID_COOKIE': 'case_id',
+    # Lifetime of the case ID cookie in seconds
+    'CASE_ID_COOKIE_AGE': 30 * 24 * 3600,
+    # request.META key of the header clients can use to send their own correlation ID
+    'CASE_ID_HEADER': 'HTTP_X_CASE_ID',
+    # Length in seconds of the time bucket used by the 'fingerprint' strategy
+    'CASE_ID_TIME_BUCKET': 3600,
+    # Number of rows fetched per database round trip by the event log exports
+    'EXPORT_CHUNK_SIZE': 2000,
+    # Number of threads running background export jobs, 0 runs them in the requesting thread
+    'EXPORT_JOB_WORKERS': 2,
+    # Directory receiving the files of background export jobs
+    'EXPORT_DIR': os.path.join(settings.MEDIA_ROOT, 'exports'),
+    # How the event log list computes its total: 'exact', 'estimate' (planner estimate on PostgreSQL
+    # and MySQL, exact on SQLite) or 'none'
+    'LIST_COUNT': 'exact',
+    # Number of primary keys deleted per transaction when pruning event logs
+    'PRUNE_BATCH_SIZE': 5000,
+    # Directory receiving the archives written before pruning
+    'ARCHIVE_DIR': os.path.join(settings.MEDIA_ROOT, 'event_log_archives'),
+    # Roll the events of past periods over to per-period tables: None, 'month' or 'day'
+    'PARTITIONING': None,
+    # Maintain activity statistics and directly-follows counts as events are written
+    'PROCESS_AGGREGATES': True,
+    # Seconds without events after which a case is closed: its state is expired by the
+    # prune_event_logs command and its next event starts a new case
+    'CASE_IDLE_TIMEOUT': 24 * 3600,
+}
+
+DATETIME_FIELDS = ('start_time', 'end_time')
+
+
+def get_event_log_setting(name):
+    """
+    Return an EVENT_LOG_SETTINGS value, falling back to the default.
+    """
+    return getattr(settings, 'EVENT_LOG_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+def write_events(events):
+    """
+    Persist a batch of event dicts with a single bulk insert, then add them to the
+    process-mining aggregates. The aggregates are updated in a transaction of their
+    own: failing to update them never loses (nor duplicates) the events.
+    """
+    from apps.customUser.models import EventLog
+    from apps.customUser.process_mining import update_process_aggregates
+
+    with transaction.atomic():
+        EventLog.objects.bulk_create([EventLog(**event) for event in events])
+    if get_event_log_setting('PROCESS_AGGREGATES'):
+        update_process_aggregates(events)
+
+
+class BaseEventLogWriter:
+    """
+    Keeps track of events whose request is still in flight so they can be recorded
+    as incomplete if the process stops before the request finishes.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def begin(self, event):
+        """
+        Register an event whose request is being handled.
+        """
+        with self._in_flight_lock:
+            self._in_flight[id(event)] = event
+
+    def submit(self, event):
+        """
+        Persist a finished (or abandoned) event. Returns False if the event was dropped.
+        """
+        with self._in_flight_lock:
+            self._in_flight.pop(id(event), None)
+        return self.write(event)
+
+    def record_in_flight(self):
+        """
+        Submit every event that never finished, marked as incomplete.
+        """
+        with self._in_flight_lock:
+            events = list(self._in_flight.values())
+            self._in_flight.clear()
+        for event in events:
+            event['incomplete'] = True
+            if not event.get('end_time'):
+                event['end_time'] = timezone.now()
+            self.write(event)
+
+    def write(self, event):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def stop(self):
+        self.record_in_flight()
+        self.flush()
+
+
+class SyncEventLogWriter(BaseEventLogWriter):
+    """
+    Writes every event immediately in the calling thread.
+    """
+
+    def write(self, event):
+        write_events([event])
+        return True
+
+
+class BufferedEventLogWriter(BaseEventLogWriter):
+    """
+    Collects finished events in memory and writes them in batches from a background thread.
+
+    A batch is flushed as soon as it is full or when the oldest event has waited
+    ``flush_interval`` seconds. When the buffer is full, ``submit`` waits up to
+    ``block_timeout`` seconds for room (backpressure) and then either drops the event
+    or spills it to ``spill_file``, depending on ``overflow_policy``.
+
+    A batch that fails is retried one event at a time. Events that fail while the rest
+    of their batch is written are moved to the quarantine file instead of being
+    retried forever; when no event can be written (the database is down) they are
+    spilled, and the spill file is only replayed by flushes whose writes succeeded.
+    Replay files left by dead processes are taken over by the next replay.
+    """
+
+    def __init__(self, batch_size=200, flush_interval=1.0, max_buffer_size=10000,
+                 block_timeout=0.05, overflow_policy='spill', spill_file=None):
+        super().__init__()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self.block_timeout = block_timeout
+        self.overflow_policy = overflow_policy
+        self.spill_file = spill_file
+        self.dropped = 0
+        self.spilled = 0
+        self.quarantined = 0
+
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+
+    def write(self, event):
+        """
+        Queue an event for the flusher thread.
+        """
+        self._ensure_started()
+        with self._not_full:
+            if len(self._buffer) >= self.max_buffer_size:
+                self._wakeup.set()
+                self._not_full.wait_for(lambda: len(self._buffer) < self.max_buffer_size,
+                                        timeout=self.block_timeout)
+            if len(self._buffer) < self.max_buffer_size:
+                self._buffer.append(event)
+                if len(self._buffer) >= self.batch_size:
+                    self._wakeup.set()
+                return True
+        return self._overflow(event)
+
+    def flush(self):
+        """
+        Write everything currently buffered, then replay spilled events if there is room.
+        """
+        with self._flush_lock:
+            written = True
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                written = self._write(batch) and written
+            if written:
+                # Replaying while the database is failing would only spill the events again
+                self._replay_spill()
+
+    def stop(self):
+        """
+        Stop the flusher thread and write the remaining events.
+        """
+        self.record_in_flight()
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=max(self.flush_interval * 5, 5))
+        self.flush()
+
+    def _ensure_started(self):
+        # Restart the flusher after a fork (e.g. preloading WSGI servers)
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Error flushing event logs: %s", e)
+        connection.close()
+
+    def _take_batch(self):
+        with self._not_full:
+            batch = []
+            while self._buffer and len(batch) < self.batch_size:
+                batch.append(self._buffer.popleft())
+            if batch:
+                self._not_full.notify_all()
+            return batch
+
+    def _write(self, batch):
+        """
+        Write a batch, falling back to one event at a time. Returns False when no event
+        could be written, which points at the database rather than at the events.
+        """
+        try:
+            write_events(batch)
+            return True
+        except Exception as e:
+            logger.error("Failed to write %d event logs: %s", len(batch), e)
+            failed = [(batch[0], e)] if len(batch) == 1 else []
+        if not failed:
+            for event in batch:
+                try:
+                    write_events([event])
+                except Exception as e:
+                    failed.append((event, e))
+        # Failing while the rest of the batch is written points at the event itself
+        written = len(failed) < len(batch)
+        for event, error in failed:
+            if written:
+                self._quarantine(event, error)
+            else:
+                self._overflow(event)
+        return written
+
+    @contextmanager
+    def _spill_lock(self):
+        # Shared by every process using the spill file: appends never race with a replay
+        # taking the file over
+        with open(f"{self.spill_file}.lock", 'a') as f:
+            locks.lock(f, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(f)
+
+    def _append(self, path, event):
+        with self._spill_lock(), open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(event, default=str) + '\n')
+
+    def _overflow(self, event):
+        if self.overflow_policy == 'spill' and self.spill_file:
+            try:
+                self._append(self.spill_file, event)
+                self.spilled += 1
+                return True
+            except OSError as e:
+                logger.error("Could not spill event log to %s: %s", self.spill_file, e)
+        self.dropped += 1
+        logger.warning("Dropped an event log (%d dropped so far)", self.dropped)
+        return False
+
+    def _quarantine(self, event, error):
+        if self.spill_file:
+            try:
+                self._append(f"{self.spill_file}.quarantine", event)
+                self.quarantined += 1
+                logger.error("Quarantined an event log that cannot be written: %s", error)
+                return
+            except OSError as e:
+                logger.error("Could not quarantine event log: %s", e)
+        self.dropped += 1
+        logger.warning("Dropped an event log (%d dropped so far)", self.dropped)
+
+    def _replay_spill(self):
+        if not self.spill_file or len(self._buffer) >= self.batch_size:
+            return
+        # Each process replays its own copy, left over here if a replay was interrupted
+        replay_path = f"{self.spill_file}.{os.getpid()}.replay"
+        if not os.path.exists(replay_path) and not self._take_over_spill(replay_path):
+            return
+
+        batch = []
+        written = True
+        for event in self._read_spill(replay_path):
+            if not written:
+                self._overflow(event)  # Kept for the next replay once the database is back
+                continue
+            batch.append(event)
+            if len(batch) >= self.batch_size:
+                written = self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+        os.remove(replay_path)
+
+    def _take_over_spill(self, replay_path):
+        """
+        Move the replay file of a dead process, or else the spill file, to ``replay_path``.
+        Returns False when there is nothing to replay.
+        """
+        try:
+            with self._spill_lock():
+                source = self._find_orphaned_replay()
+                if source is None:
+                    if not os.path.exists(self.spill_file):
+                        return False
+                    source = self.spill_file
+                os.replace(source, replay_path)
+            return True
+        except OSError:
+            return False  # Taken over by another process
+
+    def _find_orphaned_replay(self):
+        """
+        Replay file left by a process that died while replaying it. Called with the spill
+        lock held.
+        """
+        directory, name = os.path.split(os.path.abspath(self.spill_file))
+        for filename in os.listdir(directory):
+            pid = filename[len(name) + 1:-len('.replay')]
+            if filename.startswith(f"{name}.") and filename.endswith('.replay') and pid.isdigit() \
+                    and not is_process_alive(int(pid)):
+                return os.path.join(directory, filename)
+        return None
+
+    @staticmethod
+    def _read_spill(path):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                for field in DATETIME_FIELDS:
+                    if event.get(field):
+                        event[field] = parse_datetime(event[field])
+                yield event
+
+
+def is_process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, owned by another user
+    return True
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_event_log_writer():
+    """
+    Return the process-wide event log writer configured by EVENT_LOG_SETTINGS.
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                if get_event_log_setting('WRITER') == 'sync':
+                    _writer = SyncEventLogWriter()
+                else:
+                    _writer = BufferedEventLogWriter(
+                        batch_size=get_event_log_setting('BATCH_SIZE'),
+                        flush_interval=get_event_log_setting('FLUSH_INTERVAL'),
+                        max_buffer_size=get_event_log_setting('MAX_BUFFER_SIZE'),
+                        block_timeout=get_event_log_setting('BLOCK_TIMEOUT'),
+                        overflow_policy=get_event_log_setting('OVERFLOW_POLICY'),
+                        spill_file=get_event_log_setting('SPILL_FILE'),
+                    )
+                atexit.register(_stop_writer)
+    return _writer
+
+
+def _stop_writer():
+    try:
+        _writer.stop()
+    except Exception as e:
+        logger.error("Error stopping the event log writer: %s", e)
@@ -0,0 +1,57 @@
+from django.core.exceptions import ImproperlyConfigured
+
+
+class Expansion:
+    """
+    Related data clients can embed in a representation with ``?expand=<name>``.
+
+    ``source`` names a relation of the viewset's model (a field or a reverse accessor
+    such as ``guestservice_set``): to-one relations are loaded with select_related and
+    to-many relations with prefetch_related, so an expanded listing costs the same number
+    of queries whatever its length. Data computed in the query instead gives ``annotate``
+    and the ``models`` it is computed from, and is serialized from the object itself.
+    Relations the nested serializer reads in turn go in ``prefetch_related``.
+    """
+
+    def __init__(self, serializer_class, source=None, annotate=None, models=(), prefetch_related=()):
+        self.serializer_class = serializer_class
+        self.source = source
+        self.annotate = annotate or {}
+        self.models = list(models)
+        self.prefetch_related = list(prefetch_related)
+
+    def get_relation(self, model):
+        for field in model._meta.get_fields():
+            if not field.is_relation:
+                continue
+            if field.name == self.source or (field.auto_created and not field.concrete
+                                             and field.get_accessor_name() == self.source):
+                return field
+        raise ImproperlyConfigured(f"{model.__name__} has no relation named '{self.source}'.")
+
+    def apply(self, queryset):
+        if self.annotate:
+            queryset = queryset.annotate(**self.annotate)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.source is None:
+            return queryset
+        relation = self.get_relation(queryset.model)
+        if relation.many_to_many or relation.one_to_many:
+            return queryset.prefetch_related(self.source)
+        return queryset.select_related(self.source)
+
+    def get_field(self, name, model):
+        if self.source is None:
+            return self.serializer_class(source='*', read_only=True)
+        relation = self.get_relation(model)
+        kwargs = {} if self.source == name else {'source': self.source}
+        return self.serializer_class(many=relation.many_to_many or relation.one_to_many, read_only=True, **kwargs)
+
+    def get_models(self, model):
+        """
+        Models the expanded data is read from, part of the response versions.
+        """
+        if self.source is None:
+            return self.models
+        return [self.get_relation(model).related_model] + self.models
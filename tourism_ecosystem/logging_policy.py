@@ -0,0 +1,71 @@
+import hashlib
+import re
+
+from tourism_ecosystem.event_log_writer import get_event_log_setting
+
+
+class EventLogPolicy:
+    """
+    Decides which requests are recorded as EventLog rows.
+
+    A request is logged when its path passes the include/exclude patterns, its view
+    opts in through ``log_event`` and it is picked by the sampling rate of its
+    activity. Sampling is decided on a hash of the case ID, so a case is either
+    logged whole or not at all (and a case logged at a rate is logged at every higher
+    rate). Error responses (status >= 400) can be logged regardless.
+    """
+
+    def __init__(self, include_paths=(), exclude_paths=(), log_unmarked_views=False,
+                 sample_rates=None, always_log_errors=True):
+        self.include_paths = [re.compile(pattern) for pattern in include_paths]
+        self.exclude_paths = [re.compile(pattern) for pattern in exclude_paths]
+        self.log_unmarked_views = log_unmarked_views
+        self.sample_rates = sample_rates or {}
+        self.always_log_errors = always_log_errors
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            include_paths=get_event_log_setting('INCLUDE_PATHS'),
+            exclude_paths=get_event_log_setting('EXCLUDE_PATHS'),
+            log_unmarked_views=get_event_log_setting('LOG_UNMARKED_VIEWS'),
+            sample_rates=get_event_log_setting('SAMPLE_RATES'),
+            always_log_errors=get_event_log_setting('ALWAYS_LOG_ERRORS'),
+        )
+
+    def should_log_request(self, path, view_class, activity, get_case_id):
+        """
+        ``get_case_id`` returns the case ID of the request, it is only called when the
+        activity is sampled.
+        """
+        return self.path_allowed(path) and self.view_allowed(view_class) and self.sampled(activity, get_case_id)
+
+    def should_log_error(self, status_code):
+        return self.always_log_errors and status_code >= 400
+
+    def path_allowed(self, path):
+        if self.include_paths and not any(pattern.search(path) for pattern in self.include_paths):
+            return False
+        return not any(pattern.search(path) for pattern in self.exclude_paths)
+
+    def view_allowed(self, view_class):
+        """
+        Views opt in or out with their log_event attribute.
+        """
+        if view_class is None:
+            return False
+        return getattr(view_class, 'log_event', self.log_unmarked_views)
+
+    def sampled(self, activity, get_case_id):
+        rate = self.sample_rates.get(activity, self.sample_rates.get('*', 1.0))
+        if rate >= 1:
+            return True
+        return rate > 0 and get_case_position(get_case_id()) < rate
+
+
+def get_case_position(case_id):
+    """
+    Position of the case in [0, 1), uniformly distributed and stable across processes.
+    """
+    digest = hashlib.blake2b(case_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') / 2 ** 64
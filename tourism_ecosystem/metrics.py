@@ -0,0 +1,228 @@
+import bisect
+import hmac
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from tourism_ecosystem.authentication import get_token_key, resolve_token
+
+# Default values for the keys of settings.METRICS_SETTINGS
+DEFAULTS = {
+    # Record request metrics in MetricsMiddleware
+    'ENABLED': True,
+    # Bearer token of the scrapers, staff users can read /metrics without it
+    'AUTH_TOKEN': None,
+    # Serve /metrics to anyone, e.g. when it is only reachable from the monitoring network
+    'PUBLIC': False,
+}
+
+# Upper bounds of the histogram buckets, +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)  # seconds
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def get_metrics_setting(name):
+    return getattr(settings, 'METRICS_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. Not thread-safe: each instance is only written by one thread.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def merge(self, other):
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+
+
+class RequestSeries:
+    """
+    Histograms of the requests of one (activity, status class).
+    """
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time = Histogram(DB_TIME_BUCKETS)
+
+    def merge(self, other):
+        self.latency.merge(other.latency)
+        self.queries.merge(other.queries)
+        self.db_time.merge(other.db_time)
+
+
+class RequestMetrics:
+    """
+    Request histograms keyed by activity and status class.
+
+    Every thread records into its own shard, so observing never takes a lock; the
+    shards are merged when the metrics are read. The shards of finished threads are
+    folded into a single retired shard, so thread churn does not grow the list.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []  # (weak reference to the thread, shard)
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _get_shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_finished_shards()
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+        return shard
+
+    def _retire_finished_shards(self):
+        # Called with the lock held, finished threads no longer write to their shard
+        live = []
+        for thread_ref, shard in self._shards:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, shard))
+                continue
+            for key, series in shard.items():
+                self._retired.setdefault(key, RequestSeries()).merge(series)
+        self._shards = live
+
+    def observe(self, activity, status_code, duration, query_count, db_time):
+        shard = self._get_shard()
+        key = (activity, f"{status_code // 100}xx")
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = RequestSeries()
+        series.latency.observe(duration)
+        series.queries.observe(query_count)
+        series.db_time.observe(db_time)
+
+    def collect(self):
+        """
+        Merge the shards into a {(activity, status class): RequestSeries} snapshot.
+        """
+        merged = {}
+        with self._lock:
+            self._retire_finished_shards()
+            for key, series in self._retired.items():
+                merged.setdefault(key, RequestSeries()).merge(series)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, series in dict(shard).items():
+                merged.setdefault(key, RequestSeries()).merge(series)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._retired.clear()
+            for _, shard in self._shards:
+                shard.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+class QueryCounter:
+    """
+    connection.execute_wrapper() counting the queries of a request and their time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_histogram(name, labels, histogram):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    return lines
+
+
+def render_metrics(metrics=request_metrics):
+    """
+    Render the request histograms in the Prometheus text exposition format.
+    """
+    families = [
+        ('http_request_duration_seconds', 'latency', 'Request latency by activity and status class.'),
+        ('http_request_db_queries', 'queries', 'Database queries per request.'),
+        ('http_request_db_duration_seconds', 'db_time', 'Database time per request.'),
+    ]
+    snapshot = sorted(metrics.collect().items())
+    lines = []
+    for name, attribute, description in families:
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} histogram')
+        for (activity, status_class), series in snapshot:
+            labels = f'activity="{escape_label(activity)}",status="{status_class}"'
+            lines.extend(format_histogram(name, labels, getattr(series, attribute)))
+    return '\n'.join(lines) + '\n'
+
+
+def is_metrics_reader(request):
+    """
+    Whether the request may read /metrics: PUBLIC, the AUTH_TOKEN bearer token or a staff user.
+    """
+    if get_metrics_setting('PUBLIC'):
+        return True
+    token = get_metrics_setting('AUTH_TOKEN')
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    # Compared as bytes, compare_digest rejects non-ASCII str
+    if token and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+        return True
+    user = get_request_user(request)
+    return bool(user and user.is_staff)
+
+
+def get_request_user(request):
+    """
+    The session user, else the user of a 'Token <key>' Authorization header: /metrics is a
+    plain Django view, which DRF authentication never runs for.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    key = get_token_key(request)
+    token = resolve_token(key) if key else None
+    if token is not None and token.user.is_active:
+        return token.user
+    return user
+
+
+def metrics_view(request):
+    if not is_metrics_reader(request):
+        user = get_request_user(request)
+        return HttpResponse(status=403 if user and user.is_authenticated else 401)
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
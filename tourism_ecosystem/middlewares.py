@@ -1,134 +1,319 @@
+import contextvars
+import hashlib
 import logging
+import re
+import time
 import uuid
+from typing import NamedTuple, Optional
 
-from django.urls import resolve
+from django.core.signals import request_finished
+from django.db import connection
+from django.dispatch import receiver
+from django.urls import resolve, Resolver404
 from django.utils import timezone
-from rest_framework.authtoken.models import Token
 from rest_framework.viewsets import ViewSet, ModelViewSet
 
-from apps.customUser.models import EventLog
+from tourism_ecosystem.authentication import get_token_key, resolve_token
+from tourism_ecosystem.event_log_writer import get_event_log_writer, get_event_log_setting
+from tourism_ecosystem.logging_policy import EventLogPolicy
+from tourism_ecosystem.metrics import QueryCounter, get_metrics_setting, request_metrics
+from tourism_ecosystem.structured_logging import activity_var, request_id_var
+from tourism_ecosystem.profiling import (
+    QueryProfiler, format_profile_header, get_profiler_setting, is_profiling_requested, profile_store
+)
 
 logger = logging.getLogger(__name__)
 
 
+class ResolvedActivity(NamedTuple):
+    view_class: Optional[type]
+    action_name: str
+    activity: str
+
+
+# Resolved activities per (URL pattern, HTTP method), shared by all requests of the process
+_activity_cache = {}
+
+# Correlation IDs accepted from the case ID and request ID headers
+CASE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,128}$')
+CASE_ID_COOKIE_SALT = 'tourism_ecosystem.case_id'
+
+# Event of the current request waiting for its response to be closed (PERSIST_ON 'close')
+closing_event_var = contextvars.ContextVar('closing_event', default=None)
+
+
+class RequestContextMiddleware:
+    """
+    Gives every request an id, taken from a valid X-Request-ID header or generated,
+    returned in the X-Request-ID response header and added to its log records.
+
+    The context outlives the middleware chain: Django logs 4xx/5xx responses
+    (django.request) after the chain returns, so it is only cleared on request_finished.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get('HTTP_X_REQUEST_ID', '')
+        if not CASE_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        request_id_var.set(request_id)
+        activity_var.set(None)
+        response = self.get_response(request)
+        # RequestLoggingMiddleware resets the activity on its way out, keep it for the response log
+        resolved = getattr(request, 'resolved_activity', None)
+        if resolved is not None:
+            activity_var.set(resolved.activity)
+        response['X-Request-ID'] = request_id
+        return response
+
+
+@receiver(request_finished)
+def clear_request_context(sender, **kwargs):
+    """
+    End the request context once the response has been sent (or its content consumed).
+    """
+    request_id_var.set(None)
+    activity_var.set(None)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, query count and database time of every request in the
+    in-process histograms served at /metrics. The activity is the one resolved by
+    RequestLoggingMiddleware; the latency of a streaming response stops at its headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_metrics_setting('ENABLED'):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        if not (resolver_match and resolver_match.url_name == 'metrics'):
+            resolved = getattr(request, 'resolved_activity', None)
+            activity = resolved.activity if resolved else 'Unknown'
+            request_metrics.observe(activity, response.status_code, duration, counter.count, counter.duration)
+        return response
+
+
+class SQLProfilerMiddleware:
+    """
+    Records every SQL query of the requests sending the profiler header
+    (SQL_PROFILER_SETTINGS), flags repeated query shapes as possible N+1 patterns and
+    returns a summary in the X-SQL-Profile header. The full profile is kept for
+    /debug/sql-profiles/<id>/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_profiling_requested(request):
+            return self.get_response(request)
+
+        profiler = QueryProfiler(get_profiler_setting('STACK_DEPTH'))
+        with connection.execute_wrapper(profiler):
+            response = self.get_response(request)
+
+        profile = profiler.get_profile(request, response, get_profiler_setting('REPEAT_THRESHOLD'))
+        profile_store.add(profile)
+        response['X-SQL-Profile'] = format_profile_header(profile)
+        for repeated in profile['repeated_queries']:
+            logger.warning("Possible N+1 query in %s %s: %d x %s", request.method, request.path,
+                           repeated['count'], repeated['shape'])
+        return response
+
+
 class RequestLoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.policy = EventLogPolicy.from_settings()
 
     def __call__(self, request):
+        activity_token = activity_var.set(None)
         try:
             self.process_request(request)
             response = self.get_response(request)
             self.process_response(request, response)
             return response
         except Exception as e:
-            logger.error(f"Unexpected error in RequestLoggingMiddleware: {str(e)}")
+            logger.error("Unexpected error in RequestLoggingMiddleware: %s", e)
+            self.record_incomplete(request)
             return self.get_response(request)
+        finally:
+            activity_var.reset(activity_token)
 
     def process_request(self, request):
         try:
-            user = self.get_user_from_token(request)
-            case_id = self.get_or_create_case_id(request, user)
-            request.session['case_id'] = case_id
-
             request.start_time = timezone.now()
-            user_name = getattr(user, 'email', 'Anonymous')
-            user_id = user.id if user else None
+            resolved = self.resolve_activity(request)
+            activity_var.set(resolved.activity)
+            if self.policy.should_log_request(request.path_info, resolved.view_class, resolved.activity,
+                                              lambda: self.get_case(request)[1]):
+                self.start_event(request)
+        except Exception as e:
+            logger.error("Error in process_request: %s", e)
 
-            view_class, action_name = self.get_view_class_and_action(request)
-            logger.debug(f"View class: {view_class}, Action name: {action_name}")
+    def start_event(self, request):
+        """
+        Build the in-memory event of the request; it is written once it is finished.
+        """
+        user, case_id = self.get_case(request)
+        if get_event_log_setting('CASE_ID_STRATEGY') == 'session':
+            request.session['case_id'] = case_id
 
-            if view_class:
-                if hasattr(view_class, 'get_activity_name'):
-                    activity = view_class.get_activity_name(action_name)
-                elif hasattr(view_class, 'activity_name'):
-                    activity = f"{view_class.activity_name} {action_name.capitalize()}"
-                else:
-                    activity = f"{view_class.__name__.replace('ViewSet', '')} {action_name.capitalize()}"
-            else:
-                activity = f"Unknown Activity {action_name.capitalize()}"
-
-            logger.debug(f"Generated activity name: {activity}")
-
-            request.event_log = EventLog.objects.create(
-                case_id=case_id,
-                activity=activity,
-                start_time=request.start_time,
-                user_id=user_id,
-                user_name=user_name
-            )
-            logger.info(f"[Event Log Created] {request.event_log}")
-            logger.debug(f"Event Log ID: {request.event_log.id}, Start Time: {request.event_log.start_time}")
-        except Exception as e:
-            logger.error(f"Error in process_request: {str(e)}")
+        request.event_log = {
+            'case_id': case_id,
+            'activity': self.resolve_activity(request).activity,
+            'start_time': request.start_time,
+            'user_id': user.id if user else None,
+            'user_name': getattr(user, 'email', 'Anonymous'),
+        }
+        get_event_log_writer().begin(request.event_log)
+        logger.debug("Event log started: %s", request.event_log['activity'])
+
+    def get_case(self, request):
+        """
+        User and case ID of the request, computed once (sampling may need the case ID
+        before the event is started).
+        """
+        if not hasattr(request, 'event_case'):
+            user = self.get_user_from_token(request)
+            request.event_case = (user, self.get_or_create_case_id(request, user))
+        return request.event_case
 
     def get_user_from_token(self, request):
         """
         从请求中的Token获取用户
+        The resolved token is attached to the request and reused by CachedTokenAuthentication.
         """
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Token '):
-            token_key = auth_header.split(' ')[1]
-            try:
-                token = Token.objects.get(key=token_key)
+        token_key = get_token_key(request)
+        if token_key:
+            token = resolve_token(token_key)
+            if token is not None:
+                request.auth_token = token
                 return token.user
-            except Token.DoesNotExist:
-                pass
         return None
 
     def process_response(self, request, response):
         try:
+            if not hasattr(request, 'event_log') and self.policy.should_log_error(response.status_code):
+                # Errors are recorded even for requests excluded by the logging policy
+                self.start_event(request)
+
             if hasattr(request, 'event_log'):
-                end_time = timezone.now()
-                request.event_log.end_time = end_time
-                request.event_log.status_code = response.status_code
-                request.event_log.save()
-                logger.info(f"[Event Log Updated] {request.event_log}")
+                event_log = request.event_log
+                event_log['status_code'] = response.status_code
+                # A streaming response is only finished once its content has been consumed
+                if not response.streaming:
+                    event_log['end_time'] = timezone.now()
+
+                if get_event_log_setting('PERSIST_ON') == 'close':
+                    # Finished on request_finished, sent by response.close() once the response has been sent
+                    previous = closing_event_var.get()
+                    if previous is not None:
+                        self.finish_event(previous)  # The response of the previous request was never closed
+                    closing_event_var.set(event_log)
+                else:
+                    self.finish_event(event_log)
 
-                if self.is_process_completed(request, response):
+                if get_event_log_setting('CASE_ID_STRATEGY') == 'session' and \
+                        self.is_process_completed(request, response):
                     request.session.pop('case_id', None)
             else:
-                logger.warning("No event_log found on request object")
+                logger.debug("Request excluded from event logging")
+
+            # Also set for sampled-out requests, so the next requests of the caller keep their case
+            if getattr(request, 'new_case_id', None):
+                self.set_case_id_cookie(response, request.new_case_id)
         except Exception as e:
-            logger.error(f"Error in process_response: {str(e)}")
+            logger.error("Error in process_response: %s", e)
         finally:
             return response
 
-    def get_view_class_and_action(self, request):
+    @staticmethod
+    def finish_event(event_log):
         """
-        解析请求中的视图类和动作。
+        Hand a finished event over to the event log writer.
+        """
+        try:
+            if not event_log.get('end_time'):
+                event_log['end_time'] = timezone.now()
+            get_event_log_writer().submit(event_log)
+            logger.debug("Event log finished: %s %s", event_log['activity'], event_log.get('status_code'))
+        except Exception as e:
+            logger.error("Error in finish_event: %s", e)
+
+    def record_incomplete(self, request):
+        """
+        Record the event of a request that crashed before a response was built.
+        """
+        event_log = getattr(request, 'event_log', None)
+        if event_log is not None and 'status_code' not in event_log:
+            event_log['incomplete'] = True
+            self.finish_event(event_log)
+
+    def resolve_activity(self, request):
         """
+        Resolve the view class, action and activity name of the request.
+        The URL is resolved once per request and the result is memoized per (URL pattern, HTTP method).
+        """
+        if hasattr(request, 'resolved_activity'):
+            return request.resolved_activity
+
         try:
             resolver_match = resolve(request.path_info)
+        except Resolver404:
+            resolver_match = None
+
+        if resolver_match is None:
+            resolved = ResolvedActivity(None, 'unknown', self.get_activity_name(None, 'unknown'))
+        else:
+            key = (resolver_match.route, request.method)
+            resolved = _activity_cache.get(key)
+            if resolved is None:
+                view_class, action_name = self.get_view_class_and_action(request, resolver_match)
+                resolved = ResolvedActivity(view_class, action_name, self.get_activity_name(view_class, action_name))
+                _activity_cache[key] = resolved
+                logger.debug("Resolved activity for %s: %s", key, resolved.activity)
+
+        request.resolved_activity = resolved
+        return resolved
+
+    def get_view_class_and_action(self, request, resolver_match):
+        """
+        解析请求中的视图类和动作。
+        """
+        try:
             view_func = resolver_match.func
             view_class = None
             action_name = None
 
-            if hasattr(view_func, 'view_class'):
-                view_class = view_func.view_class
-                view_instance = view_class()
-
-                # 尝试确定action
-                if hasattr(view_instance, 'action_map'):
-                    action_name = view_instance.action_map.get(request.method.lower())
+            if hasattr(view_func, 'cls'):
+                # Views created by DRF's as_view(); ViewSets also carry their method -> action mapping
+                view_class = view_func.cls
+                actions = getattr(view_func, 'actions', None) or {}
+                action_name = actions.get(request.method.lower())
 
                 if not action_name and (issubclass(view_class, ViewSet) or issubclass(view_class, ModelViewSet)):
-                    # 对于ViewSet和ModelViewSet，我们可以根据HTTP方法和URL模式推断action
-                    if 'pk' in resolver_match.kwargs:
-                        action_map = {
-                            'get': 'retrieve',
-                            'put': 'update',
-                            'patch': 'partial_update',
-                            'delete': 'destroy'
-                        }
-                    else:
-                        action_map = {
-                            'get': 'list',
-                            'post': 'create'
-                        }
-                    action_name = action_map.get(request.method.lower())
-
-                if not action_name:
+                    action_name = self.infer_viewset_action(request, resolver_match)
+
+                if not action_name and resolver_match.url_name:
+                    action_name = resolver_match.url_name.split('-')[-1]
+            elif hasattr(view_func, 'view_class'):
+                view_class = view_func.view_class
+                if resolver_match.url_name:
                     action_name = resolver_match.url_name.split('-')[-1]
             elif hasattr(view_func, '__name__'):
                 view_class = view_func
@@ -139,45 +324,132 @@ class RequestLoggingMiddleware:
 
             return view_class, action_name
         except Exception as e:
-            logger.error(f"Error resolving view class and action: {str(e)}")
+            logger.error("Error resolving view class and action: %s", e)
             return None, 'unknown'
 
+    def infer_viewset_action(self, request, resolver_match):
+        """
+        对于ViewSet和ModelViewSet，我们可以根据HTTP方法和URL模式推断action
+        """
+        if 'pk' in resolver_match.kwargs:
+            action_map = {
+                'get': 'retrieve',
+                'put': 'update',
+                'patch': 'partial_update',
+                'delete': 'destroy'
+            }
+        else:
+            action_map = {
+                'get': 'list',
+                'post': 'create'
+            }
+        return action_map.get(request.method.lower())
+
+    def get_activity_name(self, view_class, action_name):
+        """
+        Build the activity name logged for an action of a view class.
+        """
+        if view_class is None:
+            return f"Unknown Activity {action_name.capitalize()}"
+        if isinstance(view_class, type) and hasattr(view_class, 'get_activity_name'):
+            return view_class().get_activity_name(action_name)
+        if hasattr(view_class, 'activity_name'):
+            return f"{view_class.activity_name} {action_name.capitalize()}"
+        return f"{view_class.__name__.replace('ViewSet', '')} {action_name.capitalize()}"
+
     def should_log(self, view_class):
         """
         Determines whether the view class should log an event.
         """
-        if view_class is None:
-            return False
-        return getattr(view_class, 'log_event', False)
+        return self.policy.view_allowed(view_class)
 
     def get_or_create_case_id(self, request, user):
         """
         生成或获取用于日志记录的case ID。
+        Authenticated users are identified by their id; anonymous callers according to CASE_ID_STRATEGY.
         """
         try:
             if user:
                 return f"user_{user.id}"
-            else:
-                session_key = request.session.session_key
-                if not session_key:
-                    request.session.create()
-                    session_key = request.session.session_key
-                return f"session_{session_key}"
+
+            strategy = get_event_log_setting('CASE_ID_STRATEGY')
+            if strategy == 'session':
+                return self.get_session_case_id(request)
+            if strategy == 'fingerprint':
+                return self.get_fingerprint_case_id(request)
+            return self.get_cookie_case_id(request)
         except Exception as e:
-            logger.error(f"Error in get_or_create_case_id: {str(e)}")
+            logger.error("Error in get_or_create_case_id: %s", e)
             return f"error_{uuid.uuid4().hex}"
 
+    def get_session_case_id(self, request):
+        """
+        Case ID bound to the Django session (creates a session row for new callers).
+        """
+        session_key = request.session.session_key
+        if not session_key:
+            request.session.create()
+            session_key = request.session.session_key
+        return f"session_{session_key}"
+
+    def get_cookie_case_id(self, request):
+        """
+        Case ID taken from the correlation header or the signed case ID cookie.
+        A new ID is generated, and set as cookie on the response, for callers sending neither.
+        """
+        header_value = request.META.get(get_event_log_setting('CASE_ID_HEADER'), '')
+        if CASE_ID_PATTERN.match(header_value):
+            return f"anon_{header_value}"
+
+        case_id = request.get_signed_cookie(get_event_log_setting('CASE_ID_COOKIE'), default=None,
+                                            salt=CASE_ID_COOKIE_SALT)
+        if case_id:
+            return case_id
+
+        case_id = f"anon_{uuid.uuid4().hex}"
+        request.new_case_id = case_id
+        return case_id
+
+    def get_fingerprint_case_id(self, request):
+        """
+        Case ID derived from the client fingerprint within a fixed time bucket; no state is kept.
+        """
+        time_bucket = int(time.time() // get_event_log_setting('CASE_ID_TIME_BUCKET'))
+        fingerprint = '|'.join((
+            request.META.get('REMOTE_ADDR', ''),
+            request.META.get('HTTP_USER_AGENT', ''),
+            request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+            str(time_bucket),
+        ))
+        return f"anon_{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"
+
+    def set_case_id_cookie(self, response, case_id):
+        response.set_signed_cookie(
+            get_event_log_setting('CASE_ID_COOKIE'), case_id, salt=CASE_ID_COOKIE_SALT,
+            max_age=get_event_log_setting('CASE_ID_COOKIE_AGE'), httponly=True, samesite='Lax'
+        )
+
     def is_process_completed(self, request, response):
         """
         Determines if the process is completed based on response.
         """
         try:
-            view_class, action_name = self.get_view_class_and_action(request)
-            if action_name == 'logout':
+            if self.resolve_activity(request).action_name == 'logout':
                 return True
             if response.status_code >= 400:
                 return True
             return False
         except Exception as e:
-            logger.error(f"Error in is_process_completed: {str(e)}")
+            logger.error("Error in is_process_completed: %s", e)
             return False
+
+
+@receiver(request_finished)
+def finish_closing_event(sender, **kwargs):
+    """
+    Write the event of the request whose response has just been closed.
+    """
+    event_log = closing_event_var.get()
+    if event_log is not None:
+        closing_event_var.set(None)
+        RequestLoggingMiddleware.finish_event(event_log)
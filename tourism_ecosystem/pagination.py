@@ -0,0 +1,95 @@
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import pagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+# Pagination policy of the API lists (list and the per-parent list actions of LoggingViewSet).
+# Every list is a page of PAGE_SIZE results, sized with ?page_size= up to MAX_PAGE_SIZE and
+# walked with ?page= or, on cursor paginated viewsets, ?cursor=. ?stream=ndjson streams the
+# whole list instead, one JSON object per line, for bulk consumers.
+DEFAULTS = {
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,  # Largest ?page_size= accepted
+    'STREAM_CHUNK_SIZE': 500,  # Rows read and serialized at a time by ?stream=ndjson
+}
+
+STREAM_QUERY_PARAM = 'stream'
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson'}
+
+
+def get_pagination_setting(name):
+    return getattr(settings, 'PAGINATION_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+class ListPaginationMixin:
+    """
+    Page sizes of PAGINATION_SETTINGS and the ?stream= parameter in the schema.
+    """
+
+    def __init__(self):
+        self.page_size = get_pagination_setting('PAGE_SIZE')
+        self.max_page_size = get_pagination_setting('MAX_PAGE_SIZE')
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [{
+            'name': STREAM_QUERY_PARAM,
+            'required': False,
+            'in': 'query',
+            'description': "Stream every result, one JSON object per line, instead of a list or a page.",
+            'schema': {'type': 'string', 'enum': list(STREAM_FORMATS)},
+        }]
+
+
+class ListPageNumberPagination(ListPaginationMixin, pagination.PageNumberPagination):
+    page_size_query_param = 'page_size'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if hasattr(queryset, 'ordered') and not queryset.ordered:
+            # Stable pages for models without a default ordering
+            queryset = queryset.order_by('pk')
+        return super().paginate_queryset(queryset, request, view)
+
+
+class ListCursorPagination(ListPaginationMixin, pagination.CursorPagination):
+    """
+    Cursor pagination for large tables: no COUNT(*) and no OFFSET, so every page costs
+    the same however deep it is. Newest rows first unless the viewset sets ``ordering``.
+    """
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+
+    def decode_cursor(self, request):
+        # An empty ?cursor= is the first page
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        return super().decode_cursor(request)
+
+
+def get_stream_format(request):
+    """
+    Format of the ?stream= parameter, None when the list is not streamed.
+    """
+    stream_format = request.query_params.get(STREAM_QUERY_PARAM)
+    if stream_format is not None and stream_format not in STREAM_FORMATS:
+        raise ValidationError({STREAM_QUERY_PARAM: [f"Expected one of {', '.join(STREAM_FORMATS)}."]})
+    return stream_format
+
+
+def stream_list(queryset, get_serializer, stream_format='ndjson'):
+    """
+    Stream every row of the queryset, reading and serializing a chunk of rows at a time so
+    neither the rows nor the response are ever held in memory whole.
+    """
+    chunk_size = get_pagination_setting('STREAM_CHUNK_SIZE')
+    renderer = JSONRenderer()
+
+    def lines():
+        rows = queryset.iterator(chunk_size=chunk_size)
+        while chunk := list(islice(rows, chunk_size)):
+            for item in get_serializer(chunk, many=True).data:
+                yield renderer.render(item) + b'\n'
+
+    return StreamingHttpResponse(lines(), content_type=STREAM_FORMATS[stream_format])
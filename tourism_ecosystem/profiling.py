@@ -0,0 +1,177 @@
+import hmac
+import os
+import re
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Default values for the keys of settings.SQL_PROFILER_SETTINGS
+DEFAULTS = {
+    # Allow requests to turn the profiler on with the toggle header
+    'ENABLED': False,
+    # request.META key of the toggle header
+    'HEADER': 'HTTP_X_PROFILE_SQL',
+    # Value the toggle header must carry, None accepts any non-empty value
+    'TOKEN': None,
+    # Number of identical query shapes in a request reported as a possible N+1
+    'REPEAT_THRESHOLD': 5,
+    # Number of project frames kept in the stack of each query
+    'STACK_DEPTH': 8,
+    # Number of profiles kept in memory for the debug endpoint
+    'MAX_PROFILES': 50,
+}
+
+# Literals left in the SQL and IN lists of varying length do not change the shape of a query
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+IN_LIST_PATTERN = re.compile(r"\bIN \((?:%s, )*%s\)")
+
+
+def get_profiler_setting(name):
+    return getattr(settings, 'SQL_PROFILER_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+def get_query_shape(sql):
+    return IN_LIST_PATTERN.sub('IN (...)', LITERAL_PATTERN.sub('?', sql))
+
+
+def get_project_stack(depth):
+    """
+    The innermost frames of the current stack that belong to the project, not to
+    Django, third-party packages or the profiler itself.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        f"{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir) and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return frames[-depth:]
+
+
+class QueryProfiler:
+    """
+    connection.execute_wrapper() recording the SQL, duration and stack of every query.
+    """
+
+    def __init__(self, stack_depth):
+        self.stack_depth = stack_depth
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'stack': get_project_stack(self.stack_depth),
+            })
+
+    def get_profile(self, request, response, repeat_threshold):
+        shapes = Counter(get_query_shape(query['sql']) for query in self.queries)
+        repeated = []
+        for shape, count in shapes.most_common():
+            if count < repeat_threshold:
+                break
+            queries = [query for query in self.queries if get_query_shape(query['sql']) == shape]
+            repeated.append({
+                'shape': shape,
+                'count': count,
+                'total_ms': round(sum(query['duration_ms'] for query in queries), 3),
+                'stack': queries[0]['stack'],
+            })
+        return {
+            'id': uuid.uuid4().hex,
+            'method': request.method,
+            'path': request.path,
+            'status_code': response.status_code,
+            'query_count': len(self.queries),
+            'db_time_ms': round(sum(query['duration_ms'] for query in self.queries), 3),
+            'repeated_queries': repeated,
+            'queries': self.queries,
+        }
+
+
+class ProfileStore:
+    """
+    The most recent profiles of the process, for the debug endpoint.
+    """
+
+    def __init__(self):
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles[profile['id']] = profile
+            while len(self._profiles) > get_profiler_setting('MAX_PROFILES'):
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self):
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+profile_store = ProfileStore()
+
+
+def is_profiling_requested(request):
+    if not get_profiler_setting('ENABLED'):
+        return False
+    value = request.META.get(get_profiler_setting('HEADER'), '')
+    token = get_profiler_setting('TOKEN')
+    if token:
+        # Compared as bytes, compare_digest rejects non-ASCII str
+        return hmac.compare_digest(value.encode(), token.encode())
+    return bool(value)
+
+
+def format_profile_header(profile):
+    return (f"id={profile['id']}; queries={profile['query_count']}; time={profile['db_time_ms']}ms; "
+            f"repeated={len(profile['repeated_queries'])}")
+
+
+@extend_schema(tags=['Debug'])
+class SQLProfileListView(APIView):
+    """
+    Summaries of the most recent profiled requests of this process.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response([
+            {key: value for key, value in profile.items() if key != 'queries'} for profile in profile_store.list()
+        ])
+
+
+@extend_schema(tags=['Debug'])
+class SQLProfileDetailView(APIView):
+    """
+    Every query of a profiled request, with its duration and stack.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        profile = profile_store.get(profile_id)
+        if profile is None:
+            raise NotFound()
+        return Response(profile)
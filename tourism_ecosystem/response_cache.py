@@ -0,0 +1,203 @@
+import hashlib
+import threading
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+# Default values for the keys of settings.RESPONSE_CACHE_SETTINGS
+DEFAULTS = {
+    # Serve list/retrieve responses of CachedReadMixin views from the cache
+    'ENABLED': True,
+    # Send ETags on the GET responses of LoggingViewSet and answer If-None-Match with 304
+    'ETAGS': True,
+    # 'locmem' (per process), 'file' (shared by the processes of a host) or a CACHES alias
+    'BACKEND': 'locmem',
+    # Directory of the 'file' backend
+    'LOCATION': None,
+    # Seconds a response is kept; writes invalidate it earlier through the model versions
+    'TIMEOUT': 300,
+    # Maximum number of responses kept by the 'locmem' and 'file' backends
+    'MAX_ENTRIES': 1000,
+}
+
+# Models whose writes are not versioned through the model signals (the receivers skip
+# them, bump_versions itself versions whatever label it is given)
+UNTRACKED_MODELS = {
+    'admin.logentry', 'sessions.session', 'authtoken.token',
+    'customUser.modelversion', 'customUser.eventlog', 'customUser.exportjob',
+    'customUser.activitystatistic', 'customUser.directlyfollows', 'customUser.casestate', 'customUser.processcounter',
+    # Written with update(), versioned by apps/accommodation/availability.py itself
+    'accommodation.roomnight',
+}
+
+
+def get_response_cache_setting(name):
+    return getattr(settings, 'RESPONSE_CACHE_SETTINGS', {}).get(name, DEFAULTS[name])
+
+
+def get_version_label(model, field_name=None, value=None):
+    """
+    'app_label.model_name', or 'app_label.model_name:field=value' for the rows of a parent.
+    """
+    label = f"{model._meta.app_label}.{model._meta.model_name}"
+    return label if field_name is None else f"{label}:{field_name}={value}"
+
+
+# {model label: [foreign key names]} whose values get a version of their own
+_parent_versions = {}
+
+
+def register_parent_versions(model, *field_names):
+    """
+    Also version the rows of ``model`` per value of the given foreign keys, so views
+    listing the children of one parent are not invalidated by writes to other parents.
+    """
+    _parent_versions.setdefault(get_version_label(model), []).extend(field_names)
+
+
+def get_parent_version_labels(instance, values=None):
+    model = type(instance)
+    labels = []
+    for name in _parent_versions.get(get_version_label(model), []):
+        attname = model._meta.get_field(name).attname
+        value = values[attname] if values is not None else getattr(instance, attname)
+        labels.append(get_version_label(model, name, value))
+    return labels
+
+
+def get_previous_parent_version_labels(instance):
+    """
+    Parent labels of the stored row, so moving a child to another parent also
+    invalidates the parent it leaves.
+    """
+    model = type(instance)
+    if instance._state.adding or get_version_label(model) not in _parent_versions:
+        return []
+    attnames = [model._meta.get_field(name).attname for name in _parent_versions[get_version_label(model)]]
+    values = model._default_manager.filter(pk=instance.pk).values(*attnames).first()
+    return get_parent_version_labels(instance, values) if values else []
+
+
+def bump_versions(labels):
+    """
+    Give the labels a new version, so every response built from them is missed (and
+    every ETag derived from them changes) from now on. Called by the post_save,
+    post_delete and m2m_changed receivers.
+
+    Inside a transaction the versions are written once it commits: the version rows
+    are not locked by the writer for the rest of its transaction (which would
+    serialize every write to a model behind one row), and no reader can cache the
+    uncommitted state under the new version. Nothing is bumped on rollback.
+    """
+    transaction.on_commit(partial(write_versions, sorted(set(labels))))
+
+
+def write_versions(labels):
+    """
+    Write a new version of the labels, in label order. The version is a random token
+    rather than a counter, so an old version, and the responses cached under it, can
+    never come back.
+    """
+    from apps.customUser.models import ModelVersion
+
+    for label in labels:
+        ModelVersion.objects.update_or_create(label=label, defaults={'version': uuid.uuid4().hex})
+
+
+def get_versions(labels):
+    """
+    Return a stable string of the current versions of the labels, in a single query.
+    """
+    from apps.customUser.models import ModelVersion
+
+    labels = sorted(set(labels))
+    versions = dict(ModelVersion.objects.filter(label__in=labels).values_list('label', 'version'))
+    return ','.join(f"{label}={versions.get(label, '0')}" for label in labels)
+
+
+def get_visibility_class(user):
+    """
+    Callers who may see different data for the same URL never share a cached response.
+    """
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    return 'staff' if user.is_staff else 'user'
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Return the process-wide response cache configured by RESPONSE_CACHE_SETTINGS.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = get_response_cache_setting('BACKEND')
+                params = {
+                    'TIMEOUT': get_response_cache_setting('TIMEOUT'),
+                    'OPTIONS': {'MAX_ENTRIES': get_response_cache_setting('MAX_ENTRIES')},
+                }
+                if backend == 'locmem':
+                    _cache = LocMemCache('response-cache', params)
+                elif backend == 'file':
+                    _cache = FileBasedCache(get_response_cache_setting('LOCATION'), params)
+                else:
+                    _cache = caches[backend]
+    return _cache
+
+
+class CachedReadMixin:
+    """
+    Cache the rendered bytes of the read actions of a LoggingViewSet.
+
+    Responses are keyed by path, query string, the visibility class of the caller and
+    the versions of the view (see LoggingViewSet.get_version_labels), so any write to
+    the models behind a response, through the API or the admin, makes it unreachable.
+    Writes bypassing model signals (``update()``, ``bulk_create()``) are only picked up
+    once the cached responses expire.
+    """
+    cache_actions = ('list', 'retrieve')
+
+    def get_response_cache_key(self, request):
+        raw = '|'.join([request.get_full_path(), get_visibility_class(request.user), self.get_versions()])
+        return f"response:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def initial(self, request, *args, **kwargs):
+        # Authentication and permissions run first: a cached response is only served to
+        # callers allowed to get a fresh one
+        super().initial(request, *args, **kwargs)
+        self.response_cache_key = None
+        if (request.method != 'GET' or self.action not in self.cache_actions
+                or self.short_circuit_response is not None or not get_response_cache_setting('ENABLED')):
+            return
+        self.response_cache_key = self.get_response_cache_key(request)
+        cached = get_response_cache().get(self.response_cache_key)
+        if cached is not None:
+            # Answer with the cached bytes instead of running the action
+            self.short_circuit_response = self.build_cached_response(*cached)
+
+    @staticmethod
+    def build_cached_response(status_code, content_type, content):
+        response = HttpResponse(content, status=status_code, content_type=content_type)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, 'response_cache_key', None)
+        if key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            get_response_cache().set(key, (response.status_code, response['Content-Type'], response.content))
+            response['X-Cache'] = 'MISS'
+        return response
@@ -1,6 +1,14 @@
+from decimal import Decimal
+from functools import cached_property
+
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework.views import exception_handler
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class CustomResponse:
@@ -63,7 +71,57 @@ class CustomRenderer(JSONRenderer):
         return super(CustomRenderer, self).render(response_data, accepted_media_type, renderer_context)
 
 
+class FastCustomRenderer(CustomRenderer):
+    """
+    Renders the same bytes as CustomRenderer, encoding the data with orjson when it is
+    installed and writing the envelope around the encoded data instead of wrapping it
+    in a new dict.
+
+    Dates, times and Decimals go through DRF's encoder, as with CustomRenderer. Data
+    orjson cannot encode the same way (non-string keys, Decimals written with an
+    exponent, values DRF's encoder rejects) falls back to the json module. Native floats
+    below 1e-4 or from 1e16 are written without an exponent (0.00005 rather than 5e-05).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or not renderer_context or self.ensure_ascii or not api_settings.COMPACT_JSON
+                or self.get_indent(accepted_media_type, renderer_context) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        response = renderer_context['response']
+        if isinstance(data, dict) and 'code' in data and 'msg' in data or response.status_code >= 400:
+            if data is None:
+                return b''
+            return self.encode(data, accepted_media_type, renderer_context)
+        return b'{"code":%d,"msg":"success","data":%s}' % (
+            response.status_code, self.encode(data, accepted_media_type, renderer_context))
+
+    def encode(self, data, accepted_media_type, renderer_context):
+        try:
+            content = orjson.dumps(data, default=self.default,
+                                   option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        except orjson.JSONEncodeError:
+            if data is None:
+                return b'null'
+            return JSONRenderer.render(self, data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, these are valid JSON but not valid JavaScript
+        return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+    def default(self, obj):
+        if isinstance(obj, Decimal) and (not obj.is_finite() or 'e' in repr(float(obj))):
+            # Left to the json module for its float format and strict NaN handling
+            raise TypeError(obj)
+        return self.json_encoder.default(obj)
+
+    @cached_property
+    def json_encoder(self):
+        return self.encoder_class()
+
+
 def custom_exception_handler(exc, context):
+    # Imported here: rest_framework.views loads the renderers configured in this module
+    from rest_framework.views import exception_handler
+
     # Call the default DRF exception handler
     response = exception_handler(exc, context)
 
@@ -50,6 +50,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tourism_ecosystem.middlewares.RequestContextMiddleware",
+    "tourism_ecosystem.middlewares.MetricsMiddleware",
+    "tourism_ecosystem.middlewares.SQLProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -147,7 +150,7 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'COMPONENT_SPLIT_REQUEST': True,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'tourism_ecosystem.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -155,10 +158,12 @@ REST_FRAMEWORK = {
     ],
     # Custom exception handler and renderer
     'EXCEPTION_HANDLER': 'tourism_ecosystem.responses.custom_exception_handler',
-    # Custom renderer
+    # Custom renderer (FastCustomRenderer renders the same bytes as CustomRenderer, faster)
     'DEFAULT_RENDERER_CLASSES': (
-        'tourism_ecosystem.responses.CustomRenderer',
-    )
+        'tourism_ecosystem.responses.FastCustomRenderer',
+    ),
+    # Lists are only paginated when a page is asked for (see tourism_ecosystem/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'tourism_ecosystem.pagination.ListPageNumberPagination',
 }
 
 # Spectacular settings
@@ -184,17 +189,120 @@ CSRF_TRUSTED_ORIGINS = ['http://192.9.160.69', 'http://192.9.160.69:8000']
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Token -> user cache shared by RequestLoggingMiddleware and CachedTokenAuthentication
+TOKEN_CACHE_SETTINGS = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,  # seconds
+    'BACKEND': None,  # Optional CACHES alias shared between processes
+}
+
+# Rendered responses of the public catalogue reads (see tourism_ecosystem/response_cache.py)
+RESPONSE_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'ETAGS': True,  # ETag / If-None-Match on every LoggingViewSet GET
+    'BACKEND': 'locmem',  # 'locmem', 'file' or a CACHES alias
+    'LOCATION': os.path.join(BASE_DIR, 'response_cache'),  # 'file' backend only
+    'TIMEOUT': 300,  # seconds
+}
+
+# Pages of the API lists (see tourism_ecosystem/pagination.py)
+PAGINATION_SETTINGS = {
+    'PAGE_SIZE': 20,
+    'MAX_PAGE_SIZE': 100,
+    'STREAM_CHUNK_SIZE': 500,  # Rows serialized at a time by ?stream=ndjson
+}
+
+# Request latency histograms served at /metrics (see tourism_ecosystem/metrics.py)
+METRICS_SETTINGS = {
+    'ENABLED': True,
+    'AUTH_TOKEN': os.environ.get('METRICS_AUTH_TOKEN'),  # Bearer token of the scrapers, staff users need none
+    'PUBLIC': False,  # Serve /metrics without authentication
+}
+
+# Per-request SQL profiler, turned on by sending the X-Profile-SQL header
+# (see tourism_ecosystem/profiling.py for all keys and defaults)
+SQL_PROFILER_SETTINGS = {
+    'ENABLED': False,
+    'TOKEN': None,  # Value the X-Profile-SQL header must carry
+    'REPEAT_THRESHOLD': 5,  # Identical query shapes per request reported as N+1
+}
+
+# Request event logging (see tourism_ecosystem/event_log_writer.py for all keys and defaults)
+EVENT_LOG_SETTINGS = {
+    'WRITER': 'buffered',  # 'buffered' or 'sync'
+    'PERSIST_ON': 'close',  # 'close' (after the response is sent) or 'response'
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 1.0,  # seconds
+    'MAX_BUFFER_SIZE': 10000,
+    'BLOCK_TIMEOUT': 0.05,  # seconds
+    'OVERFLOW_POLICY': 'spill',  # 'drop' or 'spill'
+    'SPILL_FILE': os.path.join(BASE_DIR, 'event_log_spill.jsonl'),
+    # Logging policy
+    'INCLUDE_PATHS': [],
+    'EXCLUDE_PATHS': [r'^/admin/', r'^/static/', r'^/media/', r'^/api/schema/', r'^/api/docs/', r'^/$',
+                      r'^/health', r'^/metrics', r'^/debug/'],
+    'LOG_UNMARKED_VIEWS': False,  # views without a log_event attribute
+    'SAMPLE_RATES': {},  # e.g. {'Accommodation List': 0.1, '*': 1.0}
+    'ALWAYS_LOG_ERRORS': True,  # status >= 400
+    # Case IDs of anonymous callers
+    'CASE_ID_STRATEGY': 'cookie',  # 'cookie', 'fingerprint' or 'session'
+    'CASE_ID_COOKIE': 'case_id',
+    'CASE_ID_COOKIE_AGE': 30 * 24 * 3600,  # seconds
+    'CASE_ID_HEADER': 'HTTP_X_CASE_ID',
+    'CASE_ID_TIME_BUCKET': 3600,  # seconds, 'fingerprint' strategy only
+    # Exports
+    'EXPORT_CHUNK_SIZE': 2000,
+    'EXPORT_JOB_WORKERS': 2,
+    'EXPORT_DIR': os.path.join(MEDIA_ROOT, 'exports'),
+    # Event log list
+    'LIST_COUNT': 'exact',  # 'exact', 'estimate' or 'none'
+    # Retention
+    'PRUNE_BATCH_SIZE': 5000,
+    'ARCHIVE_DIR': os.path.join(MEDIA_ROOT, 'event_log_archives'),
+    'PARTITIONING': None,  # None, 'month' or 'day', see the rollover_event_logs command
+    'PROCESS_AGGREGATES': True,  # see the process_summary endpoint
+    'CASE_IDLE_TIMEOUT': 24 * 3600,  # seconds without events before a case is closed
+}
+
+# Write event logs and run export jobs synchronously while running tests,
+# so their rows are visible inside the test transaction
+if 'test' in sys.argv:
+    EVENT_LOG_SETTINGS['WRITER'] = 'sync'
+    EVENT_LOG_SETTINGS['EXPORT_JOB_WORKERS'] = 0
+
 # Logging Configuration
+# JSON lines written by a background QueueListener, with the request id and activity
+# (see tourism_ecosystem/structured_logging.py)
+LOG_LEVEL = os.environ.get('DJANGO_LOG_LEVEL', 'INFO')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'filters': {
+        'request_context': {
+            '()': 'tourism_ecosystem.structured_logging.RequestContextFilter',
+        },
+    },
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            '()': 'tourism_ecosystem.structured_logging.QueueListenerHandler',
+            'stream': 'ext://sys.stderr',
+            'filters': ['request_context'],
         },
     },
     'root': {
         'handlers': ['console'],
-        'level': 'DEBUG',
+        'level': LOG_LEVEL,
+    },
+    'loggers': {
+        'django.db.backends': {
+            'level': 'WARNING',
+        },
+        'tourism_ecosystem': {
+            'level': os.environ.get('DJANGO_LOG_LEVEL_TOURISM_ECOSYSTEM', LOG_LEVEL),
+        },
+        'apps': {
+            'level': os.environ.get('DJANGO_LOG_LEVEL_APPS', LOG_LEVEL),
+        },
     },
 }
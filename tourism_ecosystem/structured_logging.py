@@ -0,0 +1,111 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Request id and activity of the request being handled, added to every log record
+request_id_var = contextvars.ContextVar('request_id', default=None)
+activity_var = contextvars.ContextVar('activity', default=None)
+
+RECORD_FIELDS = ('request_id', 'activity')
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Copy the request context onto the record. Runs in the thread emitting the record.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.activity = activity_var.get()
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in RECORD_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hands records to a background QueueListener writing them to a stream, so logging
+    never blocks a request on I/O. Meant to be used from settings.LOGGING.
+
+    The listener is started by the first record of each process: a worker forked by a
+    preloading server (gunicorn --preload) gets a queue and listener of its own
+    instead of queuing records for a thread that only exists in the parent.
+    """
+
+    def __init__(self, stream=None, formatter=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.target.setFormatter(formatter or JSONFormatter())
+        self.listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.stop_listener)
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            # Records queued before a fork belong to the listener of the parent
+            self.queue = queue.SimpleQueue()
+            self.listener = QueueListener(self.queue, self.target)
+            self.listener.start()
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        self._ensure_started()
+        super().emit(record)
+
+    def stop_listener(self):
+        """
+        Write the queued records and stop the listener of this process.
+        """
+        if self.listener is not None and self._pid == os.getpid() and self.listener._thread is not None:
+            self.listener.stop()
+            self._pid = None
+
+    def prepare(self, record):
+        """
+        Render the message and traceback now, as the arguments may change once the
+        logging call returns; JSON encoding and the write happen in the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        self.stop_listener()
+        super().close()
@@ -0,0 +1,17 @@
+from django.test import TestCase
+
+from tourism_ecosystem.response_cache import get_response_cache
+
+
+class ResponseCacheTestCase(TestCase):
+    """
+    TestCase of the API tests, each starting with an empty response cache. Model versions
+    are only bumped once a transaction commits (see bump_versions), which never happens
+    inside a TestCase, so the responses cached by one test would otherwise be served to
+    the next. Wrap the writes whose invalidation is tested in
+    ``self.captureOnCommitCallbacks(execute=True)``.
+    """
+
+    def setUp(self):
+        super().setUp()
+        get_response_cache().clear()
@@ -2,9 +2,19 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from tourism_ecosystem.metrics import metrics_view
+from tourism_ecosystem.profiling import SQLProfileDetailView, SQLProfileListView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
 
+    # Prometheus metrics
+    path('metrics', metrics_view, name='metrics'),
+
+    # SQL profiles of the requests sent with the X-Profile-SQL header
+    path('debug/sql-profiles/', SQLProfileListView.as_view(), name='sql-profile-list'),
+    path('debug/sql-profiles/<str:profile_id>/', SQLProfileDetailView.as_view(), name='sql-profile-detail'),
+
     # API Schema and Documentation
     path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='api-schema'),
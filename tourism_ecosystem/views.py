@@ -1,9 +1,26 @@
+import hashlib
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from tourism_ecosystem.pagination import get_stream_format, stream_list
+from tourism_ecosystem.response_cache import get_response_cache_setting, get_version_label, get_versions
 
 
 class LoggingViewSet(viewsets.ModelViewSet):
     log_event = True
     activity_name = "Default Activity"
+    # Models the responses are built from, the queryset model and its many-to-many targets by default
+    version_models = None
+    # {action: (foreign key name, URL kwarg)} of actions listing the children of one parent,
+    # versioned per parent (see register_parent_versions)
+    version_parents = {}
+    # {name: Expansion} clients can embed with ?expand=name,... (see tourism_ecosystem/expansions.py)
+    expansions = {}
 
     def get_activity_name(self, action_name=None):
         """
@@ -35,9 +52,133 @@ class LoggingViewSet(viewsets.ModelViewSet):
 
     def dispatch(self, request, *args, **kwargs):
         """
-        Override dispatch to ensure request, args, and kwargs are set and super dispatch is called.
+        APIView.dispatch, except that the handler is skipped when initial() already has
+        the response (``short_circuit_response``: a 304 or a cached response).
         """
-        self.request = request
         self.args = args
         self.kwargs = kwargs
-        return super().dispatch(request, *args, **kwargs)
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        self.short_circuit_response = None
+
+        try:
+            self.initial(request, *args, **kwargs)
+            response = self.short_circuit_response
+            if response is None:
+                if request.method.lower() in self.http_method_names:
+                    handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+                else:
+                    handler = self.http_method_not_allowed
+                response = handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_list_response(self.filter_queryset(self.get_queryset()))
+
+    def get_list_response(self, queryset):
+        """
+        List response of the queryset, also used by the actions listing the children of a
+        parent: streamed with ?stream=, a page otherwise (see tourism_ecosystem/pagination.py)
+        unless the viewset turns pagination off.
+        """
+        stream_format = get_stream_format(self.request)
+        if stream_format:
+            return stream_list(queryset, self.get_serializer, stream_format)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def get_requested_expansions(self):
+        """
+        The expansions of the ?expand= parameter, which only applies to reads.
+        """
+        request = getattr(self, 'request', None)
+        if not self.expansions or request is None or request.method not in SAFE_METHODS:
+            return {}
+        names = [name.strip() for name in request.query_params.get('expand', '').split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.expansions]
+        if unknown:
+            raise ValidationError({'expand': [f"Unknown expansion '{name}', expected one of "
+                                              f"{', '.join(self.expansions)}." for name in unknown]})
+        return {name: self.expansions[name] for name in names}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        for expansion in self.get_requested_expansions().values():
+            queryset = expansion.apply(queryset)
+        return queryset
+
+    def get_serializer_class(self):
+        """
+        Add the fields of the requested expansions to the serializer.
+        """
+        serializer_class = super().get_serializer_class()
+        expansions = self.get_requested_expansions()
+        if not expansions:
+            return serializer_class
+        model = self.queryset.model
+        attrs = {name: expansion.get_field(name, model) for name, expansion in expansions.items()}
+        meta_fields = serializer_class.Meta.fields
+        if meta_fields != '__all__':
+            meta_fields = list(meta_fields) + [name for name in expansions if name not in meta_fields]
+        attrs['Meta'] = type('Meta', (serializer_class.Meta,), {'fields': meta_fields})
+        return type(serializer_class.__name__, (serializer_class,), attrs)
+
+    def get_version_models(self):
+        if self.version_models is not None:
+            models = list(self.version_models)
+        else:
+            model = self.queryset.model
+            models = [model] + [field.related_model for field in model._meta.many_to_many]
+        for expansion in self.get_requested_expansions().values():
+            models += expansion.get_models(self.queryset.model)
+        return models
+
+    def get_version_labels(self):
+        models = self.get_version_models()
+        labels = [get_version_label(model) for model in models]
+        if self.action in self.version_parents:
+            field_name, url_kwarg = self.version_parents[self.action]
+            labels[0] = get_version_label(models[0], field_name, self.kwargs[url_kwarg])
+        return labels
+
+    def get_versions(self):
+        """
+        Current versions of the models behind the response, read once per request.
+        """
+        if self._versions is None:
+            self._versions = get_versions(self.get_version_labels())
+        return self._versions
+
+    def get_etag(self, request):
+        """
+        Strong ETag derived from the versions rather than from the body, so it is known
+        before the query runs. The caller is part of it, as querysets may be per user.
+        """
+        raw = '|'.join([request.get_full_path(), str(request.user.pk), self.get_versions()])
+        return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._versions = None
+        self.etag = None
+        if request.method not in ('GET', 'HEAD') or not get_response_cache_setting('ETAGS'):
+            return
+        self.etag = self.get_etag(request)
+        etags = [etag.removeprefix('W/') for etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+        if '*' in etags or self.etag in etags:
+            # Answer 304 without running the query or the serializer
+            self.short_circuit_response = HttpResponseNotModified()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'etag', None)
+        if etag and response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response